@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compara o pico de memória e o tempo da extração dos processos de várias páginas
+de Controle de Processos entre `extrai_processos` (BeautifulSoup) e o parser
+incremental `itera_registros_processos` (lxml iterparse).
+
+As páginas são geradas sinteticamente com o mesmo formato das linhas do SEI. O
+pico de memória inclui os registros extraídos, que são mantidos até o fim.
+
+Uso: python scripts/bench_parser.py --linhas 500 --paginas 1 5 10 20
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+# Use a simple (but explicit) path modification to resolve the package properly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sei.common import extrai_processos, itera_registros_processos  # noqa: E402
+
+LINHA = """
+<tr class="infraTrClara">
+<td><input type="checkbox" class="infraCheckbox" id="chkInfraItem{i}"></td>
+<td><a href="controlador.php?acao=anotacao_registrar&amp;id={i}"
+ onmouseover="return infraTooltipMostrar('Anotação {i}','fulano');">
+<img src="imagens/sei_anotacao_pequeno.gif"></a>
+<a href="controlador.php?acao=andamento_marcador_gerenciar&amp;id={i}"
+ onmouseover="return infraTooltipMostrar('Marcador','Urgente');">
+<img src="imagens/marcador_vermelho.png"></a></td>
+<td><a href="controlador.php?acao=procedimento_trabalhar&amp;id={i}"
+ class="processoVisualizado">53500.{i:06d}/2020-01</a></td>
+<td><a>fulano</a></td>
+<td>Outorga: Serviço de Radioamador</td>
+<td><span class="spanItemCelula">Interessado {i}</span></td>
+</tr>"""
+
+
+def pagina(linhas: int, inicio: int) -> str:
+    corpo = "".join(LINHA.format(i=inicio + i) for i in range(linhas))
+    return f"<html><body><table>{corpo}</table></body></html>"
+
+
+def mede(extrair, paginas: int, linhas: int):
+    tracemalloc.start()
+    inicio = perf_counter()
+
+    processos = []
+
+    for p in range(paginas):
+        processos += list(extrair(pagina(linhas, p * linhas)))
+
+    duracao = perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return duracao, pico / 2**20
+
+
+def main(linhas: int, paginas: list) -> None:
+    print(f"{'páginas':>8}{'parser':>12}{'tempo (s)':>12}{'pico (MiB)':>12}")
+
+    for n in paginas:
+        for nome, extrair in (
+            ("bs4", extrai_processos),
+            ("iterparse", itera_registros_processos),
+        ):
+            duracao, pico = mede(extrair, n, linhas)
+            print(f"{n:>8}{nome:>12}{duracao:>12.3f}{pico:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=500)
+    parser.add_argument("--paginas", type=int, nargs="*", default=[1, 5, 10, 20])
+    args = parser.parse_args()
+
+    main(args.linhas, args.paginas)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compara o tempo de carregamento de páginas entre os perfis "padrao" e "scraper"
+de `get_browser`.
+
+Uso: python scripts/bench_perfil.py --browser chrome --repeticoes 5 URL [URL ...]
+"""
+import argparse
+import os
+import statistics
+import sys
+from time import perf_counter
+
+# Use a simple (but explicit) path modification to resolve the package properly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tools.functions import PERFIS, get_browser  # noqa: E402
+
+URLS = ("https://sei.anatel.gov.br", "http://sistemasnet")
+
+
+def mede(driver, url: str, repeticoes: int) -> list:
+    tempos = []
+
+    for _ in range(repeticoes):
+        driver.delete_all_cookies()
+        inicio = perf_counter()
+        driver.get(url)
+        tempos.append(perf_counter() - inicio)
+
+    return tempos
+
+
+def main(browser: str, urls: list, repeticoes: int, is_headless: bool) -> None:
+    print(f"{'perfil':<10}{'url':<40}{'média (s)':>12}{'mediana (s)':>14}")
+
+    for perfil in PERFIS:
+        driver = get_browser(browser, is_headless=is_headless, perfil=perfil)
+
+        try:
+            for url in urls:
+                tempos = mede(driver, url, repeticoes)
+                print(
+                    f"{perfil:<10}{url:<40}"
+                    f"{statistics.mean(tempos):>12.3f}{statistics.median(tempos):>14.3f}"
+                )
+        finally:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("urls", nargs="*", default=URLS)
+    parser.add_argument("--browser", default="chrome")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--visivel", action="store_true")
+    args = parser.parse_args()
+
+    main(args.browser, args.urls, args.repeticoes, not args.visivel)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mede o tempo de `sistemas.sec.interpreta_cadastro` num lote de páginas de
+consulta do Sec, gravadas ou geradas sinteticamente no formato do cadastro.
+
+Uso: python scripts/bench_sec.py --paginas 5000 [pagina1.html ...]
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+# Use a simple (but explicit) path modification to resolve the package properly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sistemas.sec import interpreta_cadastro  # noqa: E402
+from sistemas.sis_helpers import DADOS  # noqa: E402
+
+SECAO = '<tr><td colspan="4" class="titulo"><label>{secao}:</label></td></tr>'
+
+CAMPO = (
+    '<tr><td class="rotulo">{campo}:</td>'
+    '<td><label id="lbl{i}" class="valor">{campo} {n}</label></td>'
+    '<td><img src="imagens/ajuda.gif"></td></tr>'
+)
+
+
+def pagina(n: int) -> str:
+    linhas = []
+
+    for secao, campos in DADOS.items():
+        linhas.append(SECAO.format(secao=secao))
+        linhas += [CAMPO.format(campo=c, i=i, n=n) for i, c in enumerate(campos)]
+
+    return (
+        "<html><head><script>var pagina = 1;</script></head><body><form><table>"
+        + "".join(linhas)
+        + "</table></form></body></html>"
+    )
+
+
+def main(arquivos: list, paginas: int) -> None:
+    if arquivos:
+        modelos = [
+            Path(a).read_text(encoding="utf-8", errors="replace") for a in arquivos
+        ]
+    else:
+        modelos = [pagina(n) for n in range(100)]
+
+    lote = [modelos[i % len(modelos)] for i in range(paginas)]
+
+    inicio = perf_counter()
+
+    cadastros = [interpreta_cadastro(html) for html in lote]
+
+    duracao = perf_counter() - inicio
+
+    print(f"{len(cadastros)} páginas em {duracao:.3f} s ({len(lote) / duracao:.0f}/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("arquivos", nargs="*", help="Páginas gravadas do Sec")
+    parser.add_argument("--paginas", type=int, default=5000)
+    args = parser.parse_args()
+
+    main(args.arquivos, args.paginas)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compara o tempo da extração dos pares rótulo/valor entre o laço BeautifulSoup
+usado até então pelos `extrai_cadastro` e `tools.tabela.extrai_rotulos`,
+verificando que ambos produzem o mesmo dicionário.
+
+Sem arquivos são usadas páginas sintéticas no formato do cadastro do Scpx, com
+`--estacoes` blocos de rótulos repetidos.
+
+Uso: python scripts/bench_tabela.py --repeticoes 50 [pagina1.html ...]
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from bs4 import BeautifulSoup as soup
+
+# Use a simple (but explicit) path modification to resolve the package properly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tools.tabela import extrai_rotulos  # noqa: E402
+
+ENTIDADE = """
+<tr><td class="rotulo">Nome/Razão Social:</td><td><b>Fulano de Tal {i}</b></td></tr>
+<tr><td>CPF/CNPJ:</td><td>123.456.789-{i:02d}</td>
+<td>Fistel:</td><td>5000{i:07d}</td></tr>
+<tr><td>Endereço:</td><td>Rua {i}, 100 - Centro</td><td>UF:</td><td>SP</td></tr>
+"""
+
+ESTACAO = """
+<tr><td>Indicativo:</td><td>PY2A{j:03d}</td><td>Situação:</td><td>Licenciada</td></tr>
+<tr><td>Endereço da Estação:</td><td><span>Rua {j}, 200</span></td>
+<td>Data de Licenciamento:</td><td>01/01/2020</td></tr>
+"""
+
+
+def pagina(i: int, estacoes: int) -> str:
+    linhas = ENTIDADE.format(i=i) + "".join(
+        ESTACAO.format(j=j) for j in range(estacoes)
+    )
+    return f"<html><body><form><table>{linhas}</table></form></body></html>"
+
+
+def legado(html: str) -> dict:
+    dados = {}
+
+    for tr in soup(html, "lxml").find_all("tr"):
+        for td in tr.find_all("td", string=True):
+            key = td.text.strip(" :")
+            value = td.find_next_sibling("td")
+
+            if key not in dados and hasattr(value, "text"):
+                dados[key] = value.text.strip()
+
+    return dados
+
+
+def mede(extrair, paginas: list, repeticoes: int) -> float:
+    inicio = perf_counter()
+
+    for _ in range(repeticoes):
+        for html in paginas:
+            extrair(html)
+
+    return perf_counter() - inicio
+
+
+def main(arquivos: list, repeticoes: int, estacoes: int) -> None:
+    if arquivos:
+        paginas = [
+            Path(a).read_text(encoding="utf-8", errors="replace") for a in arquivos
+        ]
+    else:
+        paginas = [pagina(i, estacoes) for i in range(20)]
+
+    for html in paginas:
+        assert extrai_rotulos(html) == legado(html)
+
+    n = len(paginas) * repeticoes
+
+    print(f"{'extrator':>10}{'tempo (s)':>12}{'páginas/s':>12}")
+
+    for nome, extrair in (("bs4", legado), ("lxml", extrai_rotulos)):
+        duracao = mede(extrair, paginas, repeticoes)
+        print(f"{nome:>10}{duracao:>12.3f}{n / duracao:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("arquivos", nargs="*", help="Páginas gravadas do sistemasnet")
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--estacoes", type=int, default=10)
+    args = parser.parse_args()
+
+    main(args.arquivos, args.repeticoes, args.estacoes)
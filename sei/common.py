@@ -1,12 +1,217 @@
 # Standard Library Imports
+import csv
 import re
-from typing import Union
+from io import BytesIO
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Union
 
 # Third party imports
 import bs4
+from lxml import etree
 
 URL = "https://sei.anatel.gov.br/sei/"
 
+# Padrões compilados uma única vez para a interpretação das linhas de processos
+RE_PETICIONAMENTO = re.compile("peticionamento")
+
+RE_PARENTESES = re.compile(r"\((.*)\)")
+
+# Campos retornados, nesta ordem, por JS_PROCESSOS. Os campos de link são relativos a URL
+CAMPOS_PROCESSO = (
+    "checkbox",
+    "anotacao",
+    "anotacao_link",
+    "situacao",
+    "situacao_link",
+    "marcador",
+    "marcador_link",
+    "aviso",
+    "peticionamento",
+    "link",
+    "numero",
+    "visualizado",
+    "atribuicao",
+    "tipo",
+    "interessado",
+)
+
+# Extrai no browser as linhas de processo da página de Controle de Processos com as
+# mesmas regras de `armazena_tags`, retornando somente arrays de strings
+JS_PROCESSOS = """
+var linhas = document.querySelectorAll("tr.infraTrClara"), resultado = [];
+
+function texto(el) { return el ? el.textContent.trim() : ""; }
+
+function mouseover(el) { return (el.getAttribute("onmouseover") || "").split("'"); }
+
+for (var i = 0; i < linhas.length; i++) {
+    var tds = linhas[i].querySelectorAll(":scope > td");
+    if (tds.length !== 6) { continue; }
+
+    var r = {aviso: ""}, checkbox = tds[0].querySelector("input.infraCheckbox");
+    r.checkbox = checkbox ? checkbox.id : null;
+
+    var controles = tds[1].querySelectorAll("a");
+    for (var j = 0; j < controles.length; j++) {
+        var a = controles[j], img = a.querySelector("img");
+        var src = img ? img.getAttribute("src") : "", partes = mouseover(a);
+        if (src.indexOf("imagens/sei_anotacao") >= 0) {
+            r.anotacao = partes[1] + " " + partes[3];
+            r.anotacao_link = a.getAttribute("href");
+        } else if (src.indexOf("imagens/sei_situacao") >= 0) {
+            r.situacao = partes[1];
+            r.situacao_link = a.getAttribute("href");
+        } else if (src.indexOf("imagens/marcador") >= 0) {
+            r.marcador = partes[1] + " " + partes[3];
+            r.marcador_link = a.getAttribute("href");
+        } else if (src.indexOf("imagens/exclamacao") >= 0) {
+            r.aviso = true;
+        }
+    }
+
+    var peticionamento = tds[1].querySelector("[src*='peticionamento']");
+    r.peticionamento = "";
+    if (peticionamento) {
+        var m = /\((.*)\)/.exec(peticionamento.getAttribute("onmouseover") || "");
+        if (m) { r.peticionamento = m[0].split('"')[1]; }
+    }
+
+    var processo = tds[2].querySelector("a");
+    r.link = processo.getAttribute("href");
+    r.numero = texto(processo);
+    r.visualizado = processo.classList.contains("processoVisualizado");
+    r.atribuicao = texto(tds[3].querySelector("a"));
+    r.tipo = texto(tds[4]);
+    r.interessado = texto(tds[5].querySelector(".spanItemCelula"));
+
+    var campos = arguments[0], linha = [];
+    for (var k = 0; k < campos.length; k++) {
+        linha.push(r.hasOwnProperty(campos[k]) ? r[campos[k]] : null);
+    }
+    resultado.push(linha);
+}
+
+return resultado;
+"""
+
+# Submete o formulário de paginação para a página arguments[1] numa nova aba de nome
+# arguments[2], sem alterar a página atual. arguments[0] é o id do campo da página atual
+JS_PAGINA_EM_ABA = """
+var campo = document.getElementById(arguments[0]), form = campo.form;
+var valor = campo.value, target = form.target;
+
+campo.value = arguments[1];
+form.target = arguments[2];
+form.submit();
+
+campo.value = valor;
+form.target = target;
+"""
+
+# Substitui, em todas as instâncias do CKEditor, o conteúdo de cada parágrafo que
+# contém uma chave de arguments[0] pelo html do seu valor. Retorna as chaves ausentes
+JS_RENDERIZAR_OFICIO = """
+var dados = arguments[0], encontradas = {}, ausentes = [];
+
+for (var nome in CKEDITOR.instances) {
+    var editor = CKEDITOR.instances[nome], editavel = editor.editable();
+    if (!editavel) { continue; }
+
+    var paragrafos = editavel.$.getElementsByTagName("p"), alterado = false;
+
+    for (var i = 0; i < paragrafos.length; i++) {
+        for (var chave in dados) {
+            if (paragrafos[i].textContent.indexOf(chave) >= 0) {
+                paragrafos[i].innerHTML = dados[chave];
+                encontradas[chave] = true;
+                alterado = true;
+                break;
+            }
+        }
+    }
+
+    if (alterado) {
+        editor.fire("saveSnapshot");
+        editor.fire("change");
+    }
+}
+
+for (var chave in dados) {
+    if (!encontradas[chave]) { ausentes.push(chave); }
+}
+
+return ausentes;
+"""
+
+# Verdadeiro quando todas as instâncias do CKEditor estão prontas
+JS_EDITOR_PRONTO = """
+if (typeof CKEDITOR === "undefined") { return false; }
+var nomes = Object.keys(CKEDITOR.instances);
+for (var i = 0; i < nomes.length; i++) {
+    if (CKEDITOR.instances[nomes[i]].status !== "ready") { return false; }
+}
+return nomes.length > 0;
+"""
+
+# Verdadeiro quando nenhuma instância do CKEditor tem alterações não salvas
+JS_EDITOR_SALVO = """
+for (var nome in CKEDITOR.instances) {
+    if (CKEDITOR.instances[nome].checkDirty()) { return false; }
+}
+return true;
+"""
+
+# Verdadeiro quando alguma instância do CKEditor tem alterações não salvas
+JS_EDITOR_ALTERADO = """
+for (var nome in CKEDITOR.instances) {
+    if (CKEDITOR.instances[nome].checkDirty()) { return true; }
+}
+return false;
+"""
+
+# Colunas do Bloco de Assinatura retornadas, nesta ordem, por JS_BLOCO
+CAMPOS_BLOCO = (
+    "checkbox",
+    "seq",
+    "processo",
+    "processo_link",
+    "processo_aberto",
+    "documento",
+    "data",
+    "tipo",
+    "assinatura",
+    "anotacoes",
+)
+
+JS_BLOCO = """
+var linhas = document.querySelectorAll("tr.infraTrClara, tr.infraTrEscura"), resultado = [];
+
+function texto(el) { return el ? el.textContent.trim() : ""; }
+
+for (var i = 0; i < linhas.length; i++) {
+    var tds = linhas[i].querySelectorAll(":scope > td");
+    if (tds.length !== 9) { continue; }
+
+    var checkbox = tds[0].querySelector("input"), processo = tds[2].querySelector("a");
+
+    resultado.push([
+        checkbox ? checkbox.id : null,
+        texto(tds[1]),
+        texto(processo),
+        processo ? processo.getAttribute("href") : null,
+        processo ? processo.classList.contains("protocoloAberto") : false,
+        texto(tds[3].querySelector("a")),
+        texto(tds[4]),
+        texto(tds[5]),
+        texto(tds[6]),
+        texto(tds[7]),
+    ]);
+}
+
+return resultado;
+"""
+
 
 # https://gist.github.com/ergoithz/6cf043e3fdedd1b94fcf
 def xpath_soup(element: Union[bs4.element.Tag, bs4.element.NavigableString]) -> str:
@@ -51,35 +256,154 @@ def xpath_soup(element: Union[bs4.element.Tag, bs4.element.NavigableString]) ->
     return "/%s" % "/".join(components)
 
 
+# Colunas exportadas por `dict_to_df` e `exporta_processos`, a coluna processo
+# corresponde à chave numero de `armazena_tags`
+COLUNAS_DF = (
+    "processo",
+    "tipo",
+    "atribuicao",
+    "marcador",
+    "anotacao",
+    "prioridade",
+    "peticionamento",
+    "aviso",
+    "situacao",
+    "interessado",
+)
+
+COLUNAS_CATEGORICAS = ("tipo", "atribuicao", "marcador", "prioridade", "situacao")
+
+
+def valor_serializavel(valor):
+    """Converte as tags html de `armazena_tags` em valores serializáveis: o id do
+    checkbox, str no lugar de NavigableString e os demais valores inalterados
+    """
+    if hasattr(valor, "attrs"):
+        return valor.get("id")
+
+    if isinstance(valor, str):
+        return str(valor)
+
+    return valor
+
+
+def _linha_df(processo: dict) -> tuple:
+    return tuple(
+        valor_serializavel(processo.get("numero" if c == "processo" else c))
+        for c in COLUNAS_DF
+    )
+
+
+def colunas_processos(processos) -> dict:
+    """Agrupa os valores dos processos em uma lista por coluna de COLUNAS_DF
+
+    Args:
+        processos (Iterable): Dicionários de `armazena_tags` ou `linhas_para_processos`
+
+    Returns:
+        dict: key=coluna, value=lista dos valores na ordem de `processos`
+    """
+    linhas = [_linha_df(p) for p in processos]
+
+    if not linhas:
+        return {c: [] for c in COLUNAS_DF}
+
+    return dict(zip(COLUNAS_DF, map(list, zip(*linhas))))
+
+
 def dict_to_df(processos):
     """Recebe a lista processos contendo um dicionário das tags de cada
     processo aberto no SEI. Retorna um Data Frame cujos registros
     são as string das tags.
+
+    O Data Frame é construído de uma só vez a partir das colunas de
+    `colunas_processos`. Requer o pandas.
     """
+    import pandas as pd
+
+    df = pd.DataFrame(colunas_processos(processos), columns=COLUNAS_DF)
 
-    cols = [
-        "processo",
-        "tipo",
-        "atribuicao",
-        "marcador",
-        "anotacao",
-        "prioridade",
-        "peticionamento",
-        "aviso",
-        "situacao",
-        "interessado",
-    ]
+    for coluna in COLUNAS_CATEGORICAS:
+        df[coluna] = df[coluna].astype("category")
 
-    df = pd.DataFrame(columns=cols)
+    return df
 
-    for p in processos:
-        df = df.append(pd.Series(p), ignore_index=True)
 
-    df["atribuicao"] = df["atribuicao"].astype("category")
-    df["prioridade"] = df["prioridade"].astype("category")
-    df["tipo"] = df["tipo"].astype("category")
+def exporta_processos(processos, arquivo, lote: int = 5000) -> int:
+    """Grava os processos em `arquivo` à medida que são gerados, em lotes de
+    `lote` linhas, sem montar um Data Frame
 
-    return df
+    O formato é definido pela extensão: .csv (biblioteca padrão) ou
+    .parquet/.arrow/.feather (requer o pyarrow).
+
+    Args:
+        processos (Iterable): Dicionários de `armazena_tags` ou `linhas_para_processos`
+        arquivo (str, Path): Caminho do arquivo
+        lote (int, optional): Nº de linhas gravadas por vez. Defaults to 5000.
+
+    Returns:
+        int: Nº de processos gravados
+    """
+    arquivo = Path(arquivo)
+
+    sufixo = arquivo.suffix.lower()
+
+    linhas = map(_linha_df, processos)
+
+    total = 0
+
+    if sufixo == ".csv":
+        with arquivo.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUNAS_DF)
+            for linha in linhas:
+                writer.writerow(linha)
+                total += 1
+
+        return total
+
+    if sufixo not in (".parquet", ".arrow", ".feather"):
+        raise ValueError(f"Formato não suportado: {sufixo}. Use .csv, .parquet ou .arrow")
+
+    import pyarrow as pa
+
+    # O Parquet já codifica as colunas repetitivas com dicionário
+    schema = pa.schema(
+        [(c, pa.bool_() if c == "aviso" else pa.string()) for c in COLUNAS_DF]
+    )
+
+    if sufixo == ".parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(str(arquivo), schema)
+    else:
+        writer = pa.ipc.new_file(str(arquivo), schema)
+
+    try:
+        while True:
+            bloco = list(islice(linhas, lote))
+
+            if not bloco:
+                break
+
+            arrays = [
+                # armazena_tags usa "" para a ausência de aviso
+                pa.array([bool(v) for v in coluna], type=pa.bool_())
+                if campo.name == "aviso"
+                else pa.array(
+                    [None if v is None else str(v) for v in coluna], type=pa.string()
+                )
+                for campo, coluna in zip(schema, zip(*bloco))
+            ]
+
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+            total += len(bloco)
+
+    finally:
+        writer.close()
+
+    return total
 
 
 def tag_controle(tag):
@@ -87,7 +411,7 @@ def tag_controle(tag):
 
     img = str(tag.img["src"])
 
-    pattern = re.search("\((.*)\)", tag.attrs.get("onmouseover"))
+    pattern = RE_PARENTESES.search(tag.attrs.get("onmouseover"))
 
     if "imagens/sei_anotacao" in img:
 
@@ -122,6 +446,7 @@ def pode_expedir(linha: dict) -> bool:
     
     Args:
         linha (dict): Dicionário com as informações da Linha do Bloco: Processo, tipo, assinatura, 
+            com as tags html de `armazena_bloco` ou as strings de `linhas_para_bloco`
     
     Returns:
         bool
@@ -133,6 +458,13 @@ def pode_expedir(linha: dict) -> bool:
         Se um dos casos acima falhar
     """
 
+    if isinstance(linha["processo"], str):
+        return (
+            linha["processo_aberto"]
+            and linha["tipo"] == "Ofício"
+            and ("Coordenador" in linha["assinatura"] or "Gerente" in linha["assinatura"])
+        )
+
     t1 = linha["processo"].find_all("a", class_="protocoloAberto")
 
     t2 = linha["tipo"].find_all(string="Ofício")
@@ -226,11 +558,13 @@ def armazena_tags(lista_tags: list) -> dict:
 
             dict_tags["aviso"] = True
 
-        peticionamento = lista_tags[1].find(src=re.compile("peticionamento"))
+    if controles:
+
+        peticionamento = lista_tags[1].find(src=RE_PETICIONAMENTO)
 
         if peticionamento:
 
-            pattern = re.search("\((.*)\)", peticionamento.attrs["onmouseover"])
+            pattern = RE_PARENTESES.search(peticionamento.attrs["onmouseover"])
             if pattern:
                 dict_tags["peticionamento"] = pattern.group().split('"')[1]
 
@@ -244,9 +578,8 @@ def armazena_tags(lista_tags: list) -> dict:
 
     dict_tags["numero"] = processo.string
 
-    dict_tags["visualizado"] = (
-        True if processo.attrs["class"] == "processoVisualizado" else False
-    )
+    # class é um atributo multivalorado, o BeautifulSoup o representa como lista
+    dict_tags["visualizado"] = "processoVisualizado" in processo.get("class", [])
 
     tag = lista_tags[3].find("a")
 
@@ -261,6 +594,177 @@ def armazena_tags(lista_tags: list) -> dict:
     return dict_tags
 
 
+def linhas_para_processos(linhas: list) -> list:
+    """Converte as linhas retornadas por JS_PROCESSOS nos mesmos dicionários
+    retornados por `armazena_tags`. O checkbox é representado pelo seu id.
+
+    Args:
+        linhas (list): Lista de valores de cada processo na ordem de CAMPOS_PROCESSO
+
+    Returns:
+        list: Lista de dicionários das tags de cada processo
+    """
+    processos = []
+
+    for linha in linhas:
+        dict_tags = {k: v for k, v in zip(CAMPOS_PROCESSO, linha) if v is not None}
+
+        for link in ("anotacao_link", "situacao_link", "marcador_link", "link"):
+            if link in dict_tags:
+                dict_tags[link] = URL + dict_tags[link]
+
+        processos.append(dict_tags)
+
+    return processos
+
+
+def linhas_para_bloco(linhas: list) -> list:
+    """Converte as linhas retornadas por JS_BLOCO em dicionários com as chaves
+    de CAMPOS_BLOCO
+
+    Args:
+        linhas (list): Lista de valores de cada linha do Bloco de Assinatura
+
+    Returns:
+        list: Lista de dicionários de cada linha do bloco
+    """
+    return [dict(zip(CAMPOS_BLOCO, linha)) for linha in linhas]
+
+
+def extrai_processos(html: str) -> list:
+    """Recebe o html de uma página de Controle de Processos do SEI e retorna
+    a lista de dicionários `armazena_tags` de cada processo da página
+
+    Args:
+        html (str): html da página, e.g. `driver.page_source`
+
+    Returns:
+        list: Lista de dicionários das tags de cada processo
+    """
+    source = bs4.BeautifulSoup(html, "lxml")
+
+    processos = []
+
+    for linha in source("tr", {"class": "infraTrClara"}):
+
+        tags = linha("td")
+
+        if len(tags) == 6:
+            processos.append(armazena_tags(tags))
+
+    return processos
+
+
+def _texto(elem) -> str:
+    return "".join(elem.itertext()).strip() if elem is not None else ""
+
+
+def _tem_classe(elem, classe: str) -> bool:
+    return classe in (elem.get("class") or "").split()
+
+
+def _registro_processo(tds: list) -> dict:
+    """Equivalente a `armazena_tags` para as células de uma linha lidas pelo lxml,
+    com valores somente do tipo str ou bool. O checkbox é representado pelo seu id.
+    """
+    registro = {"aviso": ""}
+
+    checkbox = next(
+        (e for e in tds[0].iter("input") if _tem_classe(e, "infraCheckbox")), None
+    )
+
+    registro["checkbox"] = checkbox.get("id") if checkbox is not None else None
+
+    controles = list(tds[1].iter("a"))
+
+    for tag_a in controles:
+
+        img = next(tag_a.iter("img"), None)
+
+        src = img.get("src", "") if img is not None else ""
+
+        partes = (tag_a.get("onmouseover") or "").split("'")
+
+        if "imagens/sei_anotacao" in src:
+            registro["anotacao"] = " ".join(partes[1:4:2])
+            registro["anotacao_link"] = URL + tag_a.get("href", "")
+
+        elif "imagens/sei_situacao" in src:
+            registro["situacao"] = partes[1]
+            registro["situacao_link"] = URL + tag_a.get("href", "")
+
+        elif "imagens/marcador" in src:
+            registro["marcador"] = " ".join(partes[1:4:2])
+            registro["marcador_link"] = URL + tag_a.get("href", "")
+
+        elif "imagens/exclamacao" in src:
+            registro["aviso"] = True
+
+    if controles:
+
+        peticionamento = next(
+            (e for e in tds[1].iter() if RE_PETICIONAMENTO.search(e.get("src") or "")),
+            None,
+        )
+
+        registro["peticionamento"] = ""
+
+        if peticionamento is not None:
+            pattern = RE_PARENTESES.search(peticionamento.get("onmouseover") or "")
+            if pattern:
+                registro["peticionamento"] = pattern.group().split('"')[1]
+
+    processo = next(tds[2].iter("a"))
+
+    registro["link"] = URL + processo.get("href", "")
+
+    registro["numero"] = _texto(processo)
+
+    registro["visualizado"] = _tem_classe(processo, "processoVisualizado")
+
+    registro["atribuicao"] = _texto(next(tds[3].iter("a"), None))
+
+    registro["tipo"] = _texto(tds[4])
+
+    registro["interessado"] = _texto(
+        next((e for e in tds[5].iter() if _tem_classe(e, "spanItemCelula")), None)
+    )
+
+    return registro
+
+
+def itera_registros_processos(html: Union[str, bytes]) -> Iterator[dict]:
+    """Gera, à medida que o html é lido, o registro de cada processo de uma página
+    de Controle de Processos do SEI
+
+    As linhas são interpretadas pelo `iterparse` do lxml e descartadas após o
+    processamento, de modo que nenhuma árvore da página é mantida em memória.
+
+    Args:
+        html (str, bytes): html da página, e.g. `driver.page_source`
+
+    Yields:
+        dict: Registro do processo, veja `_registro_processo`
+    """
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+
+    for _, tr in etree.iterparse(
+        BytesIO(html), events=("end",), tag="tr", html=True, encoding="utf-8"
+    ):
+        if _tem_classe(tr, "infraTrClara"):
+            tds = tr.findall("td")
+
+            if len(tds) == 6:
+                yield _registro_processo(tds)
+
+        # Libera a linha e as anteriores, já processadas
+        tr.clear()
+
+        while tr.getprevious() is not None:
+            del tr.getparent()[0]
+
+
 # TODO: Deprecated
 def string_endereço(dados, extra=True):
     d = {}
@@ -126,6 +126,11 @@ class Sei_Inicial:
 
     NEXT_PAG = (By.XPATH, '//*[@id="lnkInfraProximaPaginaSuperior"]')
 
+    # Formulário de paginação e o seu campo oculto da página atual
+    FORM = "frmProcedimentoControlar"
+
+    PAG_ATUAL = "hdnInfraPaginaAtual"
+
 
 class SeiHeader:
     LOTACAO: Elem = (By.XPATH, '//*[@id="selInfraUnidades"]')
@@ -136,6 +141,9 @@ class Blocos:
 
     BTN_CONCLUIR: Elem = ("id", "btnConcluir")
 
+    # Função javascript da página dos blocos que conclui o bloco informado
+    ACAO_CONCLUIR = "acaoConcluir('{}');"
+
 
 class Bloco:
     TITLE = "SEI - Documentos do Bloco de Assinatura"
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Índice local dos contatos cadastrados no SEI.
+
+Os contatos são consultados pelo CPF/CNPJ, sem pontuação, ou pelo nome, por
+similaridade de trigramas sem acentos, de modo que a verificação de interessados
+não precisa de uma pesquisa na interface do SEI para cada nome.
+"""
+# Standard Lib Imports
+import json
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Third party imports
+from bs4 import BeautifulSoup as soup
+
+# Local application imports
+from tools.functions import strip_string
+
+Contato = Dict[str, str]
+
+
+def normaliza_nome(nome: str) -> str:
+    """Remove acentos, espaços repetidos e converte para minúsculas"""
+    nome = unicodedata.normalize("NFKD", nome)
+    nome = "".join(c for c in nome if not unicodedata.combining(c))
+    return " ".join(nome.lower().split())
+
+
+def trigramas(nome: str) -> Set[str]:
+    """Retorna os trigramas do nome normalizado, delimitado por espaços"""
+    nome = f"  {normaliza_nome(nome)} "
+    return {nome[i : i + 3] for i in range(len(nome) - 2)}
+
+
+def extrai_contatos(html: str) -> List[Contato]:
+    """Extrai os contatos da página de listagem de contatos do SEI
+
+    As colunas são identificadas pelo texto do cabeçalho da tabela.
+
+    Returns:
+        list: Dicionários com nome, documento (CPF/CNPJ), sigla e id do contato
+    """
+    source = soup(html, "lxml")
+
+    contatos = []
+
+    for tabela in source.find_all("table", class_="infraTable"):
+        cabecalho = [normaliza_nome(th.get_text()) for th in tabela.find_all("th")]
+
+        colunas = {}
+
+        for i, titulo in enumerate(cabecalho):
+            if "nome" in titulo:
+                colunas.setdefault("nome", i)
+            elif "cpf" in titulo or "cnpj" in titulo:
+                colunas.setdefault("documento", i)
+            elif "sigla" in titulo:
+                colunas.setdefault("sigla", i)
+
+        if "nome" not in colunas:
+            continue
+
+        for tr in tabela.find_all("tr", class_=["infraTrClara", "infraTrEscura"]):
+            tds = tr.find_all("td", recursive=False)
+
+            if len(tds) != len(cabecalho):
+                continue
+
+            contato = {k: tds[i].get_text(strip=True) for k, i in colunas.items()}
+
+            checkbox = tr.find("input", class_="infraCheckbox")
+
+            contato["id"] = checkbox.get("value", "") if checkbox else ""
+
+            contatos.append(contato)
+
+    return contatos
+
+
+class IndiceContatos:
+    """Índice dos contatos por CPF/CNPJ e por trigramas do nome
+
+    Args:
+        contatos (Iterable, optional): Contatos de `extrai_contatos`. Defaults to ().
+    """
+
+    def __init__(self, contatos: Iterable[Contato] = ()) -> None:
+        self.limpar()
+        self.adicionar(contatos)
+
+    def limpar(self) -> None:
+        """Remove todos os contatos, mantendo a instância compartilhada"""
+        self.contatos: List[Contato] = []
+        self._documentos: Dict[str, int] = {}
+        self._nomes: Dict[str, int] = {}
+        self._trigramas: Dict[str, Set[int]] = defaultdict(set)
+        self._tamanhos: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.contatos)
+
+    def adicionar(self, contatos: Iterable[Contato]) -> None:
+        """Inclui os contatos no índice"""
+        for contato in contatos:
+            posicao = len(self.contatos)
+
+            self.contatos.append(contato)
+
+            documento = strip_string(contato.get("documento") or "")
+
+            if documento:
+                self._documentos[documento] = posicao
+
+            self._nomes.setdefault(normaliza_nome(contato["nome"]), posicao)
+
+            tris = trigramas(contato["nome"])
+
+            self._tamanhos.append(len(tris))
+
+            for trigrama in tris:
+                self._trigramas[trigrama].add(posicao)
+
+    def por_documento(self, documento: str) -> Optional[Contato]:
+        """Retorna o contato com o CPF/CNPJ `documento`, pontuado ou não"""
+        posicao = self._documentos.get(strip_string(documento))
+        return self.contatos[posicao] if posicao is not None else None
+
+    def por_nome(self, nome: str, limiar: float = 0.6) -> List[Tuple[float, Contato]]:
+        """Retorna os contatos cujo nome tem similaridade de Jaccard dos trigramas
+        maior ou igual a `limiar`, do mais ao menos similar. Um nome idêntico,
+        exceto por acentos e caixa, tem similaridade 1.
+        """
+        posicao = self._nomes.get(normaliza_nome(nome))
+
+        if posicao is not None:
+            return [(1.0, self.contatos[posicao])]
+
+        consulta = trigramas(nome)
+
+        comuns: Dict[int, int] = defaultdict(int)
+
+        for trigrama in consulta:
+            for posicao in self._trigramas.get(trigrama, ()):
+                comuns[posicao] += 1
+
+        resultado = []
+
+        for posicao, n in comuns.items():
+            similaridade = n / (len(consulta) + self._tamanhos[posicao] - n)
+
+            if similaridade >= limiar:
+                resultado.append((similaridade, self.contatos[posicao]))
+
+        return sorted(resultado, key=lambda r: r[0], reverse=True)
+
+    def existe(self, termo: str) -> bool:
+        """Verifica se há contato com o CPF/CNPJ `termo` ou com o nome idêntico a
+        `termo`, exceto por acentos, caixa e espaços. A similaridade de `buscar`
+        serve somente para sugestões.
+        """
+        if strip_string(termo).isdigit():
+            return self.por_documento(termo) is not None
+
+        return normaliza_nome(termo) in self._nomes
+
+    def buscar(self, termo: str, limiar: float = 0.6) -> Optional[Contato]:
+        """Retorna o contato de CPF/CNPJ `termo` ou o de nome mais similar a `termo`"""
+        if strip_string(termo).isdigit():
+            return self.por_documento(termo)
+
+        resultado = self.por_nome(termo, limiar)
+
+        return resultado[0][1] if resultado else None
+
+    def salvar(self, arquivo: Union[str, Path]) -> None:
+        """Grava os contatos num arquivo JSON"""
+        Path(arquivo).write_text(
+            json.dumps(self.contatos, ensure_ascii=False), encoding="utf-8"
+        )
+
+    @classmethod
+    def carregar(cls, arquivo: Union[str, Path]) -> "IndiceContatos":
+        """Cria o índice a partir do arquivo gravado por `salvar`, vazio caso o
+        arquivo não exista
+        """
+        arquivo = Path(arquivo)
+
+        if not arquivo.exists():
+            return cls()
+
+        return cls(json.loads(arquivo.read_text(encoding="utf-8")))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Índice em memória dos processos abertos do SEI usado por `Sei.filter_processos`.
+
+Para cada campo indexado é mantido um dicionário valor -> números dos processos,
+de modo que a igualdade é resolvida com uma consulta ao dicionário e as buscas
+por prefixo e substring percorrem somente os valores distintos do campo.
+"""
+# Standard Lib Imports
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Set
+
+CAMPOS_INDEXADOS = (
+    "atribuicao",
+    "tipo",
+    "marcador",
+    "situacao",
+    "interessado",
+    "visualizado",
+    "aviso",
+)
+
+# Sufixos aceitos nas chaves da consulta, e.g. tipo__prefixo="Outorga"
+OPERADORES = ("igual", "prefixo", "contem")
+
+
+class IndiceProcessos:
+    """Índice invertido dos campos de CAMPOS_INDEXADOS
+
+    Args:
+        processos (Iterable): Dicionários de `armazena_tags` ou `linhas_para_processos`
+    """
+
+    def __init__(self, processos: Iterable[Dict]) -> None:
+        self.ordem: Dict[str, int] = {}
+        self._valores: Dict[str, Dict[Any, Set[str]]] = {
+            campo: defaultdict(set) for campo in CAMPOS_INDEXADOS
+        }
+
+        for posicao, processo in enumerate(processos):
+            numero = processo["numero"]
+
+            self.ordem[numero] = posicao
+
+            for campo in CAMPOS_INDEXADOS:
+                self._valores[campo][processo.get(campo, "")].add(numero)
+
+        # Valores textuais em minúsculas ordenados para a busca binária por prefixo
+        self._ordenados: Dict[str, List] = {
+            campo: sorted(
+                (str(valor).lower(), valor)
+                for valor in valores
+                if isinstance(valor, str)
+            )
+            for campo, valores in self._valores.items()
+        }
+
+    def _busca(self, campo: str, operador: str, valor: Any) -> Set[str]:
+        if campo not in self._valores:
+            raise KeyError(f"O campo {campo} não é indexado: {CAMPOS_INDEXADOS}")
+
+        valores = self._valores[campo]
+
+        if operador == "igual":
+            return set(valores.get(valor, ()))
+
+        valor = str(valor).lower()
+
+        encontrados = set()
+
+        if operador == "prefixo":
+            ordenados = self._ordenados[campo]
+
+            for chave, original in ordenados[bisect_left(ordenados, (valor,)) :]:
+                if not chave.startswith(valor):
+                    break
+                encontrados |= valores[original]
+
+        elif operador == "contem":
+            for chave, original in self._ordenados[campo]:
+                if valor in chave:
+                    encontrados |= valores[original]
+
+        else:
+            raise ValueError(f"Operador inválido: {operador}. Use um de {OPERADORES}")
+
+        return encontrados
+
+    def consulta(self, ou: bool = False, **filtros) -> List[str]:
+        """Retorna os números dos processos que atendem aos filtros, na ordem original
+
+        Cada chave é um campo indexado, opcionalmente seguido de `__prefixo` ou
+        `__contem`, buscas que não diferenciam maiúsculas de minúsculas. Uma lista
+        de valores seleciona os processos que atendem a qualquer um deles.
+
+        Args:
+            ou (bool, optional): Combina os filtros com OU em vez de E. Defaults to False.
+            **filtros: campo[__operador]=valor ou lista de valores
+
+        Returns:
+            list: Números dos processos
+        """
+        resultado = None
+
+        for chave, valor in filtros.items():
+            campo, _, operador = chave.partition("__")
+
+            valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+
+            encontrados = set()
+
+            for v in valores:
+                encontrados |= self._busca(campo, operador or "igual", v)
+
+            if resultado is None:
+                resultado = encontrados
+            elif ou:
+                resultado |= encontrados
+            else:
+                resultado &= encontrados
+
+        if resultado is None:
+            return list(self.ordem)
+
+        return sorted(resultado, key=self.ordem.__getitem__)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Execução em lote de anotações, marcadores e exclusões de Acompanhamento Especial.
+
+As operações são agrupadas por processo, de modo que a página de cada processo é
+carregada uma única vez. O resultado de cada processo é acrescentado a um diário
+(um objeto JSON por linha) e os processos já concluídos são ignorados numa nova
+execução com o mesmo diário.
+"""
+# Standard Lib Imports
+import json
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Set, Union
+
+Operacao = namedtuple(
+    "Operacao",
+    "processo postit prioridade marcador texto_marcador excluir_acompanhamento",
+    defaults=(None, False, None, "", False),
+)
+Operacao.__doc__ = """Operação sobre um processo
+
+    processo (str): Número do processo
+    postit (str, optional): Texto da anotação, None não altera a anotação
+    prioridade (bool, optional): Anotação prioritária
+    marcador (str, optional): Tipo do marcador, None não altera o marcador
+    texto_marcador (str, optional): Texto do marcador
+    excluir_acompanhamento (bool, optional): Exclui o Acompanhamento Especial
+"""
+
+
+def agrupa_operacoes(
+    operacoes: Iterable[Operacao],
+) -> "OrderedDict[str, List[Operacao]]":
+    """Agrupa as operações por processo, mantendo a ordem da 1ª ocorrência"""
+    grupos: "OrderedDict[str, List[Operacao]]" = OrderedDict()
+
+    for operacao in operacoes:
+        grupos.setdefault(operacao.processo, []).append(operacao)
+
+    return grupos
+
+
+def concluidos(diario: Union[str, Path]) -> Set[str]:
+    """Retorna os processos registrados com sucesso no diário"""
+    diario = Path(diario)
+
+    if not diario.exists():
+        return set()
+
+    feitos = set()
+
+    with diario.open(encoding="utf-8") as f:
+        for linha in f:
+            # Uma linha incompleta indica uma interrupção durante a escrita
+            try:
+                registro = json.loads(linha)
+                ok, processo = registro["ok"], registro["processo"]
+            except (ValueError, KeyError, TypeError):
+                continue
+
+            if ok:
+                feitos.add(processo)
+
+    return feitos
+
+
+def _termina_linha(diario: Path) -> None:
+    """Acrescenta a quebra de linha ausente após uma linha incompleta, senão o
+    próximo registro seria gravado na mesma linha e descartado na leitura
+    """
+    if not diario.exists() or diario.stat().st_size == 0:
+        return
+
+    with diario.open("rb+") as f:
+        f.seek(-1, 2)
+
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def _aplica(processo, operacoes: List[Operacao]) -> None:
+    for operacao in operacoes:
+        if operacao.postit is not None:
+            processo.edita_postit(operacao.postit, operacao.prioridade)
+
+        if operacao.marcador is not None:
+            processo.edita_marcador(
+                operacao.marcador, operacao.texto_marcador, recarregar=False
+            )
+
+        if operacao.excluir_acompanhamento:
+            processo.excluir_acomp_especial()
+
+
+def executar_lote(
+    sei, operacoes: Iterable[Operacao], diario: Union[str, Path]
+) -> Dict[str, Any]:
+    """Aplica as operações, carregando a página de cada processo uma única vez
+
+    Args:
+        sei (Sei): Instância autenticada do SEI
+        operacoes (Iterable): Operações a serem aplicadas
+        diario (str, Path): Arquivo do diário de progresso
+
+    Returns:
+        dict: processados (nº de processos desta execução), ignorados (já
+            concluídos no diário), falhas (key=processo, value=erro), duracao (s) e
+            processos_por_minuto
+    """
+    diario = Path(diario)
+
+    grupos = agrupa_operacoes(operacoes)
+
+    feitos = concluidos(diario)
+
+    _termina_linha(diario)
+
+    falhas = {}
+
+    processados = 0
+
+    inicio = perf_counter()
+
+    with diario.open("a", encoding="utf-8") as f:
+        for numero, ops in grupos.items():
+            if numero in feitos:
+                continue
+
+            registro = {"processo": numero, "ok": True}
+
+            # A falha de um processo, qualquer que seja, não interrompe o lote
+            try:
+                _aplica(sei.go_to_processo(numero), ops)
+            except Exception as e:
+                registro.update(ok=False, erro=repr(e))
+                falhas[numero] = repr(e)
+
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            f.flush()
+
+            processados += 1
+
+    duracao = perf_counter() - inicio
+
+    return {
+        "processados": processados,
+        "ignorados": len(feitos & grupos.keys()),
+        "falhas": falhas,
+        "duracao": duracao,
+        "processos_por_minuto": 60 * processados / duracao if duracao else 0.0,
+    }
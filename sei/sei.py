@@ -1,10 +1,14 @@
 # Built-in Libs
 import datetime as dt
+import json
+import os
 import re
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
-from time import sleep
-from typing import Any, Dict, Union
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
 
 # Other Helpful Libs
 # import unidecode
@@ -21,20 +25,56 @@ from selenium.common.exceptions import (
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import Select, WebDriverWait
 
 from . import context
 
 # Others modules from this package
 from tools.functions import add_point_cpf_cnpj, get_browser
 from tools.page import Page
+from tools.sessao import SessaoHttp, restaurar_sessao, salvar_sessao
 
 from . import config
-from .common import armazena_tags, cria_dict_acoes, pode_expedir, string_endereço
+from .common import (
+    CAMPOS_PROCESSO,
+    JS_BLOCO,
+    JS_EDITOR_ALTERADO,
+    JS_EDITOR_PRONTO,
+    JS_EDITOR_SALVO,
+    JS_PAGINA_EM_ABA,
+    JS_PROCESSOS,
+    JS_RENDERIZAR_OFICIO,
+    cria_dict_acoes,
+    extrai_processos,
+    itera_registros_processos,
+    linhas_para_bloco,
+    linhas_para_processos,
+    pode_expedir,
+    string_endereço,
+)
+from .contatos import IndiceContatos, extrai_contatos
+from .indice import IndiceProcessos
+from .store import CacheLinks, Delta, ProcessoStore, chave_sessao
 
 Processos = Dict[str, Any]
 
 
+def altera_processo(metodo):
+    """Descarta a árvore e as ações armazenadas do processo após `metodo`, que
+    altera o processo, e.g. inclui documentos, envia o processo ou edita marcadores
+    """
+
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            # Mesmo uma alteração interrompida pode ter sido gravada
+            self.invalidar_cache()
+
+    return envoltorio
+
+
 # TODO: Add password Encryption
 # TODO: Select Normal/Teste
 # noinspection PyProtectedMember,PyProtectedMember,PyProtectedMember
@@ -45,23 +85,41 @@ def login_sei(
     timeout: int = 10,
     teste: bool = False,
     is_headless: bool = False,
+    sessao: str = None,
+    driver=None,
 ) -> Union["Sei", None]:
     """
     Esta função recebe uma string com o nome do webdriver, e as credenciais
     do usuário, loga no SEI - ANATEL e retorna uma instância da classe
     SEI.
+
+    Caso `sessao` seja o caminho de um arquivo, a sessão salva nele é restaurada
+    e o login só é feito se ela não for mais válida. Após um login a sessão
+    é salva no arquivo, criptografada com a senha do usuário.
+
+    Uma instância do webdriver já iniciada, e.g. por `tools.pool.WarmPool`,
+    pode ser fornecida em `driver`, caso em que `browser` e `is_headless` são ignorados.
     """
 
     helper = config.Sei_Login.Login
     if browser is None:
         browser = "Firefox"
-    driver = get_browser(browser=browser, is_headless=is_headless)
+    if driver is None:
+        driver = get_browser(browser=browser, is_headless=is_headless)
 
     page = Page(driver)
     page.timeout = timeout
+
+    if sessao is not None and restaurar_sessao(driver, sessao, pwd):
+        # O link para a página inicial só existe para usuários autenticados
+        if driver.find_elements(*config.Sei_Login.Base["init"]):
+            return Sei(page, teste=teste)
+
     url = "url_teste" if teste else "url"
     try:
-        page.driver.get(helper.get(url))
+        # O browser pré-iniciado pode já estar na página de login
+        if not page.driver.current_url.startswith(helper.get(url)):
+            page.driver.get(helper.get(url))
     except WebDriverException as e:
         print("Problema ao carregar a página")
         repr(e)
@@ -71,7 +129,10 @@ def login_sei(
     page._atualizar_elemento(helper.get("log"), usr)
     page._atualizar_elemento(helper.get("pwd"), pwd)
 
-    page._clicar(helper.get("submit"), silent=True)
+    page._clicar(helper.get("submit"), silent=True, alerta=True)
+
+    if sessao is not None and driver.find_elements(*config.Sei_Login.Base["init"]):
+        salvar_sessao(driver, sessao, pwd)
 
     return Sei(page, teste=teste)
 
@@ -82,21 +143,99 @@ class Sei:
     """
 
     def __init__(
-        self, page: Page, processos: Processos = None, teste: bool = False
+        self,
+        page: Page,
+        processos: Processos = None,
+        teste: bool = False,
+        contatos: IndiceContatos = None,
     ) -> None:
         self.teste = teste
         self.page = page
-        self._processos = processos if processos is not None else OrderedDict()
+        self.http = None
+        # Compartilhado com as instâncias de Processo criadas por `go_to_processo`
+        self.contatos = contatos if contatos is not None else IndiceContatos()
+        self.links: Optional[CacheLinks] = None
+        self._set_processos(processos.values() if processos is not None else [])
+
+    def usar_http(self, pool_maxsize: int = 10) -> SessaoHttp:
+        """Habilita o modo HTTP das extrações reutilizando a sessão do webdriver
+
+        Args:
+            pool_maxsize (int, optional): Nº de conexões mantidas abertas. Defaults to 10.
+
+        Returns:
+            SessaoHttp: Cliente HTTP com os cookies do webdriver
+        """
+        self.http = SessaoHttp(self.page.driver, pool_maxsize=pool_maxsize)
+        return self.http
 
     # noinspection PyProtectedMember
     def mudar_lotação(self, lotação: str) -> None:
 
         h = config.SeiHeader
 
-        self.page._selecionar_por_texto(h.LOTACAO, lotação)
+        self.page._selecionar_por_texto(h.LOTACAO, lotação, alerta=False)
+
+    def usar_cache_links(self, arquivo: str) -> CacheLinks:
+        """Habilita o mapa persistente dos links dos processos usado por
+        `go_to_processo`, preenchido a cada extração e Pesquisa Rápida. Somente os
+        links da sessão atual do SEI são usados.
+
+        Args:
+            arquivo (str): Caminho do banco SQLite
+
+        Returns:
+            CacheLinks: O mapa de links
+        """
+        self.links = CacheLinks(arquivo, chave_sessao(self.page.driver.get_cookies()))
+        self.links.atualizar({n: p.get("link") for n, p in self._processos.items()})
+        return self.links
 
     def _set_processos(self, processos) -> None:
         self._processos = OrderedDict((p["numero"], p) for p in processos)
+        self._indice = IndiceProcessos(self._processos.values())
+
+        if self.links is not None:
+            self.links.atualizar({n: p.get("link") for n, p in self._processos.items()})
+
+    def sincronizar_contatos(self, arquivo: str = None) -> IndiceContatos:
+        """Lista todos os contatos do SEI, percorrendo as páginas da listagem, e
+        recria o índice local `contatos`
+
+        Args:
+            arquivo (str, optional): Arquivo JSON onde o índice é gravado. Defaults to None.
+
+        Returns:
+            IndiceContatos: O índice atualizado
+        """
+        helper = config.Contato
+
+        if self.page.get_title() != helper.TITLE:
+            with self.page.wait_for_page_load():
+                self._vai_para_pag_contato()
+
+        self.page._atualizar_elemento(config.Pesq_contato.ID_SEARCH, "")
+        self.page._clicar(helper.BTN_PESQUISAR, alerta=False)
+
+        # O índice é atualizado no lugar, pois é compartilhado com os processos
+        self.contatos.limpar()
+
+        for html in self._paginas_browser(lambda: self.page.driver.page_source):
+            self.contatos.adicionar(extrai_contatos(html))
+
+        if arquivo is not None:
+            self.contatos.salvar(arquivo)
+
+        return self.contatos
+
+    def contato_existe(self, termo: str) -> bool:
+        """Verifica no índice local `contatos` se há contato com o CPF/CNPJ ou o
+        nome exato `termo`. Somente caso não haja, a pesquisa é feita no SEI.
+        """
+        if self.contatos.existe(termo):
+            return True
+
+        return self.pesquisa_contato(termo) is not None
 
     # TODO: generalize
     # DEPRECATED
@@ -115,7 +254,7 @@ class Sei:
                 self._vai_para_pag_contato()
 
         self.page._atualizar_elemento(config.Pesq_contato.ID_SEARCH, termo)
-        self.page._clicar(helper.BTN_PESQUISAR)
+        self.page._clicar(helper.BTN_PESQUISAR, alerta=False)
 
         html = soup(self.page.driver.page_source, "lxml")
 
@@ -153,53 +292,43 @@ class Sei:
 
         dados["UF"] = dados["UF"].upper()
 
-        self.page._selecionar_por_texto(helper.TIPO, "Pessoa Física")
+        self.page._selecionar_por_texto(helper.TIPO, "Pessoa Física", alerta=False)
 
-        self.page._clicar(helper.PF)
+        self.page._clicar(helper.PF, alerta=False)
 
         cpf = dados.get("CNPJ/CPF", "")
 
         cpf = add_point_cpf_cnpj(cpf)
 
-        self.page._atualizar_elemento(helper.SIGLA, cpf)
-
         if dados.get("Sexo", "") == "FEMININO":
-            self.page._clicar(helper.FEMININO)
+            self.page._clicar(helper.FEMININO, alerta=False)
         else:
-            self.page._clicar(helper.MASCULINO)
-
-        # TODO: Criar função auxiliar page.atualizar_elementos
-
-        self.page._atualizar_elemento(helper.NOME, dados.get("Nome/Razão Social", ""))
-
-        self.page._atualizar_elemento(
-            helper.END, dados.get("Logradouro", "") + " " + dados.get("Número", "")
+            self.page._clicar(helper.MASCULINO, alerta=False)
+
+        self.page._selecionar_por_texto(helper.PAIS, "Brasil", alerta=False)
+
+        self.page._selecionar_por_texto(helper.UF, dados.get("UF", ""), alerta=False)
+
+        self.page.preencher_formulario(
+            {
+                helper.SIGLA: cpf,
+                helper.NOME: dados.get("Nome/Razão Social", ""),
+                helper.END: dados.get("Logradouro", "") + " " + dados.get("Número", ""),
+                helper.COMP: dados.get("Complemento", ""),
+                helper.BAIRRO: dados.get("Bairro", ""),
+                helper.CEP: dados.get("Cep", ""),
+                helper.CPF: dados.get("Cpf_RF", ""),
+                helper.RG: dados.get("Rg", ""),
+                helper.ORG: dados.get("Org", ""),
+                helper.NASC: dados.get("Nasc", ""),
+                helper.FONE: dados.get("Fone", ""),
+                helper.CEL: dados.get("Cel", ""),
+                helper.EMAIL: dados.get("Email", ""),
+            },
+            # Campos com máscara de digitação
+            teclas=(helper.CEP, helper.NASC),
         )
 
-        self.page._atualizar_elemento(helper.COMP, dados.get("Complemento", ""))
-
-        self.page._atualizar_elemento(helper.BAIRRO, dados.get("Bairro", ""))
-
-        self.page._selecionar_por_texto(helper.PAIS, "Brasil")
-
-        self.page._selecionar_por_texto(helper.UF, dados.get("UF", ""))
-
-        self.page._atualizar_elemento(helper.CEP, dados.get("Cep", ""))
-
-        self.page._atualizar_elemento(helper.CPF, dados.get("Cpf_RF", ""))
-
-        self.page._atualizar_elemento(helper.RG, dados.get("Rg", ""))
-
-        self.page._atualizar_elemento(helper.ORG, dados.get("Org", ""))
-
-        self.page._atualizar_elemento(helper.NASC, dados.get("Nasc", ""))
-
-        self.page._atualizar_elemento(helper.FONE, dados.get("Fone", ""))
-
-        self.page._atualizar_elemento(helper.CEL, dados.get("Cel", ""))
-
-        self.page._atualizar_elemento(helper.EMAIL, dados.get("Email", ""))
-
         # Cidade por último para dar Tempo de Carregamento
         cidade = Select(self.page.wait_for_element_to_be_visible(helper.CIDADE))
 
@@ -248,13 +377,26 @@ class Sei:
     def get_processos(self):
         return self._processos
 
-    def filter_processos(self, **kwargs):
-        processos = {}
+    def filter_processos(self, ou: bool = False, **kwargs) -> Processos:
+        """Filtra os processos armazenados por `itera_processos` usando o índice
+        dos campos de CAMPOS_INDEXADOS
 
-        for k, v in kwargs:
-            processos = {p: q for p, q in self._processos.items() if p.get(k) == v}
+        Args:
+            ou (bool, optional): Combina os filtros com OU em vez de E. Defaults to False.
+            **kwargs: campo[__prefixo|__contem]=valor ou lista de valores
+
+        Returns:
+            dict: key=número do processo, value=tags do processo
 
-        return processos
+        Usage
+        -----
+        >>> sei.filter_processos(atribuicao="fulano", tipo__prefixo="Outorga")  # doctest: +SKIP
+        >>> sei.filter_processos(ou=True, marcador__contem="urgente", aviso=True)  # doctest: +SKIP
+        """
+        return OrderedDict(
+            (numero, self._processos[numero])
+            for numero in self._indice.consulta(ou=ou, **kwargs)
+        )
 
     # noinspection PyProtectedMember
     def go_to_processo(self, num: str) -> "Processo":
@@ -264,21 +406,45 @@ class Sei:
 
             self.go(p["link"])
 
-            return Processo(self.page, numero=num, tags=self._processos[num])
+            return Processo(
+                self.page, numero=num, tags=self._processos[num], contatos=self.contatos
+            )
 
-        else:
+        link = self.links.get(num) if self.links is not None else None
 
-            try:
+        if link is not None:
+
+            self.go(link)
+
+            # O link é recusado caso o hash da sessão do SEI tenha expirado
+            if self.page.get_title() == config.Iniciar_Processo.TITLE:
+                return Processo(self.page, num, tags=None, contatos=self.contatos)
+
+            self.links.remover(num)
+
+            # Após um novo login os links das sessões anteriores são inválidos
+            self.links.mudar_sessao(chave_sessao(self.page.driver.get_cookies()))
+
+        try:
 
+            with self.page.wait_for_page_load():
                 self.page._atualizar_elemento(
                     config.Sei_Login.Base["pesquisa"], num + Keys.ENTER
                 )
 
-            except NoSuchElementException:
+        except (NoSuchElementException, TimeoutException):
+
+            self.go_to_init_page()
 
-                self.go_to_init_page()
+        else:
 
-            return Processo(self.page, num, tags=None)
+            if (
+                self.links is not None
+                and self.page.get_title() == config.Iniciar_Processo.TITLE
+            ):
+                self.links.atualizar({num: self.page.driver.current_url})
+
+        return Processo(self.page, num, tags=None, contatos=self.contatos)
 
     def ver_todos(self):
         """Expanda a visualização na página inicial para todos os processos.
@@ -293,7 +459,7 @@ class Sei:
             return  # Já está na visualização geral
 
         try:
-            self.page._clicar(config.Sei_Inicial.VER_TODOS)
+            self.page._clicar(config.Sei_Inicial.VER_TODOS, alerta=False)
         except (NoSuchElementException, TimeoutException):
             print(
                 "Não foi possível exibir todos os processos ou já se encontram exibidos."
@@ -313,7 +479,7 @@ class Sei:
             return  # Já está na visualização geral
 
         try:
-            self.page._clicar(config.Sei_Inicial.VER_DET)
+            self.page._clicar(config.Sei_Inicial.VER_DET, alerta=False)
         except (NoSuchElementException, TimeoutException):
             print(
                 "Não foi possível exibir a visualização detalhada ou a página já se encontra exibida."
@@ -336,7 +502,7 @@ class Sei:
             return
         try:
 
-            self.page._clicar(config.Sei_Login.Base["init"])
+            self.page._clicar(config.Sei_Login.Base["init"], alerta=False)
 
         except NoSuchElementException:
 
@@ -354,42 +520,170 @@ class Sei:
             menu.click()
 
     # noinspection PyProtectedMember,PyProtectedMember
-    def itera_processos(self):
+    def itera_processos(
+        self, http: bool = False, js: bool = False, abas: int = 1, compacto: bool = False
+    ):
         """
         Navega as páginas de processos abertos no SEI e guarda as tags
         html dos processos como objeto soup no atributo processos_abertos
+
+        Args:
+            http (bool, optional): Obtém as páginas via `SessaoHttp` em vez de
+                navegá-las no browser. Defaults to False.
+            js (bool, optional): Extrai as linhas de cada página no próprio browser
+                com `JS_PROCESSOS`, os valores são strings em vez de tags html.
+                Ignorado caso `http` seja True. Defaults to False.
+            abas (int, optional): Nº de páginas carregadas simultaneamente, cada uma
+                numa aba do browser. Ignorado caso `http` seja True. Defaults to 1.
+            compacto (bool, optional): Interpreta o html com o parser incremental
+                `itera_registros_processos`, os valores são strings em vez de tags
+                html e nenhuma árvore das páginas é mantida. Defaults to False.
         """
         h = config.Sei_Inicial
 
-        # Apaga o conteúdo atual da lista de processos
-        processos = []
-
         self.go_to_init_page()
         self.ver_todos()
         self.ver_detalhado()
 
-        self.page._clicar_se_existir(h.BOT_PAG_1)
+        self.page._clicar_se_existir(h.BOT_PAG_1, alerta=False)
+
+        def extrair_html():
+            return self.page.driver.page_source
+
+        converter_html = itera_registros_processos if compacto else extrai_processos
+
+        if http:
+            paginas, converter = self._paginas_http(), converter_html
+
+        else:
+            if js:
+
+                def extrair():
+                    return self.page.driver.execute_script(
+                        JS_PROCESSOS, CAMPOS_PROCESSO
+                    )
+
+                converter = linhas_para_processos
+            else:
+                extrair, converter = extrair_html, converter_html
+
+            if abas > 1:
+                paginas = self._paginas_abas(extrair, abas)
+            else:
+                paginas = self._paginas_browser(extrair)
+
+        processos_abertos = OrderedDict()
 
-        html_sei = soup(self.page.driver.page_source, "lxml")
+        # Um processo pode mudar de página durante a navegação, vale a 1ª ocorrência
+        for pagina in paginas:
+            for processo in converter(pagina):
+                processos_abertos.setdefault(processo["numero"], processo)
 
-        processos += html_sei("tr", {"class": "infraTrClara"})
+        self._set_processos(processos_abertos.values())
 
-        while self.page._clicar_se_existir(h.NEXT_PAG):
+    def sincronizar_processos(self, store: ProcessoStore, **kwargs) -> Delta:
+        """Extrai os processos abertos e grava no `store` somente o que mudou desde
+        a última sincronização
 
-            html_sei = soup(self.page.driver.page_source, "lxml")
+        Args:
+            store (ProcessoStore): Banco local dos processos
+            **kwargs: Opções repassadas a `itera_processos`
 
-            processos += html_sei("tr", {"class": "infraTrClara"})
+        Returns:
+            Delta: Processos adicionados, removidos e alterados
+        """
+        self.itera_processos(**kwargs)
 
-        processos_abertos = []
+        return store.sync(self._processos.values())
+
+    def _paginas_browser(self, extrair):
+        """Gera o resultado de `extrair()` em cada página de processos navegando-as
+        no browser
+        """
+        h = config.Sei_Inicial
+
+        yield extrair()
+
+        while self.page._clicar_se_existir(h.NEXT_PAG, alerta=False):
+            yield extrair()
+
+    def _paginas_abas(self, extrair, abas: int):
+        """Gera, na ordem das páginas, o resultado de `extrair()` em cada página de
+        processos. As páginas são carregadas simultaneamente em lotes de `abas`
+        abas, abertas a partir do formulário de paginação da página atual.
+        """
+        h = config.Sei_Inicial
+
+        driver = self.page.driver
+
+        principal = driver.current_window_handle
+
+        total = len(driver.find_elements(By.CSS_SELECTOR, f"#{h.CONT[1]} option")) or 1
+
+        yield extrair()
+
+        for inicio in range(1, total, abas):
+            lote = range(inicio, min(inicio + abas, total))
+
+            anteriores = set(driver.window_handles)
+
+            for pagina in lote:
+                driver.execute_script(
+                    JS_PAGINA_EM_ABA, h.PAG_ATUAL, str(pagina), f"pagina_{pagina}"
+                )
+
+            WebDriverWait(driver, self.page.timeout).until(
+                lambda d: len(set(d.window_handles) - anteriores) == len(lote)
+            )
+
+            nomes = {}
+
+            try:
+                for handle in set(driver.window_handles) - anteriores:
+                    driver.switch_to.window(handle)
+                    nomes[driver.execute_script("return window.name;")] = handle
 
-        for line in processos:
+                for pagina in lote:
+                    driver.switch_to.window(nomes[f"pagina_{pagina}"])
 
-            tags = line("td")
+                    WebDriverWait(driver, self.page.timeout).until(
+                        lambda d: d.execute_script(
+                            "return location.href != 'about:blank'"
+                            " && document.readyState == 'complete';"
+                        )
+                    )
 
-            if len(tags) == 6:
-                processos_abertos.append(armazena_tags(tags))
+                    yield extrair()
 
-        self._set_processos(processos_abertos)
+            finally:
+                for handle in set(driver.window_handles) - anteriores:
+                    driver.switch_to.window(handle)
+                    driver.close()
+
+                driver.switch_to.window(principal)
+
+    def _paginas_http(self):
+        """Gera o html de cada página de processos submetendo o formulário
+        de paginação via `SessaoHttp`, a partir da página atual do browser
+        """
+        h = config.Sei_Inicial
+
+        if self.http is None:
+            self.usar_http()
+
+        html = self.http.get(self.page.driver.current_url)
+
+        yield html
+
+        paginacao = soup(html, "lxml").find(id=h.CONT[1])
+
+        total = len(paginacao.find_all("option")) if paginacao else 1
+
+        for pagina in range(1, total):
+            html = self.http.enviar_formulario(
+                self.http.url, {h.PAG_ATUAL: str(pagina)}, html=html, form_id=h.FORM
+            )
+            yield html
 
     # DEPRECATED
     def atualizar_contato(self, nome, dados):
@@ -438,7 +732,7 @@ class Sei:
     def exibir_bloco(self, numero):
         if self.page.get_title() != config.Blocos.TITLE:
             self.go_to_blocos()
-        if not self.page._clicar_se_existir(("link text", str(numero))):
+        if not self.page._clicar_se_existir(("link text", str(numero)), alerta=False):
             print(f"O Bloco de Assinatura {numero} não existe ou está concluído!")
 
     def criar_processo(
@@ -460,11 +754,11 @@ class Sei:
 
         self.show_lat_menu()
 
-        self.page._clicar(config.Sei_Menu.INIT_PROC)
+        self.page._clicar(config.Sei_Menu.INIT_PROC, alerta=False)
 
-        self.page._clicar(config.Iniciar_Processo.EXIBE_ALL)
+        self.page._clicar(config.Iniciar_Processo.EXIBE_ALL, alerta=False)
 
-        self.page._clicar((By.LINK_TEXT, tipo))
+        self.page._clicar((By.LINK_TEXT, tipo), alerta=False)
 
         if especificacao:
             self.page._atualizar_elemento(helper.ESPEC, especificacao)
@@ -478,13 +772,13 @@ class Sei:
             self.page._atualizar_elemento(helper.OBS, obs)
 
         if nivel == "público":
-            self.page._clicar(helper.PUBL)
+            self.page._clicar(helper.PUBL, alerta=False)
 
         elif nivel == "restrito":
-            self.page._clicar(helper.REST)
+            self.page._clicar(helper.REST, alerta=False)
 
         else:
-            self.page._clicar(helper.SIG)
+            self.page._clicar(helper.SIG, alerta=False)
 
         if salvar:
 
@@ -495,19 +789,79 @@ class Sei:
 
 
 class Processo(Sei):
-    def __init__(self, page, numero, tags=None):
-        super().__init__(page)
+    # Árvore e ações já interpretadas, compartilhadas pelas instâncias do mesmo processo
+    # key=(id da sessão do webdriver, número do processo), value={"arvore", "acoes"}
+    # Acima de CACHE_MAXIMO processos os usados há mais tempo são descartados
+    _cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+
+    CACHE_MAXIMO = 256
+
+    def __init__(self, page, numero, tags=None, contatos=None):
+        super().__init__(page, contatos=contatos)
         self.numero = numero
         self.tags = tags if tags is not None else dict()
-        self.acoes = {}
-        self.arvore = OrderedDict()
+
+        chave = self._chave_cache()
+
+        cache = Processo._cache.pop(chave, None) or {
+            "arvore": OrderedDict(),
+            "acoes": {},
+        }
+
+        Processo._cache[chave] = cache
+
+        while len(Processo._cache) > self.CACHE_MAXIMO:
+            Processo._cache.popitem(last=False)
+
+        # key=rótulo do documento na árvore ou número do processo, value=dict de ações
+        self.acoes = cache["acoes"]
+        self.arvore = cache["arvore"]
         self.link = self.page.driver.current_url
 
+        # Nó da árvore exibido no frame central e a url em que foi exibido
+        self._exibido_em = (None, None)
+
+    @property
+    def _exibido(self) -> Optional[str]:
+        """Nó da árvore exibido no frame central, None caso desconhecido ou caso o
+        browser tenha navegado para outra página desde a exibição
+        """
+        alvo, url = self._exibido_em
+
+        if alvo is not None and url != self.page.driver.current_url:
+            return None
+
+        return alvo
+
+    @_exibido.setter
+    def _exibido(self, alvo: Optional[str]) -> None:
+        url = self.page.driver.current_url if alvo is not None else None
+        self._exibido_em = (alvo, url)
+
+    def _chave_cache(self) -> Tuple[str, str]:
+        return getattr(self.page.driver, "session_id", None), self.numero
+
+    def invalidar_cache(self) -> None:
+        """Descarta a árvore e as ações armazenadas do processo. É chamado por
+        `altera_processo` após as ações que alteram o processo, e.g. incluir
+        documentos, concluir ou reabrir o processo
+        """
+        self.arvore.clear()
+        self.acoes.clear()
+        self._exibido = None
+
+    def go(self, link):
+        super().go(link)
+        self._exibido = None
+
     def get_tags(self):
         return self.tags
 
     @contextmanager
-    def _go_to_central_frame(self):
+    def _go_to_central_frame(self, leitura: bool = False):
+        """Alterna para o frame central. Exceto quando `leitura` é True, as ações
+        executadas no frame podem mudar o conteúdo exibido
+        """
 
         # Switch to central frame
         self.page.driver.switch_to.frame("ifrVisualizacao")
@@ -518,13 +872,16 @@ class Processo(Sei):
             # Return to main content
             self.page.driver.switch_to_default_content()
 
+            if not leitura:
+                self._exibido = None
+
     def _acoes_central_frame(self):
 
         assert (
             self.page.get_title() == config.Iniciar_Processo.TITLE
         ), "Erro ao navegar para o processo"
 
-        with self._go_to_central_frame():
+        with self._go_to_central_frame(leitura=True):
             try:
                 self.page.wait_for_element(config.Proc_central.ACOES)
             except TimeoutException:
@@ -540,18 +897,33 @@ class Processo(Sei):
     def _get_acoes(self, doc=None, click=True):
 
         # O comportamento padrão é extrair as ações do Processo Pai
-        if click:
-            if doc is None:
-                self._click_na_arvore(self.numero)
-            else:
-                self._click_na_arvore(doc)
+        alvo = self.numero if doc is None else doc
+
+        clicou = click and self._exibido != alvo
+
+        if clicou:
+            self._click_na_arvore(alvo)
+
+        if self._exibido == alvo and alvo in self.acoes:
+            if clicou:
+                # Os localizadores do cache só valem após a exibição do documento
+                with self._go_to_central_frame(leitura=True):
+                    self.page.wait_for_element(config.Proc_central.ACOES)
+
+            return self.acoes[alvo]
 
-        return self._acoes_central_frame()
+        acoes = self._acoes_central_frame()
+
+        if acoes:
+            self.acoes[alvo] = acoes
+            self._exibido = alvo
+
+        return acoes
 
     # TODO: Retornar lista de setores e atribuições
     def _info_unidades(self) -> str:
         # self._get_acoes()
-        with self._go_to_central_frame():
+        with self._go_to_central_frame(leitura=True):
             source = soup(self.page.driver.page_source, "lxml")
             result = source.find("div", id="divInformacao")
             if hasattr(result, "text"):
@@ -568,6 +940,7 @@ class Processo(Sei):
     def close_processo(self):
         self.page.fechar()
 
+    @altera_processo
     def concluir_processo(self):
 
         assert (
@@ -578,8 +951,9 @@ class Processo(Sei):
 
         if concluir is not None:
             with self._go_to_central_frame():
-                self.page._clicar(concluir)
+                self.page._clicar(concluir, alerta=True)
 
+    @altera_processo
     def abrir_processo(self):
 
         assert (
@@ -590,7 +964,7 @@ class Processo(Sei):
 
         if abrir is not None:
             with self._go_to_central_frame():
-                self.page._clicar(abrir)
+                self.page._clicar(abrir, alerta=True)
 
     # todo: Implementar click_central_frame
 
@@ -609,6 +983,8 @@ class Processo(Sei):
 
     def armazena_arvore(self):
 
+        self.arvore.clear()
+
         # Switch to the frame in which arvore is in, only inside the contextmanager
         with self._go_to_arvore():
 
@@ -644,7 +1020,8 @@ class Processo(Sei):
 
             if label in k:
                 with self._go_to_arvore():
-                    self.page._clicar((By.ID, v["id"]))
+                    self.page._clicar((By.ID, v["id"]), alerta=False)
+                self._exibido = label
                 return
 
         else:
@@ -659,8 +1036,9 @@ class Processo(Sei):
 
         with self._go_to_arvore():
             if self.page.check_element_exists(h.ABRIR_PASTAS):
-                self.page._clicar(h.ABRIR_PASTAS)
+                self.page._clicar(h.ABRIR_PASTAS, alerta=False)
 
+    @altera_processo
     def send_doc_por_email(self, label, dados):
 
         # script = self._get_acoes(num_doc)["Enviar Documento por Correio Eletrônico"]
@@ -695,33 +1073,58 @@ class Processo(Sei):
             self.page.get_title() == config.Iniciar_Processo.TITLE
         ), "Erro ao navegar para o processo"
 
-        # Switch to tree frame
-        self._go_to_arvore()
-
-        with self.page.wait_for_page_load():
+        with self._go_to_arvore():
             html_tree = soup(self.page.driver.page_source, "lxml")
 
-            info = html_tree.find(title=re.compile(num_doc)).string
+        tag = html_tree.find(title=re.compile(re.escape(num_doc)))
 
-            assert info != "", "Falha ao retornar Info do Ofício da Árvore"
+        if tag is None or not tag.string:
+            raise LookupError(f"O ofício {num_doc} não está na árvore do processo")
 
-            # return to parent frame
-            self.page.driver.switch_to_default_content()
+        return tag.string
+
+    def _abrir_acao(self, acoes: Dict, titulo: str) -> Tuple[str, str]:
+        """Abre o link da ação `titulo` do frame central numa nova janela e muda o
+        foco para ela
+
+        Args:
+            acoes (dict): Ações retornadas por `_get_acoes`
+            titulo (str): Título da ação, e.g. "Enviar Processo"
+
+        Returns:
+            tuple: (janela do processo, nova janela)
+        """
+        acao = acoes.get(titulo)
+
+        if acao is None:
+            raise LookupError(f"A ação '{titulo}' não está disponível no processo")
+
+        with self._go_to_central_frame(leitura=True):
+            link = self.page.wait_for_element(acao).get_attribute("href")
+
+        janela = self.page.driver.current_window_handle
+
+        janelas = self.page.driver.window_handles
+
+        self.page.driver.execute_script("window.open(arguments[0]);", link)
+
+        self.page.wait_for_new_window(janelas)
+
+        nova = self.page.driver.window_handles[-1]
+
+        self.page.driver.switch_to.window(nova)
 
-            return info
+        return janela, nova
 
     # TODO: Mudar verificação para bs4
     # TODO: Criar helper para verificação bs4 DRY principle
-    def update_andamento(self, buttons, info):
+    @altera_processo
+    def update_andamento(self, acoes, info):
         assert (
             self.page.get_title() == config.Iniciar_Processo.TITLE
         ), "Erro ao navegar para o processo"
 
-        andamento = buttons[4]
-
-        link = andamento.attrs["href"]
-
-        (proc_window, and_window) = Page.nav_link_to_new_win(self.page.driver, link)
+        proc_window, _ = self._abrir_acao(acoes, "Atualizar Andamento")
 
         input_and = self.page.wait_for_element(config.Proc_central.IN_AND)
 
@@ -737,20 +1140,14 @@ class Processo(Sei):
 
     # TODO: Update to bs4 and to use page methods
     # TODO: Replicate logic of send_doc_por_email
-    def send_proc_to_sede(self, buttons):
-
-        with self.page.wait_for_page_load():
-            assert (
-                self.page.get_title() == config.Iniciar_Processo.TITLE
-            ), "Erro na função 'send_proc_to_sede"
+    @altera_processo
+    def send_proc_to_sede(self, acoes):
 
-            enviar = buttons[3]
+        assert (
+            self.page.get_title() == config.Iniciar_Processo.TITLE
+        ), "Erro na função 'send_proc_to_sede"
 
-            link = enviar.attrs["href"]
-
-            (janela_processo, janela_enviar) = Page.nav_link_to_new_win(
-                self.page.driver, link
-            )
+        janela_processo, janela_enviar = self._abrir_acao(acoes, "Enviar Processo")
 
         with self.page.wait_for_page_load():
             assert (
@@ -816,11 +1213,10 @@ class Processo(Sei):
 
         info = self.info_oficio(num_doc)
 
-        buttons = self._get_acoes()
-
-        self.update_andamento(buttons, info)
+        self.update_andamento(self._get_acoes(), info)
 
-        self.send_proc_to_sede(buttons)
+        # O andamento invalida o cache, as ações são lidas novamente
+        self.send_proc_to_sede(self._get_acoes())
 
     # TODO: Update to bs4 and to use page methods
     # TODO: Replicate logic of send_doc_por_email
@@ -840,6 +1236,7 @@ class Processo(Sei):
 
     # TODO: Update to bs4 and to use page methods
     # TODO: Replicate logic of send_doc_por_email
+    @altera_processo
     def edita_postit(self, content="", prioridade=False):
 
         (main, new) = self.go_to_postit()
@@ -850,8 +1247,6 @@ class Processo(Sei):
 
             postit.clear()
 
-            sleep(1)
-
             if content != "":
                 postit.send_keys(content)
 
@@ -864,20 +1259,21 @@ class Processo(Sei):
                 if not chk_prioridade.is_selected():
                     chk_prioridade.click()
 
-                    sleep(1)
+                    self.page.esperar_selecao(chk_prioridade, True)
 
             else:
 
                 if chk_prioridade.is_selected():
                     chk_prioridade.click()
 
-                    sleep(1)
+                    self.page.esperar_selecao(chk_prioridade, False)
 
             btn = self.page.wait_for_element_to_click(config.Proc_central.BT_POSTIT)
 
             btn.click()
 
-            sleep(1)
+            # A anotação é salva com o recarregamento da janela
+            self.page.esperar_rede_ociosa()
 
             self.page.fechar()
 
@@ -920,6 +1316,7 @@ class Processo(Sei):
 
     # TODO: Update to bs4 and to use page methods
     # TODO: Replicate logic of send_doc_por_email
+    @altera_processo
     def excluir_acomp_especial(self):
 
         (main, new) = self.go_to_acomp_especial()
@@ -930,7 +1327,7 @@ class Processo(Sei):
 
             try:
 
-                self.page._clicar(config.Acompanhamento_Especial.EXCLUIR)
+                self.page._clicar(config.Acompanhamento_Especial.EXCLUIR, alerta=True)
 
             except TimeoutException:
 
@@ -938,7 +1335,7 @@ class Processo(Sei):
 
             try:
 
-                alert = self.page.alert_is_present()
+                alert = self.page._alerta(False)
 
                 if alert:
                     alert.accept()
@@ -953,14 +1350,15 @@ class Processo(Sei):
 
             self.tags["Acompanhamento Especial"] = ""
 
-    def edita_marcador(self, tipo="", content="", timeout=5):
+    @altera_processo
+    def edita_marcador(self, tipo="", content="", timeout=5, recarregar=True):
 
         with self.page._go_new_win():
             self.go_to_marcador()
 
-            self.page._clicar(config.Marcador.SELECT_MARCADOR)
+            self.page._clicar(config.Marcador.SELECT_MARCADOR, alerta=False)
 
-            self.page._clicar((By.LINK_TEXT, tipo))
+            self.page._clicar((By.LINK_TEXT, tipo), alerta=False)
 
             self.page._atualizar_elemento(config.Marcador.TXT_MARCADOR, content)
 
@@ -968,10 +1366,13 @@ class Processo(Sei):
 
             self.page.fechar()
 
-        self.page.driver.get(self.link)
+        # O marcador é salvo na janela própria, o recarregamento só o exibe
+        if recarregar:
+            self.go(self.link)
 
     # TODO: Update to bs4 and to use page methods
     # TODO: Replicate logic of send_doc_por_email
+    @altera_processo
     def incluir_interessados(self, dados, checagem=False, timeout=5):
 
         h = config.Selecionar_Contatos
@@ -980,8 +1381,7 @@ class Processo(Sei):
             dados = [dados]
 
         if checagem:
-            dados = [self.pesquisa_contato(dado) for dado in dados]
-            dados = [d for d in dados if d is not None]
+            dados = [dado for dado in dados if self.contato_existe(dado)]
 
         # with self.page.wait_for_page_load():
         #    Sei.go_to_processo(self, self.numero)
@@ -1000,18 +1400,18 @@ class Processo(Sei):
 
                     self.page._atualizar_elemento(h.INPUT_PESQUISAR, dado + Keys.RETURN)
 
-                    self.page._clicar(h.BTN_PESQUISAR)
+                    self.page._clicar(h.BTN_PESQUISAR, alerta=False)
 
                     try:
-                        self.page._clicar((By.ID, "chkInfraItem0"))
+                        self.page._clicar((By.ID, "chkInfraItem0"), alerta=False)
 
-                        self.page._clicar(h.B_TRSP)
+                        self.page._clicar(h.B_TRSP, alerta=False)
 
                     except TimeoutException:
                         next
 
                 # selfpage.fechar()
-                self.page._clicar(h.BTN_FECHAR)
+                self.page._clicar(h.BTN_FECHAR, alerta=False)
 
         self.page._clicar(h.SALVAR)
 
@@ -1022,6 +1422,7 @@ class Processo(Sei):
     # noinspection PyProtectedMember
     # TODO: Update to bs4 and to use page methods
     # TODO: Replicate logic of send_doc_por_email
+    @altera_processo
     def incluir_documento(self, tipo):
 
         if tipo not in config.Gerar_Doc.TIPOS:
@@ -1032,8 +1433,8 @@ class Processo(Sei):
         if doc_incluir is not None:
 
             with self._go_to_central_frame():
-                self.page._clicar(doc_incluir)
-                self.page._clicar((By.LINK_TEXT, tipo))
+                self.page._clicar(doc_incluir, alerta=False)
+                self.page._clicar((By.LINK_TEXT, tipo), alerta=False)
 
         else:
 
@@ -1041,6 +1442,7 @@ class Processo(Sei):
                 "Problema com o link de ações do processo: 'Incluir Documento'"
             )
 
+    @altera_processo
     def incluir_doc_sei(
         self, tipo: str, txt_inicial: str, acesso="publico", hipotese=None
     ):
@@ -1058,17 +1460,17 @@ class Processo(Sei):
 
         self.incluir_documento("Ofício")
 
-        self.page._clicar(helper.get("id_txt_padrao"))
+        self.page._clicar(helper.get("id_txt_padrao"), alerta=False)
 
-        self.page._selecionar_por_texto(helper.get("id_modelos"), tipo)
+        self.page._selecionar_por_texto(helper.get("id_modelos"), tipo, alerta=False)
 
         if acesso == "publico":
 
-            self.page._clicar(helper.get("id_pub"))
+            self.page._clicar(helper.get("id_pub"), alerta=False)
 
         elif acesso == "restrito":
 
-            self.page._clicar(helper.get("id_restrito"))
+            self.page._clicar(helper.get("id_restrito"), alerta=False)
 
             hip = Select(
                 self.page.wait_for_element_to_click(helper.get("id_hip_legal"))
@@ -1094,8 +1496,9 @@ class Processo(Sei):
 
                 self.page.fechar()
 
-        self.page.driver.get(self.link)
+        self.go(self.link)
 
+    @altera_processo
     def incluir_oficio(
         self, tipo, dados=None, anexo=False, acesso="publico", hipotese=None
     ):
@@ -1109,17 +1512,17 @@ class Processo(Sei):
 
         self.incluir_documento("Ofício")
 
-        self.page._clicar(helper.get("id_txt_padrao"))
+        self.page._clicar(helper.get("id_txt_padrao"), alerta=False)
 
-        self.page._selecionar_por_texto(helper.get("id_modelos"), tipo)
+        self.page._selecionar_por_texto(helper.get("id_modelos"), tipo, alerta=False)
 
         if acesso == "publico":
 
-            self.page._clicar(helper.get("id_pub"))
+            self.page._clicar(helper.get("id_pub"), alerta=False)
 
         elif acesso == "restrito":
 
-            self.page._clicar(helper.get("id_restrito"))
+            self.page._clicar(helper.get("id_restrito"), alerta=False)
 
             hip = Select(
                 self.page.wait_for_element_to_click(helper.get("id_hip_legal"))
@@ -1145,11 +1548,12 @@ class Processo(Sei):
 
                 self.page.fechar()
 
-        self.page.driver.get(self.link)
+        self.go(self.link)
 
     def incluir_informe(self):
         pass
 
+    @altera_processo
     def incluir_doc_externo(
         self,
         tipo,
@@ -1169,7 +1573,7 @@ class Processo(Sei):
 
         self.incluir_documento("Externo", timeout=10)
 
-        self.page._selecionar_por_texto(helper.get("id_tipo"), tipo)
+        self.page._selecionar_por_texto(helper.get("id_tipo"), tipo, alerta=False)
 
         today = dt.datetime.today().strftime("%d%m%Y")
 
@@ -1179,20 +1583,22 @@ class Processo(Sei):
             self.page._atualizar_elemento(helper.get("id_txt_tree"), arvore)
 
         if formato.lower() == "nato":
-            self.page._clicar(helper.get("id_nato"))
+            self.page._clicar(helper.get("id_nato"), alerta=False)
 
         if acesso == "publico":
 
-            self.page._clicar(helper.get("id_pub"))
+            self.page._clicar(helper.get("id_pub"), alerta=False)
 
         elif acesso == "restrito":
 
-            self.page._clicar(helper.get("id_restrito"))
+            self.page._clicar(helper.get("id_restrito"), alerta=False)
 
             if hipotese not in config.Gerar_Doc.HIPOTESES:
                 raise ValueError("Hipótese Legal Inválida: ", hipotese)
 
-            self.page._selecionar_por_texto(helper.get("id_hip_legal"), hipotese)
+            self.page._selecionar_por_texto(
+                helper.get("id_hip_legal"), hipotese, alerta=False
+            )
 
         else:
 
@@ -1207,18 +1613,44 @@ class Processo(Sei):
         self.go(self.link)
 
     # noinspection PyProtectedMember
-    def editar_oficio(self, dados, timeout=5, existing=False):
+    def editar_oficio(self, dados, timeout=5, existing=False, lote=True):
+        """Substitui o parágrafo de cada chave de `dados` pelo html do seu valor e
+        salva o documento
 
+        Args:
+            dados (dict): key=texto presente no parágrafo, value=html do parágrafo
+            lote (bool, optional): Substitui todos os parágrafos numa única chamada
+                através da API do CKEditor e confirma o salvamento pelo estado do
+                editor. Senão cada parágrafo é editado com cliques e teclas.
+                Defaults to True.
+        """
         links = config.Sei_Login.Oficio
 
         self.page.wait_for_element_to_be_visible(links.editor)
 
-        frames = self.page.driver.find_elements_by_tag_name("iframe")
+        if lote:
+            self.page._esperar(
+                "editor_pronto", lambda d: d.execute_script(JS_EDITOR_PRONTO), timeout
+            )
+
+            ausentes = self.page.driver.execute_script(JS_RENDERIZAR_OFICIO, dados)
+
+            if ausentes:
+                raise ValueError(f"Os campos {ausentes} não foram encontrados no ofício")
+
+            # Sem alterações pendentes o estado salvo não confirma a edição
+            if not self.page.driver.execute_script(JS_EDITOR_ALTERADO):
+                raise ValueError("O conteúdo do ofício não foi alterado no editor")
+
+            self.page._clicar(links.submit, alerta=False)
+
+            self.page._esperar(
+                "oficio_salvo", lambda d: d.execute_script(JS_EDITOR_SALVO), timeout
+            )
 
-        while len(frames) < 3:
-            sleep(1)
+            return
 
-            frames = self.page.driver.find_elements_by_tag_name("iframe")
+        frames = self.page.esperar_iframes(3)
 
         self.page.driver.switch_to.frame(frames[2])  # text frame
 
@@ -1236,7 +1668,7 @@ class Processo(Sei):
 
             action.perform()
 
-            sleep(1)
+            self.page.esperar_dom_estavel()
 
             action.key_down(Keys.RETURN)
 
@@ -1250,7 +1682,7 @@ class Processo(Sei):
 
             self.page.driver.execute_script(script, element)
 
-            sleep(2)
+            self.page.esperar_dom_estavel()
 
         self.page.driver.switch_to.parent_frame()
 
@@ -1294,11 +1726,14 @@ class Processo(Sei):
     #         self.page.driver.switch_to_default_content()
 
 
-def armazena_bloco(sei, numero):
-    if sei.get_title() != config.Bloco.TITLE + " " + str(numero):
+def armazena_bloco(sei, numero, js=False):
+    if sei.page.get_title() != config.Bloco.TITLE + " " + str(numero):
         sei.exibir_bloco(numero)
 
-    html_bloco = soup(sei.driver.page_source, "lxml")
+    if js:
+        return linhas_para_bloco(sei.page.driver.execute_script(JS_BLOCO))
+
+    html_bloco = soup(sei.page.driver.page_source, "lxml")
     linhas = html_bloco.find_all("tr", class_=["infraTrClara", "infraTrEscura"])
 
     chaves = [
@@ -1333,20 +1768,142 @@ def armazena_bloco(sei, numero):
     return lista_processos
 
 
-def expedir_bloco(sei, numero):
-    processos = sei.armazena_bloco(numero)
+def _carrega_checkpoint(checkpoint: Path, numero) -> Tuple[set, Dict[str, str]]:
+    if checkpoint is None or not checkpoint.exists():
+        return set(), {}
+
+    estado = json.loads(checkpoint.read_text(encoding="utf-8"))
+
+    if estado.get("bloco") != str(numero):
+        return set(), {}
+
+    return set(estado["expedidos"]), dict(estado.get("falhas", {}))
+
+
+def _salva_checkpoint(
+    checkpoint: Path, numero, expedidos: set, falhas: Dict[str, str]
+) -> None:
+    if checkpoint is None:
+        return
+
+    temporario = checkpoint.with_suffix(checkpoint.suffix + ".tmp")
+
+    temporario.write_text(
+        json.dumps(
+            {"bloco": str(numero), "expedidos": sorted(expedidos), "falhas": falhas},
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+
+    # A substituição é atômica, uma interrupção não corrompe o checkpoint
+    os.replace(str(temporario), str(checkpoint))
+
+
+def _expedir_linha(page: Page, linha: dict) -> str:
+    Sei(page).go(linha["processo_link"])
+
+    Processo(page, linha["processo"]).expedir_oficio(linha["documento"])
+
+    return linha["documento"]
+
+
+def expedir_bloco(
+    sei, numero, pool=None, checkpoint=None, concluir_parcial: bool = False
+) -> Dict[str, Any]:
+    """Expede os ofícios assinados do Bloco de Assinatura `numero` e conclui o
+    bloco somente quando todos os seus documentos foram expedidos
+
+    Os documentos expedidos e as falhas são registrados em `checkpoint` após cada
+    expedição, de modo que uma nova execução continua do ponto em que a anterior
+    parou e tenta novamente os documentos que falharam. A falha de um documento
+    não interrompe a expedição dos demais.
+
+    Args:
+        sei (Sei): Instância autenticada do SEI
+        numero (str, int): Número do Bloco de Assinatura
+        pool (DriverPool, optional): Pool de browsers autenticados no SEI, cada
+            ofício é expedido num browser livre do pool. Senão a expedição é feita
+            sequencialmente em `sei`. Defaults to None.
+        checkpoint (str, Path, optional): Arquivo JSON de progresso. Defaults to None.
+        concluir_parcial (bool, optional): Conclui o bloco quando todos os
+            documentos expedíveis foram expedidos, mesmo que restem documentos não
+            assinados ou que não sejam ofícios. Defaults to False.
+
+    Returns:
+        dict: expedidos (lista de documentos), falhas (key=documento, value=erro)
+            e concluido (bool)
+
+    Usage
+    -----
+    >>> with DriverPool(4, inicializar=lambda page: login_sei(usr, pwd, driver=page.driver)) as pool:
+    ...     expedir_bloco(sei, 1234, pool=pool, checkpoint="bloco_1234.json")  # doctest: +SKIP
+    """
+    checkpoint = Path(checkpoint) if checkpoint is not None else None
+
+    linhas = armazena_bloco(sei, numero, js=True)
+
+    expedidos, falhas = _carrega_checkpoint(checkpoint, numero)
+
+    # Um processo já enviado à sede deixa de estar aberto na unidade, o documento
+    # expedido numa execução anterior continua sendo contado
+    expediveis = [
+        linha
+        for linha in linhas
+        if linha["documento"] in expedidos or pode_expedir(linha)
+    ]
+
+    pendentes = [linha for linha in expediveis if linha["documento"] not in expedidos]
+
+    def registra(documento, erro=None):
+        if erro is None:
+            expedidos.add(documento)
+            falhas.pop(documento, None)
+        else:
+            falhas[documento] = erro
+
+        _salva_checkpoint(checkpoint, numero, expedidos, falhas)
+
+    if pool is None:
+        for linha in pendentes:
+            try:
+                registra(_expedir_linha(sei.page, linha))
+            except Exception as e:
+                registra(linha["documento"], repr(e))
+
+    else:
+
+        def tarefa(linha):
+            with pool.page() as page:
+                return _expedir_linha(page, linha)
+
+        with ThreadPoolExecutor(max_workers=len(pool)) as executor:
+            futuros = {executor.submit(tarefa, linha): linha for linha in pendentes}
+
+            for futuro in as_completed(futuros):
+                try:
+                    registra(futuro.result())
+                except Exception as e:
+                    registra(futuros[futuro]["documento"], repr(e))
 
-    for p in processos:
+    confirmar = expediveis if concluir_parcial else linhas
 
-        if pode_expedir(p):
-            proc = p["processo"].a.string
+    concluido = bool(confirmar) and all(
+        linha["documento"] in expedidos for linha in confirmar
+    )
 
-            num_doc = p["documento"].a.string
+    if concluido:
+        sei.go_to_blocos()
 
-            link = sei.go(p["processo"].a.attrs["href"])
+        sei.page.driver.execute_script(config.Blocos.ACAO_CONCLUIR.format(numero))
 
-            (bloco_window, proc_window) = Page.nav_link_to_new_win(sei.driver, link)
+        alert = sei.page._alerta(True)
 
-            processo = Processo(sei.driver, proc_window)
+        if alert:
+            alert.accept()
 
-            processo.expedir_oficio(num_doc)
+    return {
+        "expedidos": sorted(expedidos),
+        "falhas": falhas,
+        "concluido": concluido,
+    }
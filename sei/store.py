@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Armazenamento local dos processos abertos do SEI num banco SQLite.
+
+A cada sincronização somente a diferença entre os processos extraídos por
+`Sei.itera_processos` e os armazenados é gravada em disco.
+"""
+# Standard Lib Imports
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+# Local application imports
+from .common import valor_serializavel
+
+# Campos cuja mudança é reportada. Os links contêm o hash da sessão e o checkbox
+# depende da posição do processo na página, por isso são somente armazenados
+CAMPOS_COMPARADOS = (
+    "anotacao",
+    "situacao",
+    "marcador",
+    "aviso",
+    "peticionamento",
+    "visualizado",
+    "atribuicao",
+    "tipo",
+    "interessado",
+)
+
+# adicionados e removidos: lista de números, alterados: {número: {campo: (antigo, novo)}}
+Delta = namedtuple("Delta", "adicionados removidos alterados")
+
+
+def _normaliza(processo: Dict) -> Dict:
+    return {k: valor_serializavel(v) for k, v in processo.items()}
+
+
+class ProcessoStore:
+    """Banco SQLite dos processos, tendo o número do processo como chave
+
+    Args:
+        arquivo (str, Path): Caminho do banco, ":memory:" para um banco temporário
+
+    Usage
+    -----
+    >>> with ProcessoStore("processos.db") as store:    # doctest: +SKIP
+    ...     delta = sei.sincronizar_processos(store)
+    ...     delta.alterados
+    """
+
+    def __init__(self, arquivo: Union[str, Path]) -> None:
+        self.conn = sqlite3.connect(str(arquivo))
+
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS processos "
+                "(numero TEXT PRIMARY KEY, dados TEXT NOT NULL)"
+            )
+
+    def __enter__(self) -> "ProcessoStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM processos").fetchone()[0]
+
+    def processos(self) -> "OrderedDict[str, Dict]":
+        """Retorna os processos armazenados, ordenados pelo número"""
+        return OrderedDict(
+            (numero, json.loads(dados))
+            for numero, dados in self.conn.execute(
+                "SELECT numero, dados FROM processos ORDER BY numero"
+            )
+        )
+
+    def sync(self, processos: Iterable[Dict]) -> Delta:
+        """Compara `processos` com os armazenados e grava somente a diferença
+
+        Args:
+            processos (Iterable): Dicionários de `armazena_tags` ou
+                `linhas_para_processos` de todos os processos abertos
+
+        Returns:
+            Delta: Processos adicionados, removidos e alterados
+        """
+        novos = OrderedDict((p["numero"], _normaliza(p)) for p in processos)
+
+        antigos = self.processos()
+
+        adicionados = [n for n in novos if n not in antigos]
+
+        removidos = [n for n in antigos if n not in novos]
+
+        alterados = {}
+
+        for numero in novos.keys() & antigos.keys():
+            antigo, novo = antigos[numero], novos[numero]
+
+            mudanças = {
+                campo: (antigo.get(campo), novo.get(campo))
+                for campo in CAMPOS_COMPARADOS
+                if antigo.get(campo) != novo.get(campo)
+            }
+
+            if mudanças:
+                alterados[numero] = mudanças
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO processos (numero, dados) VALUES (?, ?)",
+                (
+                    (n, json.dumps(novos[n], ensure_ascii=False))
+                    for n in adicionados + sorted(alterados)
+                ),
+            )
+            self.conn.executemany(
+                "DELETE FROM processos WHERE numero = ?", ((n,) for n in removidos)
+            )
+
+        return Delta(adicionados, removidos, alterados)
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o banco"""
+        self.conn.close()
+
+
+def chave_sessao(cookies: List[Dict]) -> str:
+    """Identifica a sessão do SEI pelos seus cookies de sessão, ou por todos os
+    cookies caso não haja um. Somente o hash é retornado, os cookies dão acesso
+    à sessão e não devem ser gravados em disco.
+
+    Args:
+        cookies (list): Cookies do webdriver, e.g. `driver.get_cookies()`
+    """
+    valores = sorted(f"{c['name']}={c['value']}" for c in cookies)
+
+    sessao = [v for v in valores if "SESS" in v.split("=", 1)[0].upper()]
+
+    return hashlib.sha256("; ".join(sessao or valores).encode()).hexdigest()
+
+
+class CacheLinks:
+    """Mapa persistente do número do processo para o link direto da sua página
+    (procedimento_trabalhar), dispensando a Pesquisa Rápida
+
+    Os links contêm o infra_hash calculado pelo SEI para a sessão em que foram
+    gerados, por isso são armazenados por sessão e somente os da `sessao` atual
+    são retornados. Ao mudar de sessão, e.g. após um novo login, os links das
+    demais são descartados. Ainda assim quem os usa deve verificar se a página do
+    processo foi de fato aberta.
+
+    Args:
+        arquivo (str, Path): Caminho do banco, ":memory:" para um banco temporário
+        sessao (str, optional): Identificador da sessão, e.g. `chave_sessao`.
+            Defaults to "".
+    """
+
+    def __init__(self, arquivo: Union[str, Path], sessao: str = "") -> None:
+        self.conn = sqlite3.connect(str(arquivo))
+
+        with self.conn:
+            colunas = [
+                linha[1] for linha in self.conn.execute("PRAGMA table_info(links)")
+            ]
+
+            # Os links gravados sem a sessão não podem mais ser validados
+            if colunas and "sessao" not in colunas:
+                self.conn.execute("DROP TABLE links")
+
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS links (sessao TEXT NOT NULL, "
+                "numero TEXT NOT NULL, link TEXT NOT NULL, "
+                "PRIMARY KEY (sessao, numero))"
+            )
+
+        self.mudar_sessao(sessao)
+
+    def __enter__(self) -> "CacheLinks":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def __len__(self) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM links WHERE sessao = ?", (self.sessao,)
+        ).fetchone()[0]
+
+    def mudar_sessao(self, sessao: str) -> None:
+        """Passa a usar os links de `sessao`, descartando os das demais sessões"""
+        self.sessao = sessao
+
+        with self.conn:
+            self.conn.execute("DELETE FROM links WHERE sessao != ?", (sessao,))
+
+    def get(self, numero: str) -> Optional[str]:
+        """Retorna o link do processo `numero` na sessão atual ou None"""
+        linha = self.conn.execute(
+            "SELECT link FROM links WHERE sessao = ? AND numero = ?",
+            (self.sessao, numero),
+        ).fetchone()
+        return linha[0] if linha else None
+
+    def atualizar(self, links: Dict[str, str]) -> None:
+        """Grava os links da sessão atual, key=número do processo, value=link"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO links (sessao, numero, link) VALUES (?, ?, ?)",
+                ((self.sessao, str(n), str(l)) for n, l in links.items() if l),
+            )
+
+    def remover(self, numero: str) -> None:
+        """Descarta o link do processo `numero`"""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM links WHERE sessao = ? AND numero = ?",
+                (self.sessao, numero),
+            )
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o banco"""
+        self.conn.close()
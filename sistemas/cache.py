@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Cache local, num banco SQLite, dos cadastros extraídos do sistemasnet.
+
+Cada resultado é guardado pela chave (sistema, tipo_id, identificador sem
+pontuação) e expira após o TTL do sistema. Acima de `maximo` entradas as
+consultadas há mais tempo são descartadas.
+"""
+# Standard Lib Imports
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+# TTL padrão em segundos de cada sistema, key=nome da classe
+TTL = {
+    "Scpx": 3600,
+    "Scra": 3600,
+    "Slmm": 3600,
+    "Slma": 3600,
+    "Sigec": 600,
+    "Sec": 86400,
+}
+
+TTL_PADRAO = 3600
+
+
+def normaliza_identificador(identificador: str) -> str:
+    """Remove a pontuação e os espaços e converte para maiúsculas"""
+    return "".join(c for c in str(identificador) if c.isalnum()).upper()
+
+
+class CacheConsultas:
+    """Cache com TTL por sistema e descarte dos menos usados (LRU)
+
+    A conexão é compartilhada entre threads, e.g. pelos workers de
+    `extrai_cadastro_lote`, e protegida por um lock.
+
+    Args:
+        arquivo (str, Path, optional): Caminho do banco, ":memory:" para um banco
+            temporário. Defaults to ":memory:".
+        ttl (dict, optional): TTL em segundos por sistema, sobrepõe TTL.
+            Defaults to None.
+        maximo (int, optional): Nº máximo de entradas. Defaults to 10000.
+        relogio (Callable, optional): Função que retorna o horário atual em
+            segundos. Defaults to time.time.
+
+    Usage
+    -----
+    >>> scpx = Scpx(driver)                                # doctest: +SKIP
+    >>> scpx.usar_cache(CacheConsultas("consultas.db", ttl={"Scpx": 600}))
+    >>> scpx.extrai_cadastro(cpf)   # sistemasnet
+    >>> scpx.extrai_cadastro(cpf)   # cache
+    """
+
+    def __init__(
+        self,
+        arquivo: Union[str, Path] = ":memory:",
+        ttl: Dict[str, float] = None,
+        maximo: int = 10000,
+        relogio: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = dict(TTL, **(ttl or {}))
+        self.maximo = maximo
+        self.relogio = relogio
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(arquivo), check_same_thread=False)
+
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS consultas "
+                "(sistema TEXT NOT NULL, tipo_id TEXT NOT NULL, "
+                "identificador TEXT NOT NULL, dados TEXT NOT NULL, "
+                "gravado REAL NOT NULL, acesso REAL NOT NULL, "
+                "PRIMARY KEY (sistema, tipo_id, identificador))"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS consultas_acesso ON consultas (acesso)"
+            )
+
+    def __enter__(self) -> "CacheConsultas":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM consultas").fetchone()[0]
+
+    def get(self, sistema: str, tipo_id: str, identificador: str) -> Optional[Any]:
+        """Retorna o resultado armazenado e não expirado ou None"""
+        chave = (sistema, tipo_id, normaliza_identificador(identificador))
+
+        agora = self.relogio()
+
+        with self._lock, self.conn:
+            linha = self.conn.execute(
+                "SELECT dados, gravado FROM consultas "
+                "WHERE sistema = ? AND tipo_id = ? AND identificador = ?",
+                chave,
+            ).fetchone()
+
+            if linha is None:
+                return None
+
+            dados, gravado = linha
+
+            if agora - gravado > self.ttl.get(sistema, TTL_PADRAO):
+                self.conn.execute(
+                    "DELETE FROM consultas "
+                    "WHERE sistema = ? AND tipo_id = ? AND identificador = ?",
+                    chave,
+                )
+                return None
+
+            self.conn.execute(
+                "UPDATE consultas SET acesso = ? "
+                "WHERE sistema = ? AND tipo_id = ? AND identificador = ?",
+                (agora,) + chave,
+            )
+
+        return json.loads(dados)
+
+    def gravar(
+        self, sistema: str, tipo_id: str, identificador: str, dados: Any
+    ) -> None:
+        """Armazena `dados`, descartando as entradas menos usadas acima de `maximo`"""
+        agora = self.relogio()
+
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO consultas VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    sistema,
+                    tipo_id,
+                    normaliza_identificador(identificador),
+                    json.dumps(dados, ensure_ascii=False),
+                    agora,
+                    agora,
+                ),
+            )
+            self.conn.execute(
+                "DELETE FROM consultas WHERE rowid IN (SELECT rowid FROM consultas "
+                "ORDER BY acesso DESC LIMIT -1 OFFSET ?)",
+                (self.maximo,),
+            )
+
+    def invalidar(self, identificador: str, sistema: str = None) -> None:
+        """Descarta as entradas do identificador, de todos os sistemas caso
+        `sistema` seja None, pois uma alteração num sistema pode se refletir nos
+        demais, e.g. o nome no cadastro do Sec
+        """
+        identificador = normaliza_identificador(identificador)
+
+        with self._lock, self.conn:
+            if sistema is None:
+                self.conn.execute(
+                    "DELETE FROM consultas WHERE identificador = ?", (identificador,)
+                )
+            else:
+                self.conn.execute(
+                    "DELETE FROM consultas WHERE sistema = ? AND identificador = ?",
+                    (sistema, identificador),
+                )
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o banco"""
+        self.conn.close()
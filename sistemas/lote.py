@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Extração em lote dos cadastros do sistemasnet distribuída num pool de browsers
+autenticados.
+
+Os resultados são gravados à medida que chegam e os identificadores que falham
+são novamente tentados ao final de cada rodada.
+"""
+# Standard Lib Imports
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+# Third-Parties imports
+import requests
+from selenium.common.exceptions import WebDriverException
+
+# Local application imports
+from ..tools.pool import DriverPool
+from .cache import CacheConsultas
+from .sistemas import Scpx, Scra, Sec, Sigec, Sistema, Slma, Slmm
+
+# Falhas de um identificador, que é tentado novamente na próxima rodada. O modo
+# HTTP levanta RequestException e os parsers ValueError
+FALHAS_RECUPERAVEIS = (
+    AssertionError,
+    LookupError,
+    ValueError,
+    WebDriverException,
+    requests.RequestException,
+)
+
+SISTEMAS = {
+    "scpx": Scpx,
+    "scra": Scra,
+    "slmm": Slmm,
+    "slma": Slma,
+    "sigec": Sigec,
+    "sec": Sec,
+}
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil `p` (0-100) de `valores` pelo método do posto mais próximo"""
+    if not valores:
+        return 0.0
+
+    ordenados = sorted(valores)
+
+    return ordenados[
+        min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    ]
+
+
+class _Saida:
+    """Grava os cadastros em CSV (id, campo, valor) ou JSON Lines ({id, dados})"""
+
+    def __init__(self, arquivo: Union[str, Path, None]) -> None:
+        self.arquivo = Path(arquivo) if arquivo is not None else None
+        self._f = None
+        self._csv = None
+
+        if self.arquivo is None:
+            return
+
+        self._f = self.arquivo.open("w", newline="", encoding="utf-8")
+
+        if self.arquivo.suffix.lower() == ".csv":
+            self._csv = csv.writer(self._f)
+            self._csv.writerow(("id", "campo", "valor"))
+
+    def gravar(self, identificador: str, dados: Dict[str, Any]) -> None:
+        if self._f is None:
+            return
+
+        if self._csv is not None:
+            self._csv.writerows((identificador, k, v) for k, v in dados.items())
+        else:
+            self._f.write(
+                json.dumps({"id": identificador, "dados": dados}, ensure_ascii=False)
+                + "\n"
+            )
+
+        self._f.flush()
+
+    def fechar(self) -> None:
+        if self._f is not None:
+            self._f.close()
+
+
+def extrai_cadastro_lote(
+    ids: Iterable[str],
+    sistema: Union[str, type],
+    workers: int = None,
+    login: str = None,
+    senha: str = None,
+    saida: Union[str, Path] = None,
+    tentativas: int = 2,
+    pool: DriverPool = None,
+    cache: CacheConsultas = None,
+    auth: Tuple[str, str] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Executa `extrai_cadastro` de `sistema` para cada identificador em paralelo
+
+    Args:
+        ids (Iterable): cpfs, cnpjs, fistels ou indicativos
+        sistema (str, type): Nome em SISTEMAS ou a classe do sistema
+        workers (int, optional): Nº de browsers do pool criado. Defaults to os.cpu_count().
+        login (str, optional): Usuário usado na autenticação de cada browser do
+            pool criado. Defaults to None.
+        senha (str, optional): Senha do usuário. Defaults to None.
+        saida (str, Path, optional): Arquivo .csv ou .jsonl onde os cadastros são
+            gravados à medida que são extraídos. Defaults to None.
+        tentativas (int, optional): Nº de rodadas adicionais para os identificadores
+            que falharam. Defaults to 2.
+        pool (DriverPool, optional): Pool já autenticado, `workers` é ignorado e
+            os browsers não são autenticados com `login` e `senha`. Defaults to None.
+        cache (CacheConsultas, optional): Cache compartilhado pelos workers, os
+            identificadores já armazenados não são consultados. Defaults to None.
+        auth (tuple, optional): (login, senha) usados pelo modo HTTP, necessários
+            com `pool` e `http=True`. Defaults to (login, senha) caso `login` seja
+            fornecido.
+        **kwargs: Opções repassadas a `extrai_cadastro`, e.g. tipo_id, http, js
+
+    Returns:
+        dict: sistema, total, sucesso, falhas (key=id, value=erro), duracao (s),
+            por_segundo, p50 e p95 (latência de cada extração em segundos)
+
+    Usage
+    -----
+    >>> extrai_cadastro_lote(cpfs, "scpx", workers=8, login=usr, senha=pwd,
+    ...                      saida="scpx.jsonl", http=True)  # doctest: +SKIP
+    """
+    classe = SISTEMAS[sistema.lower()] if isinstance(sistema, str) else sistema
+
+    if auth is None and login is not None:
+        auth = (login, senha)
+
+    proprio = pool is None
+
+    if proprio:
+        # Sem login o browser usa a autenticação já existente, e.g. a integrada
+        # do Windows ou a sessão restaurada do perfil
+        pool = DriverPool(
+            workers,
+            inicializar=(
+                (lambda page: Sistema(page.driver).authenticate(login, senha))
+                if login is not None
+                else None
+            ),
+        )
+
+    # Cada browser mantém a sua instância do sistema, e.g. a sessão HTTP
+    instancias: Dict[int, Sistema] = {}
+
+    def tarefa(identificador):
+        with pool.page() as page:
+            instancia = instancias.get(id(page))
+
+            if instancia is None or instancia.page.driver is not page.driver:
+                instancia = instancias[id(page)] = classe(page.driver)
+                # O browser já está autenticado, mas o modo HTTP usa as credenciais
+                instancia._auth = auth
+                instancia.cache = cache
+
+            inicio = perf_counter()
+            dados = instancia.extrai_cadastro(identificador, **kwargs)
+            return dados, perf_counter() - inicio
+
+    pendentes = list(dict.fromkeys(ids))
+
+    total = len(pendentes)
+
+    latencias: List[float] = []
+
+    falhas: Dict[str, str] = {}
+
+    escrita = _Saida(saida)
+
+    inicio = perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(pool)) as executor:
+            for _ in range(tentativas + 1):
+                if not pendentes:
+                    break
+
+                futuros = {executor.submit(tarefa, i): i for i in pendentes}
+
+                pendentes = []
+
+                for futuro in as_completed(futuros):
+                    identificador = futuros[futuro]
+
+                    try:
+                        dados, latencia = futuro.result()
+                    except FALHAS_RECUPERAVEIS as e:
+                        falhas[identificador] = repr(e)
+                        pendentes.append(identificador)
+                        continue
+
+                    falhas.pop(identificador, None)
+                    latencias.append(latencia)
+                    escrita.gravar(identificador, dados)
+
+    finally:
+        escrita.fechar()
+
+        if proprio:
+            pool.fechar()
+
+    duracao = perf_counter() - inicio
+
+    return {
+        "sistema": classe.__name__,
+        "total": total,
+        "sucesso": len(latencias),
+        "falhas": falhas,
+        "duracao": duracao,
+        "por_segundo": len(latencias) / duracao if duracao else 0.0,
+        "p50": percentil(latencias, 50),
+        "p95": percentil(latencias, 95),
+    }
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Perfil de um identificador em todos os sistemas do sistemasnet.
+
+Os sistemas são consultados ao mesmo tempo, cada um num browser do pool, de modo
+que a latência é a do sistema mais lento e não a soma de todos. Os sistemas que
+não respondem até o prazo são reportados e o perfil é retornado parcialmente.
+
+Os campos comuns (nome, documento e endereço) são unificados tomando o valor do
+primeiro sistema de PRECEDENCIA que o informa.
+"""
+# Standard Lib Imports
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import perf_counter
+from typing import Dict, Iterable, Optional, Tuple
+
+# Local application imports
+from ..tools.pool import DriverPool
+from .cache import CacheConsultas
+from .lote import SISTEMAS
+
+# Ordem de preferência dos sistemas na unificação dos campos comuns, o Sec é o
+# cadastro de referência da entidade
+PRECEDENCIA = ("sec", "scpx", "scra", "slmm", "slma", "sigec")
+
+# Rótulos de cada campo comum nos cadastros, em ordem de preferência
+ROTULOS = {
+    "nome": ("Nome/Razão Social", "Nome", "Razão Social"),
+    "documento": ("CNPJ/CPF", "CPF/CNPJ", "CPF", "CNPJ"),
+    "endereco": ("Endereço", "Endereço Sede", "Endereço Correspondência"),
+}
+
+# Seções do cadastro do Sec e campos que compõem o endereço
+SEC_USUARIO = "Dados do Usuário"
+SEC_ENDERECOS = ("Endereço Sede", "Endereço Correspondência")
+CAMPOS_ENDERECO = (
+    "Logradouro",
+    "Número",
+    "Complemento",
+    "Bairro",
+    "Município",
+    "UF",
+    "Cep",
+)
+
+Perfil = namedtuple(
+    "Perfil",
+    "identificador nome documento endereco scpx scra slmm slma sigec sec "
+    "falhas expirados duracao",
+    defaults=(
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        (),
+        0.0,
+    ),
+)
+Perfil.__doc__ = """Cadastros de um identificador nos sistemas do sistemasnet
+
+    identificador (str): cpf, cnpj, fistel ou indicativo consultado
+    nome, documento, endereco (str): Campos comuns unificados conforme PRECEDENCIA,
+        None caso nenhum sistema os informe
+    scpx, scra, slmm, slma, sigec, sec (dict): Cadastro extraído de cada sistema,
+        None caso não tenha sido consultado, tenha falhado ou expirado
+    falhas (dict): key=sistema, value=erro
+    expirados (tuple): Sistemas que não responderam até o prazo
+    duracao (float): Tempo total em segundos
+"""
+
+
+def _planifica(sistema: str, cadastro: Dict) -> Dict[str, str]:
+    """Retorna os rótulos e valores do cadastro num único nível. No Sec os dados
+    do usuário são extraídos da sua seção e o endereço é composto pelos campos da
+    primeira seção de endereço preenchida
+    """
+    if sistema != "sec":
+        return cadastro
+
+    planificado = dict(cadastro.get(SEC_USUARIO) or {})
+
+    for secao in SEC_ENDERECOS:
+        endereco = cadastro.get(secao) or {}
+        partes = [str(endereco[c]) for c in CAMPOS_ENDERECO if endereco.get(c)]
+
+        if partes:
+            planificado["Endereço"] = ", ".join(partes)
+            break
+
+    return planificado
+
+
+def unifica_campos(cadastros: Dict[str, Dict]) -> Dict[str, Optional[str]]:
+    """Unifica os campos comuns dos cadastros, key=sistema, conforme PRECEDENCIA
+
+    Returns:
+        dict: key=campo de ROTULOS, value=valor do primeiro sistema que o informa
+    """
+    planificados = [
+        _planifica(sistema, cadastros[sistema])
+        for sistema in PRECEDENCIA
+        if cadastros.get(sistema)
+    ]
+
+    campos: Dict[str, Optional[str]] = {}
+
+    for campo, rotulos in ROTULOS.items():
+        campos[campo] = next(
+            (
+                str(cadastro[rotulo]).strip()
+                for cadastro in planificados
+                for rotulo in rotulos
+                if cadastro.get(rotulo) and str(cadastro[rotulo]).strip()
+            ),
+            None,
+        )
+
+    return campos
+
+
+def perfil_completo(
+    identificador: str,
+    pool: DriverPool,
+    tipo_id: str = "id_cpf",
+    prazo: float = 30.0,
+    sistemas: Iterable[str] = tuple(SISTEMAS),
+    http: bool = False,
+    cache: CacheConsultas = None,
+    auth: Tuple[str, str] = None,
+) -> Perfil:
+    """Extrai o cadastro de `identificador` em todos os `sistemas` simultaneamente
+
+    Os browsers dos sistemas expirados só retornam ao pool quando a extração
+    termina, por isso o pool não deve ser fechado logo em seguida.
+
+    Args:
+        identificador (str): cpf, cnpj, fistel ou indicativo
+        pool (DriverPool): Pool de browsers autenticados no sistemasnet, de
+            preferência com um browser por sistema
+        tipo_id (str, optional): Defaults to "id_cpf".
+        prazo (float, optional): Tempo máximo de espera em segundos. Defaults to 30.
+        sistemas (Iterable, optional): Nomes em SISTEMAS. Defaults to todos.
+        http (bool, optional): Extrai via `consulta_http`. Defaults to False.
+        cache (CacheConsultas, optional): Cache dos cadastros. Defaults to None.
+        auth (tuple, optional): (login, senha) usados pelo modo HTTP. Defaults to None.
+
+    Returns:
+        Perfil: Cadastros dos sistemas que responderam até o prazo
+
+    Usage
+    -----
+    >>> with DriverPool(6, inicializar=autenticar) as pool:     # doctest: +SKIP
+    ...     perfil = perfil_completo(cpf, pool, prazo=20)
+    ...     perfil.scpx, perfil.expirados
+    """
+    inicio = perf_counter()
+
+    def tarefa(nome):
+        with pool.page() as page:
+            instancia = SISTEMAS[nome](page.driver)
+            instancia._auth = auth
+            instancia.cache = cache
+            return instancia.extrai_cadastro(identificador, tipo_id, http=http)
+
+    executor = ThreadPoolExecutor(max_workers=len(pool))
+
+    futuros = {executor.submit(tarefa, nome.lower()): nome.lower() for nome in sistemas}
+
+    concluidos, pendentes = wait(futuros, timeout=prazo)
+
+    # Não espera pelos sistemas expirados, cujas extrações não podem ser interrompidas
+    executor.shutdown(wait=False)
+
+    cadastros: Dict[str, Dict] = {}
+
+    falhas: Dict[str, str] = {}
+
+    for futuro in concluidos:
+        nome = futuros[futuro]
+
+        try:
+            cadastros[nome] = futuro.result()
+        except Exception as e:
+            falhas[nome] = repr(e)
+
+    for futuro in pendentes:
+        futuro.cancel()
+
+    return Perfil(
+        identificador=identificador,
+        falhas=falhas,
+        **unifica_campos(cadastros),
+        expirados=tuple(sorted(futuros[f] for f in pendentes)),
+        duracao=perf_counter() - inicio,
+        **cadastros,
+    )
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Interpretação da página de consulta do cadastro do Sec.
+
+Na página cada seção é um <label> com o nome da seção seguido dos <label> com os
+valores dos seus campos, na ordem de `sis_helpers.DADOS`. O html é percorrido
+uma única vez e cada valor é associado ao campo da seção corrente à medida que é
+encontrado, de modo que o custo é linear e um valor igual ao nome de uma seção
+ou repetido não desloca os demais.
+
+Somente os elementos <label> e <input> interessam, por isso a página é varrida
+por expressões regulares compiladas em vez de montar a árvore do documento, o que
+custaria várias vezes o tempo da varredura.
+"""
+# Standard Lib Imports
+import re
+from collections import OrderedDict, namedtuple
+from html import unescape
+from typing import Dict, List, Optional, Union
+
+# Local application imports
+from .sis_helpers import DADOS
+
+# <label> da página que não são valores de campo, pelo id e pelo texto
+IDS_IGNORADOS = {
+    "ImgObrigatorioIndCertificadoEstrangeiro",
+    "msgIndCertificadoEstrangeiro",
+}
+TEXTOS_IGNORADOS = {"Categoria"}
+
+# Opções Sim e Não de Certificado Estrangeiro, somente o <label> da opção marcada,
+# ou de Não caso nenhuma esteja, é um valor
+ESTRANGEIRO = ("IndCertificadoEstrangeiro0", "IndCertificadoEstrangeiro1")
+
+# Os atributos só são interpretados nas tags que contêm este trecho
+_MARCA_ATRIBUTOS = "IndCertificadoEstrangeiro"
+
+# Comentários e scripts são consumidos para que o seu conteúdo não seja varrido.
+# Grupos: input, atributos do input, label, atributos do label, conteúdo do label
+RE_ELEMENTO = re.compile(
+    r"<(?:(input)\b([^>]*)>"
+    r"|(label)\b([^>]*)>([^<]*(?:<(?!/label)[^<]*)*)</label\s*>"
+    r"|!--.*?-->|script\b.*?</script\s*>)",
+    re.DOTALL | re.IGNORECASE,
+)
+RE_ATRIBUTO = re.compile(
+    r"""([\w:-]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?"""
+)
+RE_TAG = re.compile(r"<[^>]*>")
+
+CadastroSec = namedtuple(
+    "CadastroSec", "usuario telefones correspondencia sede certificado"
+)
+CadastroSec.__doc__ = """Cadastro do Sec, um OrderedDict campo -> valor por seção
+
+    usuario: Dados do Usuário
+    telefones: Dados de Telefones
+    correspondencia: Endereço Correspondência
+    sede: Endereço Sede
+    certificado: Certificado
+"""
+
+# Nome da seção na página -> posição em CadastroSec
+SECOES = {secao: i for i, secao in enumerate(DADOS)}
+
+
+def _atributos(trecho: str) -> Dict[str, str]:
+    return {
+        nome.lower(): aspas or apostrofos or livre
+        for nome, aspas, apostrofos, livre in RE_ATRIBUTO.findall(trecho)
+    }
+
+
+def interpreta_cadastro(pagina: Union[str, bytes]) -> Optional[CadastroSec]:
+    """Extrai o cadastro da página de consulta do Sec
+
+    Args:
+        pagina (str, bytes): html da página, bytes em utf-8
+
+    Returns:
+        CadastroSec: Campos de cada seção, None caso a página não tenha nenhuma
+            seção, e.g. "Não foi encontrado nenhum registro..."
+    """
+    if isinstance(pagina, bytes):
+        pagina = pagina.decode("utf-8", errors="replace")
+
+    secoes: List[Dict[str, str]] = [OrderedDict() for _ in SECOES]
+
+    # (texto, for) de cada <label>, a opção marcada pode vir depois do seu <label>
+    labels = []
+    marcada = ESTRANGEIRO[1]
+
+    for entrada, atr_entrada, label, atr_label, texto in RE_ELEMENTO.findall(pagina):
+        if entrada:
+            if _MARCA_ATRIBUTOS in atr_entrada:
+                atributos = _atributos(atr_entrada)
+
+                if atributos.get("id") == ESTRANGEIRO[0] and "checked" in atributos:
+                    marcada = ESTRANGEIRO[0]
+            continue
+
+        if not label:
+            continue
+
+        alvo = None
+
+        if _MARCA_ATRIBUTOS in atr_label:
+            atributos = _atributos(atr_label)
+
+            if atributos.get("id") in IDS_IGNORADOS:
+                continue
+
+            alvo = atributos.get("for")
+
+        if "<" in texto:
+            texto = RE_TAG.sub("", texto)
+
+        if "&" in texto:
+            texto = unescape(texto)
+
+        labels.append((texto.strip().strip(":"), alvo))
+
+    atual = None
+    campos: List[str] = []
+    posicao = 0
+    encontradas = 0
+
+    for texto, alvo in labels:
+        indice = SECOES.get(texto)
+
+        # Um nome de seção só inicia uma seção posterior à corrente, senão é um valor
+        if indice is not None and (atual is None or indice > atual):
+            atual, campos, posicao = indice, DADOS[texto], 0
+            encontradas += 1
+            continue
+
+        if atual is None or texto in TEXTOS_IGNORADOS:
+            continue
+
+        if alvo in ESTRANGEIRO and alvo != marcada:
+            continue
+
+        if posicao < len(campos):
+            secoes[atual][campos[posicao]] = texto
+
+        posicao += 1
+
+    if not encontradas:
+        return None
+
+    return CadastroSec(*secoes)
@@ -67,6 +67,33 @@ DADOS = OrderedDict(
             "Distrito",
             "Subdistrito",
         ],
+        "Certificado": [
+            "Fistel",
+            "Situação",
+            "Certificado",
+            "Categoria",
+            "Data Habilitação",
+            "Marca",
+            "Boleto Emissão",
+            "Boleto 2ªVia",
+            "Data Emissão",
+            "Usuário Emissão",
+            "Data Reemissão",
+            "Usuário Reemissão",
+            "Certificado Estrangeiro",
+            "Validade Certificado",
+            "Funcionário OI",
+            "Data Inclusão",
+            "Usuário_Inclusão",
+            "Data_Alteração",
+            "Usuário_Alteração",
+            "Motivo_Exclusão",
+            "Informe_Exclusão",
+            "Data_da_Exclusão",
+            "Usuário_Exclusão",
+            "Status",
+            "Observação",
+        ],
     }
 )
 
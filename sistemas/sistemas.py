@@ -1,38 +1,124 @@
+import inspect
 import os
 import re
 import sys
 from collections import OrderedDict, namedtuple
-from time import sleep
+from functools import wraps
 from typing import Dict, List
 
 from bs4 import BeautifulSoup as soup
 from selenium.webdriver.common.by import By
 
-from sistemas import sis_helpers
-
-from ..tools import functions
+from ..tools import functions, tabela
 from ..tools.page import *
+from ..tools.sessao import SessaoHttp, restaurar_sessao, salvar_sessao
+from . import sis_helpers
+from .cache import CacheConsultas
+from .sec import interpreta_cadastro
 
 # This add the ../folder to the path while in development mode
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 
+def em_cache(metodo):
+    """Retorna o resultado de `metodo(identificador, tipo_id, ...)` armazenado em
+    `self.cache`, caso exista e não tenha expirado
+
+    Um resultado vazio, e.g. {} para um cadastro não encontrado, não é armazenado,
+    pois o cadastro pode ser incluído em seguida.
+    """
+    assinatura = inspect.signature(metodo)
+
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        if self.cache is None:
+            return metodo(self, *args, **kwargs)
+
+        argumentos = assinatura.bind(self, *args, **kwargs)
+        argumentos.apply_defaults()
+        identificador, tipo_id = list(argumentos.arguments.values())[1:3]
+
+        sistema = type(self).__name__
+
+        dados = self.cache.get(sistema, tipo_id, identificador)
+
+        if dados is None:
+            dados = metodo(self, *args, **kwargs)
+
+            if dados:
+                self.cache.gravar(sistema, tipo_id, identificador, dados)
+
+        return dados
+
+    return envoltorio
+
+
+def invalida_cache(identificador=lambda argumentos: argumentos["identificador"]):
+    """Descarta de `self.cache` as consultas do identificador alterado pelo método
+
+    Args:
+        identificador (Callable, optional): Obtém o identificador a partir dos
+            argumentos do método, key=nome do parâmetro.
+            Defaults to argumentos["identificador"].
+    """
+
+    def decorador(metodo):
+        assinatura = inspect.signature(metodo)
+
+        @wraps(metodo)
+        def envoltorio(self, *args, **kwargs):
+            try:
+                return metodo(self, *args, **kwargs)
+            finally:
+                # Mesmo uma alteração interrompida pode ter sido gravada
+                if self.cache is not None:
+                    argumentos = assinatura.bind(self, *args, **kwargs).arguments
+                    self.cache.invalidar(identificador(argumentos))
+
+        return envoltorio
+
+    return decorador
+
+
 class Sistema:
     def __init__(self, driver):
         self.sis = None
         self.page = Page(driver)
+        self.http = None
+        self.cache = None
+        self._auth = None
 
-    def authenticate(self, login: str, senha: str):
+    def authenticate(self, login: str, senha: str, sessao: str = None):
         """
 
         Args:
             login (str):
             senha (str):
+            sessao (str, optional): Arquivo da sessão salva. A sessão é restaurada
+                e a autenticação só é feita caso o sistemasnet a solicite.
+                Defaults to None.
 
         Returns:
             None
         """
 
+        self._auth = (login, senha)
+
+        if sessao is not None and restaurar_sessao(self.page.driver, sessao, senha):
+            # O sistemasnet está atrás da autenticação HTTP, a sessão restaurada só
+            # é válida se a página carregou sem o pop-up de autenticação
+            alert = self.page.alert_is_present(self.page._timeout_alerta())
+
+            if alert:
+                # Um pop-up pendente impede os comandos seguintes
+                alert.dismiss()
+
+            elif (
+                self.page.driver.execute_script("return document.readyState;")
+                == "complete"
+            ):
+                return
+
         self.page.driver.get("http://sistemasnet")
 
         alert = self.page.alert_is_present()
@@ -44,6 +130,9 @@ class Sistema:
 
             alert.accept()
 
+        if sessao is not None:
+            salvar_sessao(self.page.driver, sessao, senha)
+
     def _navigate(
         self, identificador: str, tipo_id: str, acoes: tuple, silent: bool = True
     ):
@@ -70,9 +159,10 @@ class Sistema:
 
                 self.page._atualizar_elemento(_id, identificador)
 
-                self.page._clicar(submit, silent=False)
+                self.page._clicar(submit, silent=False, alerta=False)
 
-            alert = self.page.alert_is_present()
+            # O pop-up ocorre quando o identificador não é encontrado
+            alert = self.page._alerta(True)
 
             if alert:
                 txt = alert.text
@@ -91,6 +181,68 @@ class Sistema:
     def _get_acoes(self, helper, keys):
         return tuple(helper.get(x, None) for x in keys)
 
+    def usar_http(self, pool_maxsize: int = 10) -> SessaoHttp:
+        """Habilita o modo HTTP das extrações reutilizando a sessão do webdriver
+
+        Args:
+            pool_maxsize (int, optional): Nº de conexões mantidas abertas. Defaults to 10.
+
+        Returns:
+            SessaoHttp: Cliente HTTP com os cookies do webdriver
+        """
+        self.http = SessaoHttp(
+            self.page.driver, auth=self._auth, pool_maxsize=pool_maxsize
+        )
+        return self.http
+
+    def usar_cache(self, cache: CacheConsultas = None) -> CacheConsultas:
+        """Armazena os cadastros extraídos em `cache`, compartilhável entre
+        instâncias e sistemas
+
+        Args:
+            cache (CacheConsultas, optional): Defaults to CacheConsultas() em memória.
+
+        Returns:
+            CacheConsultas: Cache usado
+        """
+        self.cache = cache if cache is not None else CacheConsultas()
+        return self.cache
+
+    def consulta_http(
+        self,
+        identificador: str,
+        tipo_id: str = "id_cpf",
+        h: dict = None,
+        btn: str = "id_btn_estacao",
+    ) -> str:
+        """Equivalente HTTP de `consulta`: submete o formulário de consulta
+        sem o browser e retorna o html da página de resultado
+
+        Args:
+            identificador (str): cpf, cnpj, fistel ou indicativo
+            tipo_id (str, optional): chave do campo no helper. Defaults to "id_cpf".
+            h (dict, optional): helper da consulta. Defaults to self.sis.consulta.
+            btn (str, optional): chave do botão clicado após a consulta.
+                Defaults to "id_btn_estacao".
+
+        Returns:
+            str: html da página de resultado
+        """
+        if self.http is None:
+            self.usar_http()
+
+        if h is None:
+            h = self.sis.consulta
+
+        identificador = functions.check_input(identificador=identificador, tipo=tipo_id)
+
+        html = self.http.enviar_formulario(h["link"], {h[tipo_id][1]: identificador})
+
+        if btn is not None and btn in h:
+            html = self.http.clicar_botao(html, h[btn][1]) or html
+
+        return html
+
     def consulta(self, identificador, tipo_id="id_cpf", timeout=5):
 
         h = self.sis.consulta
@@ -103,12 +255,29 @@ class Sistema:
 
         try:
 
-            self.page._clicar(h["id_btn_estacao"])
+            self.page._clicar(h["id_btn_estacao"], alerta=False)
 
         except (NoSuchElementException, TimeoutException):
 
             print("Não há registro para o identificador informado")
 
+    @em_cache
+    def extrai_cadastro(self, id, tipo_id="id_cpf", timeout=5, http=False, js=False):
+
+        if js and not http:
+            self.consulta(id, tipo_id)
+
+            return tabela.agrupa_pares(functions.extrai_pares_td(self.page.driver))
+
+        if http:
+            html = self.consulta_http(id, tipo_id)
+        else:
+            self.consulta(id, tipo_id)
+            html = self.page.driver.page_source
+
+        return tabela.extrai_rotulos(html)
+
+    @invalida_cache()
     def servico_excluir(
         self,
         identificador,
@@ -175,7 +344,7 @@ class Scpx(Sistema):
 
         try:
 
-            self.page._clicar((By.LINK_TEXT, identificador))
+            self.page._clicar((By.LINK_TEXT, identificador), alerta=False)
 
         except (NoSuchElementException, TimeoutException):
 
@@ -184,7 +353,7 @@ class Scpx(Sistema):
 
         try:
 
-            self.page._clicar(h["id_btn_estacao"])
+            self.page._clicar(h["id_btn_estacao"], alerta=False)
 
         except (NoSuchElementException, TimeoutException):
 
@@ -215,6 +384,7 @@ class Scpx(Sistema):
 
         self.page._clicar(btn_id)
 
+    @invalida_cache()
     def servico_incluir(
         self, identificador, num_processo, tipo_id="id_cpf", silent=False, timeout=5
     ):
@@ -239,6 +409,7 @@ class Scpx(Sistema):
         if silent:
             self.page._clicar(h.get("submit"))
 
+    @invalida_cache()
     def servico_excluir(
         self, identificador, documento, motivo="Renúncia", tipo_id="id_cpf"
     ):
@@ -272,6 +443,7 @@ class Scpx(Sistema):
         if alert:
             alert.dismiss()
 
+    @invalida_cache()
     def incluir_estacao(
         self,
         identificador,
@@ -314,9 +486,10 @@ class Scpx(Sistema):
 
         if tipo_estacao == "Fixa" and sede:
             self.page._clicar(helper.get("copiar_sede"), timeout=2 * timeout)
-            sleep(1)
+            self.page.esperar_rede_ociosa()
         self.page._clicar(helper.get("submit"), timeout=2 * timeout)
 
+    @invalida_cache()
     def movimento_transferir(
         self, identificador, origem, dest, proc, tipo_id="id_cpf", timeout=5
     ):
@@ -386,6 +559,7 @@ class Scpx(Sistema):
 
         self.page._clicar(helper.get("submit"))
 
+    @invalida_cache()
     def movimento_cancelar(
         self, identificador, tipo_id="id_cpf", timeout: int = 10
     ) -> None:
@@ -413,6 +587,7 @@ class Scpx(Sistema):
 
         self.page._clicar(helper["submit"])
 
+    @invalida_cache()
     def licenciar_estacao(
         self, identificador, tipo_id="id_cpf", ppdess=True, silent=False, timeout=5
     ):
@@ -442,6 +617,7 @@ class Scpx(Sistema):
 
                 self.page._clicar(helper["btn_print"])
 
+    @invalida_cache()
     def prorrogar_rf(self, identificador, tipo_id="id_cpf"):
 
         helper = self.sis.servico
@@ -459,6 +635,7 @@ class Scpx(Sistema):
         if alert:
             alert.accept()
 
+    @invalida_cache()
     def prorrogar_estacao(self, identificador, tipo_id="id_cpf"):
 
         helper = self.sis.licenca_prorrogar
@@ -491,26 +668,6 @@ class Scpx(Sistema):
 
         self.page._clicar(helper["id_btn_imprimir"])
 
-    def extrai_cadastro(self, id, tipo_id="id_cpf", timeout=5):
-
-        self.consulta(id, tipo_id)
-
-        dados = {}
-
-        source = soup(self.page.driver.page_source, "lxml")
-
-        for tr in source.find_all("tr"):
-
-            for td in tr.find_all("td", string=True):
-
-                key = td.text.strip(" :")
-                value = td.find_next_sibling("td")
-
-                if key not in dados and hasattr(value, "text"):
-                    dados[key] = value.text.strip()
-
-        return dados
-
 
 class Scra(Sistema):
     """
@@ -536,7 +693,7 @@ class Scra(Sistema):
 
         try:
 
-            self.page._clicar((By.LINK_TEXT, id))
+            self.page._clicar((By.LINK_TEXT, id), alerta=False)
 
         except (NoSuchElementException, TimeoutException):
 
@@ -545,7 +702,7 @@ class Scra(Sistema):
 
         try:
 
-            self.page._clicar(h["id_btn_estacao"])
+            self.page._clicar(h["id_btn_estacao"], alerta=False)
 
         except (NoSuchElementException, TimeoutException):
 
@@ -555,26 +712,7 @@ class Scra(Sistema):
 
         return True
 
-    def extrai_cadastro(self, id, tipo_id="id_cpf", timeout=5):
-
-        self.consulta(id, tipo_id)
-
-        dados = {}
-
-        source = soup(self.driver.page_source, "lxml")
-
-        for tr in source.find_all("tr"):
-
-            for td in tr.find_all("td", string=True):
-
-                key = td.text.strip(" :")
-                value = td.find_next_sibling("td")
-
-                if key not in dados and hasattr(value, "text"):
-                    dados[key] = value.text.strip()
-
-        return dados
-
+    @invalida_cache()
     def servico_incluir(
         self, identificador, num_processo, tipo_id="id_cpf", silent=False, timeout=5
     ):
@@ -599,6 +737,7 @@ class Scra(Sistema):
         if silent:
             self.page._clicar(h.get("submit"))
 
+    @invalida_cache()
     def movimento_transferir(
         self, identificador, origem, dest, proc, tipo_id="id_cpf", timeout=5
     ):
@@ -668,32 +807,26 @@ class Scra(Sistema):
 
         self.page._clicar(helper.get("submit"))
 
-    def extrai_cadastro(self, id, tipo_id="id_cpf", timeout=5):
-
-        dados = {}
+    @em_cache
+    def extrai_cadastro(self, id, tipo_id="id_cpf", timeout=5, http=False, js=False):
 
-        if self.consulta(id, tipo_id):
+        # A página de estações repete os rótulos para cada estação
+        if js and not http:
+            if not self.consulta(id, tipo_id):
+                return {}
 
-            source = soup(self.page.driver.page_source, "lxml")
-
-            i = 1
-
-            for tr in source.find_all("tr"):
-
-                for td in tr.find_all("td", string=True):
-
-                    key = td.text.strip(" :")
-                    value = td.find_next_sibling("td")
-
-                    if key in dados:
+            return tabela.agrupa_pares(
+                functions.extrai_pares_td(self.page.driver), tabela.SUFIXO
+            )
 
-                        key += "_" + str(i)
-                        i += 1
+        if http:
+            html = self.consulta_http(id, tipo_id)
+        elif self.consulta(id, tipo_id):
+            html = self.page.driver.page_source
+        else:
+            return {}
 
-                    if hasattr(value, "text"):
-                        dados[key] = value.text.strip()
-
-        return dados
+        return tabela.extrai_rotulos(html, tabela.SUFIXO)
 
     def imprimir_licenca(self, id, tipo_id="id_cpf", timeout=5):
         helper = self.sis.licenca["imprimir"]
@@ -727,34 +860,6 @@ class Sec(Sistema):
 
     SEC_DADOS = sis_helpers.DADOS
 
-    SEC_DADOS["Certificado"] = [
-        "Fistel",
-        "Situação",
-        "Certificado",
-        "Categoria",
-        "Data Habilitação",
-        "Marca",
-        "Boleto Emissão",
-        "Boleto 2ªVia",
-        "Data Emissão",
-        "Usuário Emissão",
-        "Data Reemissão",
-        "Usuário Reemissão",
-        "Certificado Estrangeiro",
-        "Validade Certificado",
-        "Funcionário OI",
-        "Data Inclusão",
-        "Usuário_Inclusão",
-        "Data_Alteração",
-        "Usuário_Alteração",
-        "Motivo_Exclusão",
-        "Informe_Exclusão",
-        "Data_da_Exclusão",
-        "Usuário_Exclusão",
-        "Status",
-        "Observação",
-    ]
-
     SEC_ALT = OrderedDict(
         {
             "Dados do Usuário": [
@@ -798,10 +903,15 @@ class Sec(Sistema):
     ) -> None:
         """Initializes and autenticate the Webdriver instance
         """
-        super().__init__(driver, login, senha, timeout)
+        super().__init__(driver)
+
+        self.page.timeout = timeout
 
         self.sis = sis_helpers.Sec
 
+        if login:
+            self.authenticate(login, senha)
+
     def consulta(self, identificador: str, tipo_id: str = "id_cpf", timeout=5):
 
         h = self.sis.consulta
@@ -818,12 +928,13 @@ class Sec(Sistema):
 
             try:
 
-                self.page._clicar((By.LINK_TEXT, identificador))
+                self.page._clicar((By.LINK_TEXT, identificador), alerta=False)
 
             except (NoSuchElementException, TimeoutException):
 
                 pass
 
+    @invalida_cache(lambda argumentos: argumentos["dados"]["CNPJ/CPF"])
     def incluir_cadastro(
         self, dados: dict, menor: bool = False, timeout: int = 5
     ) -> bool:
@@ -863,10 +974,11 @@ class Sec(Sistema):
         )
 
         for i, (tela, campos) in enumerate(telas.items()):
-            for campo in campos:
-                value = dados.get(campo, None)
-                if value:
-                    self.page._atualizar_elemento(h[campo], value + Keys.TAB)
+            self.page.preencher_formulario(
+                {h[campo]: dados[campo] for campo in campos if dados.get(campo)},
+                # Campo com máscara de digitação
+                teclas=(h["Data de Nascimento"],),
+            )
 
             self.page._clicar(buttons[i])
 
@@ -895,6 +1007,7 @@ class Sec(Sistema):
 
         return None
 
+    @invalida_cache(lambda argumentos: argumentos["cpf"])
     def regularizar_RF(self, cpf: str, situacao: str, timeout: int = 10) -> bool:
         """[summary]
         
@@ -950,13 +1063,9 @@ class Sec(Sistema):
         if alert:
             return alert.text
 
-        uf = self.page.wait_for_element(h["UF"])
-
         # After clicking the 'bt_cep' button it takes a while until the uf.value attribute is set
         # until then there is no uf.value
-        while uf.get_attribute("value") == "":
-            sleep(1)
-            uf = self.page.wait_for_element(h["UF"])
+        self.page.esperar_atributo(h["UF"], "value")
 
         logr = self.page.wait_for_element_to_be_visible(h["Logradouro"])
 
@@ -980,6 +1089,7 @@ class Sec(Sistema):
 
         return None
 
+    @invalida_cache(lambda argumentos: argumentos["dados"]["CNPJ/CPF"])
     def atualiza_cadastro(
         self,
         dados: dict,
@@ -1028,10 +1138,11 @@ class Sec(Sistema):
             self.page._atualizar_elemento(h["id_p_altera"], p_alt + Keys.TAB)
 
         for i, (_, campos) in enumerate(telas.items()):
-            for campo in campos:
-                value = dados.get(campo, None)
-                if value:
-                    self.page._atualizar_elemento(h[campo], value + Keys.TAB)
+            self.page.preencher_formulario(
+                {h[campo]: dados[campo] for campo in campos if dados.get(campo)},
+                # Campo com máscara de digitação
+                teclas=(h["Data de Nascimento"],),
+            )
 
             self.page._clicar(buttons[i])
 
@@ -1138,7 +1249,7 @@ class Sec(Sistema):
 
         self.page._clicar(h["submit"])
 
-        sleep(timeout)
+        self.page.wait_for_element((By.LINK_TEXT, data))
 
         if menor:
 
@@ -1156,7 +1267,14 @@ class Sec(Sistema):
         result.accept()
 
     def imprimir_provas(
-        self, num_prova, cpf, num_registros, start=0, end=-1, timeout: int = 5
+        self,
+        num_prova,
+        cpf,
+        num_registros,
+        start=0,
+        end=-1,
+        timeout: int = 5,
+        path: str = ".",
     ):
 
         h = self.sis.Prova["imprimir"]
@@ -1169,7 +1287,7 @@ class Sec(Sistema):
 
         self.page._atualizar_elemento(h["num_reg"], str(num_registros) + Keys.RETURN)
 
-        sleep(timeout)
+        self.page.esperar_rede_ociosa()
 
         dados = self._extrai_inscritos_prova()
 
@@ -1177,6 +1295,8 @@ class Sec(Sistema):
 
         for v in nomes[start:end]:
 
+            anteriores = os.listdir(path)
+
             self.page.driver.get(v.link)
 
             alert = self.page.alert_is_present(timeout=timeout)
@@ -1194,7 +1314,7 @@ class Sec(Sistema):
                 if alert:
                     alert.accept()
 
-                sleep(2)
+                self.page.esperar_rede_ociosa()
 
                 self.page.driver.execute_script("reimprimirprova();")
 
@@ -1218,76 +1338,31 @@ class Sec(Sistema):
                 if alert:
                     alert.accept()
 
-            sleep(timeout)
-
-            files = sorted(os.listdir(path))
-
-            file = os.path.join(path, files[0])
+            file = self.page.esperar_download(path, anteriores)
 
             os.rename(file, os.path.join(path, str(v.nome).upper() + ".pdf"))
 
-    def extrai_cadastro(self, id, tipo_id="id_cpf", timeout=5):
-        def soup_clean(source):
-
-            ids = [
-                "ImgObrigatorioIndCertificadoEstrangeiro",
-                "msgIndCertificadoEstrangeiro",
-            ]
-
-            labels = source.find_all("label")
+    @em_cache
+    def extrai_cadastro(self, id, tipo_id="id_cpf", timeout=5, http=False):
+        """Extrai o cadastro por seção, veja `interpreta_cadastro`
 
-            for label in source.find_all("label"):
-
-                if "id" in label.attrs and label.attrs["id"] in ids:
-
-                    labels.remove(label)
-
-            is_estrangeiro_sim = source.find("IndCertificadoEstrangeiro0")
-
-            is_estrangeiro_nao = source.find("IndCertificadoEstrangeiro1")
-
-            is_estrangeiro = hasattr(is_estrangeiro_sim, "CHECKED")
-
-            if is_estrangeiro:
-
-                labels.pop(is_estrangeiro_nao)
-            else:
-                labels.pop(is_estrangeiro_sim)
-
-            return [l.text.strip().strip(":") for l in labels]
-
-        self.consulta(id, tipo_id)
+        Returns:
+            OrderedDict: key=seção em KEYS, value=OrderedDict campo -> valor,
+                vazio caso o cadastro não exista
+        """
 
-        source = soup(self.driver.page_source, "lxml")
+        if http:
+            html = self.consulta_http(id, tipo_id, btn=None)
+        else:
+            self.consulta(id, tipo_id)
+            html = self.page.driver.page_source
 
-        sem_cadastro = (
-            r"Não foi encontrado nenhum registro com os critérios informados!"
-        )
+        registro = interpreta_cadastro(html)
 
-        if source.find(string=re.compile(sem_cadastro)):
+        if registro is None:
             return {}
 
-        dados = soup_clean(source)
-
-        cadastro = OrderedDict()
-
-        dados = [d for d in dados if d != "Categoria"]
-
-        for i, key in enumerate(self.KEYS[:-1]):
-
-            start = dados.index(key) + 1
-
-            end = dados.index(self.KEYS[i + 1])
-
-            cadastro[key] = OrderedDict(zip(self.SEC_DADOS[key], dados[start:end]))
-
-        key = self.KEYS[-1]
-
-        dados = dados[end + 1 :]
-
-        cadastro[key] = OrderedDict(zip(self.SEC_DADOS[key], dados))
-
-        return cadastro
+        return OrderedDict(zip(self.KEYS, registro))
 
         # for tr in source.find_all('tr'):
         #
@@ -1308,6 +1383,7 @@ class Sec(Sistema):
 
         # return OrderedDict(dados.items(), key=lambda t: t[0])
 
+    @invalida_cache(lambda argumentos: argumentos["cpf"])
     def alterar_nome(self, cpf, novo):
 
         pass
@@ -1335,12 +1411,13 @@ class Slmm(Sistema):
 
         try:
 
-            self.page._clicar(h["id_btn_estacao"])
+            self.page._clicar(h["id_btn_estacao"], alerta=False)
 
         except (NoSuchElementException, TimeoutException):
 
             print("Não há registro para o identificador informado")
 
+    @invalida_cache()
     def servico_excluir(
         self,
         identificador,
@@ -1403,12 +1480,13 @@ class Slma(Sistema):
 
         try:
 
-            self.page._clicar(h["id_btn_estacao"])
+            self.page._clicar(h["id_btn_estacao"], alerta=False)
 
         except (NoSuchElementException, TimeoutException):
 
             print("Não há registro para o identificador informado")
 
+    @invalida_cache()
     def servico_excluir(
         self,
         identificador,
@@ -1458,25 +1536,25 @@ class Sigec(Sistema):
 
         self.sis = sis_helpers.Sigec
 
-    def extrai_cadastro(self, id, tipo_id="id_cpf"):
-
-        self.consulta_geral(id, tipo_id, 30)
-
-        dados = {}
-
-        source = soup(self.driver.page_source, "lxml")
+    @em_cache
+    def extrai_cadastro(self, id, tipo_id="id_cpf", http=False, js=False):
 
-        for tr in source.find_all("tr"):
+        if js and not http:
+            self.consulta_geral(id, tipo_id, 30)
 
-            for td in tr.find_all("td", string=True):
+            return tabela.agrupa_pares(
+                functions.extrai_pares_td(self.page.driver), vazios=True
+            )
 
-                key = td.text.strip(" :")
-                value = td.find_next_sibling("td")
+        if http:
+            html = self.consulta_http(
+                id, tipo_id, h=self.sis.consulta["geral"], btn=None
+            )
+        else:
+            self.consulta_geral(id, tipo_id, 30)
+            html = self.page.driver.page_source
 
-                if key not in dados:
-                    dados[key] = value.text.strip()
-
-        return dados
+        return tabela.extrai_rotulos(html, vazios=True)
 
     def consulta_geral(self, ident, tipo_id="id_cpf", timeout=5, simples=True):
 
@@ -1569,15 +1647,13 @@ def abrir_agenda_prova(sec, datas):
         elem = sec.wait_for_element_to_click(sis_helpers.Agenda.btn_endereco)
         elem.click()
 
-        sleep(1)
-
         elem = sec.wait_for_element_to_click(sis_helpers.Agenda.cep)
         elem.send_keys("04101300")
 
         elem = sec.wait_for_element_to_click(sis_helpers.Agenda.btn_buscar_end)
         elem.click()
 
-        sleep(5)
+        sec.esperar_rede_ociosa()
 
         elem = sec.wait_for_element_to_click(sis_helpers.Agenda.numero)
         elem.send_keys("3073")
@@ -1585,15 +1661,12 @@ def abrir_agenda_prova(sec, datas):
         elem = sec.wait_for_element_to_click(sis_helpers.Agenda.btn_certificado)
         elem.click()
 
-        sleep(1)
-
         elem = Select(sec.wait_for_element_to_click(sis_helpers.Agenda.select_cert_1))
         elem.select_by_visible_text(
             "Certificado de Operador de Estação de Radioamador-Classe A"
         )
 
         sec.driver.execute_script("AdicionarCertificado('');")
-        sleep(1)
 
         elem = Select(sec.wait_for_element_to_click(sis_helpers.Agenda.select_cert_2))
         elem.select_by_visible_text(
@@ -1607,8 +1680,6 @@ def abrir_agenda_prova(sec, datas):
 
             alert = sec.alert_is_present(5)
 
-            sleep(2)
-
             alert.accept()
 
         except TimeoutException:
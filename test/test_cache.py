@@ -0,0 +1,57 @@
+from ..sistemas.cache import CacheConsultas, normaliza_identificador
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def test_normaliza_identificador():
+    assert normaliza_identificador("123.456.789-09") == "12345678909"
+    assert normaliza_identificador(" ps2abc ") == "PS2ABC"
+
+
+def test_ttl_por_sistema():
+    relogio = Relogio()
+
+    with CacheConsultas(ttl={"Scpx": 10, "Sec": 100}, relogio=relogio) as cache:
+        cache.gravar("Scpx", "id_cpf", "123.456.789-09", {"Nome": "Fulano"})
+        cache.gravar("Sec", "id_cpf", "12345678909", {"Nome": "Fulano"})
+
+        assert cache.get("Scpx", "id_cpf", "12345678909") == {"Nome": "Fulano"}
+        assert cache.get("Scpx", "id_cnpj", "12345678909") is None
+
+        relogio.agora = 50
+
+        assert cache.get("Scpx", "id_cpf", "12345678909") is None
+        assert cache.get("Sec", "id_cpf", "12345678909") == {"Nome": "Fulano"}
+        assert len(cache) == 1
+
+
+def test_lru_e_invalidacao():
+    relogio = Relogio()
+
+    with CacheConsultas(maximo=2, relogio=relogio) as cache:
+        for i, identificador in enumerate("abc"):
+            relogio.agora = i
+            cache.gravar("Scpx", "id_cpf", identificador, i)
+
+            # "a" é consultado logo após cada gravação e não é descartado
+            relogio.agora = i + 0.5
+            assert cache.get("Scpx", "id_cpf", "a") == 0
+
+        assert cache.get("Scpx", "id_cpf", "b") is None
+        assert cache.get("Scpx", "id_cpf", "c") == 2
+
+        cache.gravar("Sec", "id_cpf", "c", {})
+        cache.invalidar("c", "Sec")
+
+        assert cache.get("Sec", "id_cpf", "c") is None
+        assert cache.get("Scpx", "id_cpf", "c") == 2
+
+        cache.invalidar("C")
+
+        assert cache.get("Scpx", "id_cpf", "c") is None
@@ -0,0 +1,110 @@
+import pytest
+
+from ..sei.common import (
+    CAMPOS_PROCESSO,
+    COLUNAS_DF,
+    URL,
+    dict_to_df,
+    exporta_processos,
+    extrai_processos,
+    itera_registros_processos,
+    linhas_para_processos,
+    pode_expedir,
+    valor_serializavel,
+)
+
+
+def test_linhas_para_processos():
+    valores = {c: None for c in CAMPOS_PROCESSO}
+    valores.update(
+        checkbox="chkInfraItem0",
+        aviso="",
+        peticionamento="",
+        link="controlador.php?acao=procedimento_trabalhar",
+        numero="53500.000001/2020-01",
+        visualizado=True,
+        atribuicao="",
+        tipo="Outorga",
+        interessado="Fulano",
+    )
+
+    (processo,) = linhas_para_processos([[valores[c] for c in CAMPOS_PROCESSO]])
+
+    assert "anotacao" not in processo
+    assert processo["link"] == URL + "controlador.php?acao=procedimento_trabalhar"
+    assert processo["numero"] == "53500.000001/2020-01"
+
+
+def test_pode_expedir_strings():
+    linha = {"processo": "53500.000001/2020-01", "processo_aberto": True}
+
+    assert pode_expedir(dict(linha, tipo="Ofício", assinatura="Gerente Regional"))
+    assert not pode_expedir(dict(linha, tipo="Despacho", assinatura="Gerente Regional"))
+    assert not pode_expedir(dict(linha, tipo="Ofício", assinatura="Fiscal"))
+
+
+def test_exporta_processos_csv(tmp_path):
+    processos = ({"numero": str(i), "tipo": "Outorga", "aviso": ""} for i in range(3))
+
+    arquivo = tmp_path / "processos.csv"
+
+    assert exporta_processos(processos, arquivo, lote=2) == 3
+
+    linhas = arquivo.read_text(encoding="utf-8").splitlines()
+
+    assert linhas[0].split(",") == list(COLUNAS_DF)
+    assert linhas[1].startswith("0,Outorga")
+
+
+def test_exporta_processos_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    processos = (
+        {"numero": str(i), "tipo": "Outorga", "aviso": "x" if i else ""}
+        for i in range(5)
+    )
+
+    arquivo = tmp_path / "processos.parquet"
+
+    # O último lote é parcial
+    assert exporta_processos(processos, arquivo, lote=2) == 5
+
+    tabela = pq.read_table(arquivo)
+
+    assert tabela.column_names == list(COLUNAS_DF)
+    assert tabela.column("processo").to_pylist() == ["0", "1", "2", "3", "4"]
+    assert tabela.column("tipo").to_pylist() == ["Outorga"] * 5
+    assert tabela.column("aviso").to_pylist() == [False, True, True, True, True]
+
+
+def test_dict_to_df():
+    pytest.importorskip("pandas")
+
+    df = dict_to_df(
+        [{"numero": "1", "tipo": "Outorga"}, {"numero": "2", "tipo": "Outorga"}]
+    )
+
+    assert list(df["processo"]) == ["1", "2"]
+    assert df["tipo"].dtype == "category"
+
+
+LINHA = """
+<table><tr class="infraTrClara">
+<td><input type="checkbox" class="infraCheckbox" id="chkInfraItem0"></td>
+<td><a href="anotacao" onmouseover="return infraTooltipMostrar('Texto','fulano');">
+<img src="imagens/sei_anotacao_pequeno.gif"></a></td>
+<td><a href="processo" class="processoVisualizado">53500.000001/2020-01</a></td>
+<td><a>fulano</a></td>
+<td>Outorga</td>
+<td><span class="spanItemCelula">Interessado</span></td>
+</tr></table>
+"""
+
+
+def test_itera_registros_processos_equivale_a_armazena_tags():
+    (esperado,) = extrai_processos(LINHA)
+    (registro,) = itera_registros_processos(LINHA)
+
+    assert registro == {k: valor_serializavel(v) for k, v in esperado.items()}
+    assert registro["anotacao"] == "Texto fulano" and registro["visualizado"]
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+from ..sei.contatos import IndiceContatos, extrai_contatos
+from ..sei.sei import Processo, Sei
+
+HTML = """
+<table class="infraTable">
+<tr><th></th><th>Sigla</th><th>Nome</th><th>CPF/CNPJ</th></tr>
+<tr class="infraTrClara"><td><input class="infraCheckbox" value="10"></td>
+<td>JS</td><td>João da Silva</td><td>123.456.789-09</td></tr>
+<tr class="infraTrEscura"><td><input class="infraCheckbox" value="11"></td>
+<td>EX</td><td>Exemplo Telecomunicações Ltda</td><td>12.345.678/0001-95</td></tr>
+</table>
+"""
+
+
+def test_indice_contatos(tmp_path):
+    contatos = extrai_contatos(HTML)
+
+    assert contatos[0] == {
+        "sigla": "JS",
+        "nome": "João da Silva",
+        "documento": "123.456.789-09",
+        "id": "10",
+    }
+
+    indice = IndiceContatos(contatos)
+
+    assert indice.buscar("12345678909")["id"] == "10"
+    assert indice.buscar("JOAO DA SILVA")["id"] == "10"
+    assert indice.buscar("Exemplo Telecomunicacoes")["id"] == "11"
+    assert indice.buscar("Maria Souza") is None
+
+    indice.salvar(tmp_path / "contatos.json")
+
+    assert len(IndiceContatos.carregar(tmp_path / "contatos.json")) == 2
+
+
+def test_existe_somente_nome_exato():
+    indice = IndiceContatos(extrai_contatos(HTML))
+
+    assert indice.existe("JOÃO  DA SILVA") and indice.existe("123.456.789-09")
+    assert indice.buscar("João da Silv") is not None
+    assert not indice.existe("João da Silv")
+    assert not indice.existe("98765432100")
+
+
+def test_processo_compartilha_contatos():
+    driver = SimpleNamespace(session_id="sessao", current_url="http://sei")
+    pagina = SimpleNamespace(driver=driver)
+
+    sei = Sei(pagina, contatos=IndiceContatos())
+    processo = Processo(pagina, "1", contatos=sei.contatos)
+
+    sei.contatos.adicionar(extrai_contatos(HTML))
+
+    assert processo.contatos is sei.contatos and processo.contato_existe("12345678909")
@@ -0,0 +1,18 @@
+from ..sei.indice import IndiceProcessos
+
+PROCESSOS = [
+    {"numero": "1", "tipo": "Outorga: Serviço", "atribuicao": "fulano", "aviso": True},
+    {"numero": "2", "tipo": "Outorga: Rádio", "atribuicao": "", "aviso": ""},
+    {"numero": "3", "tipo": "Fiscalização", "atribuicao": "fulano", "aviso": ""},
+]
+
+
+def test_consulta():
+    indice = IndiceProcessos(PROCESSOS)
+
+    assert indice.consulta(atribuicao="fulano") == ["1", "3"]
+    assert indice.consulta(tipo__prefixo="outorga") == ["1", "2"]
+    assert indice.consulta(tipo__prefixo="outorga", atribuicao="fulano") == ["1"]
+    assert indice.consulta(ou=True, aviso=True, tipo__contem="fiscal") == ["1", "3"]
+    assert indice.consulta(tipo=["Fiscalização", "Outorga: Rádio"]) == ["2", "3"]
+    assert indice.consulta() == ["1", "2", "3"]
@@ -0,0 +1,67 @@
+from ..sei.lote import Operacao, agrupa_operacoes, concluidos, executar_lote
+
+
+class FakeProcesso:
+    def __init__(self, numero, chamadas):
+        self.numero, self.chamadas = numero, chamadas
+
+    def edita_postit(self, content="", prioridade=False):
+        if self.numero == "erro":
+            raise ValueError("falha")
+        self.chamadas.append(("postit", self.numero, content))
+
+    def edita_marcador(self, tipo="", content="", timeout=5, recarregar=True):
+        self.chamadas.append(("marcador", self.numero, tipo))
+
+
+class FakeSei:
+    def __init__(self):
+        self.carregados, self.chamadas = [], []
+
+    def go_to_processo(self, numero):
+        self.carregados.append(numero)
+        return FakeProcesso(numero, self.chamadas)
+
+
+def test_agrupa_operacoes():
+    grupos = agrupa_operacoes(
+        [Operacao("1", "a"), Operacao("2", "b"), Operacao("1", marcador="m")]
+    )
+
+    assert list(grupos) == ["1", "2"] and len(grupos["1"]) == 2
+
+
+def test_executar_lote_retoma_do_diario(tmp_path):
+    diario = tmp_path / "diario.jsonl"
+
+    operacoes = [Operacao("1", "a"), Operacao("erro", "b"), Operacao("1", marcador="m")]
+
+    sei = FakeSei()
+    resultado = executar_lote(sei, operacoes, diario)
+
+    assert sei.carregados == ["1", "erro"]
+    assert sei.chamadas == [("postit", "1", "a"), ("marcador", "1", "m")]
+    assert list(resultado["falhas"]) == ["erro"]
+
+    sei = FakeSei()
+    resultado = executar_lote(sei, operacoes, diario)
+
+    assert sei.carregados == ["erro"] and resultado["ignorados"] == 1
+
+
+def test_executar_lote_repara_linha_incompleta(tmp_path):
+    diario = tmp_path / "diario.jsonl"
+    diario.write_text('{"processo": "1", "ok": true}\n{"processo": "2", "o')
+
+    class Sei(FakeSei):
+        def go_to_processo(self, numero):
+            if numero == "3":
+                raise KeyError(numero)
+            return super().go_to_processo(numero)
+
+    operacoes = [Operacao("1", "a"), Operacao("2", "b"), Operacao("3", "c")]
+
+    resultado = executar_lote(Sei(), operacoes, diario)
+
+    assert resultado["processados"] == 2 and list(resultado["falhas"]) == ["3"]
+    assert concluidos(diario) == {"1", "2"}
@@ -0,0 +1,107 @@
+import itertools
+import json
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import requests
+
+from ..sistemas.lote import extrai_cadastro_lote, percentil
+
+
+class FakePool:
+    def __init__(self, tamanho=2):
+        self.pages = [SimpleNamespace(driver=object()) for _ in range(tamanho)]
+        self.emprestimos = itertools.cycle(self.pages)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.pages)
+
+    @contextmanager
+    def page(self):
+        # Empresta os browsers alternadamente, como o DriverPool com vários livres
+        with self.lock:
+            page = next(self.emprestimos)
+        yield page
+
+
+def fake_sistema(chamadas, instancias=None):
+    class Sistema:
+        def __init__(self, driver):
+            self.page = SimpleNamespace(driver=driver)
+            if instancias is not None:
+                instancias.append(self)
+
+        def extrai_cadastro(self, identificador, **kwargs):
+            chamadas.append(identificador)
+
+            # Falha somente na 1ª rodada
+            if identificador == "2" and chamadas.count("2") == 1:
+                raise requests.ConnectionError("rede")
+            if identificador == "3":
+                raise ValueError("página inesperada")
+
+            return {"nome": f"Fulano {identificador}", "uf": "SP"}
+
+    return Sistema
+
+
+def test_percentil():
+    assert percentil([], 50) == 0.0
+    assert percentil([3, 1, 2], 50) == 2
+    assert percentil(list(range(1, 101)), 95) == 95
+    assert percentil([1, 2], 100) == 2
+
+
+def test_lote_tenta_novamente_as_falhas(tmp_path):
+    chamadas = []
+    saida = tmp_path / "cadastros.jsonl"
+
+    resultado = extrai_cadastro_lote(
+        ["1", "2", "3", "1"],
+        fake_sistema(chamadas),
+        pool=FakePool(),
+        saida=saida,
+        tentativas=2,
+    )
+
+    assert sorted(chamadas) == ["1", "2", "2", "3", "3", "3"]
+    assert resultado["total"] == 3 and resultado["sucesso"] == 2
+    assert (
+        list(resultado["falhas"]) == ["3"] and "ValueError" in resultado["falhas"]["3"]
+    )
+
+    registros = [json.loads(linha) for linha in saida.read_text().splitlines()]
+
+    assert sorted(r["id"] for r in registros) == ["1", "2"]
+    assert registros[0]["dados"]["uf"] == "SP"
+
+
+def test_lote_grava_csv_longo(tmp_path):
+    saida = tmp_path / "cadastros.csv"
+
+    extrai_cadastro_lote(["1"], fake_sistema([]), pool=FakePool(), saida=saida)
+
+    assert saida.read_text(encoding="utf-8").splitlines() == [
+        "id,campo,valor",
+        "1,nome,Fulano 1",
+        "1,uf,SP",
+    ]
+
+
+def test_lote_reutiliza_instancia_por_browser():
+    instancias = []
+    pool = FakePool(tamanho=2)
+
+    resultado = extrai_cadastro_lote(
+        [str(i) for i in range(10, 20)],
+        fake_sistema([], instancias),
+        pool=pool,
+        auth=("usuario", "senha"),
+    )
+
+    assert resultado["sucesso"] == 10
+    assert len(instancias) == 2
+    assert {id(i.page.driver) for i in instancias} == {id(p.driver) for p in pool.pages}
+    assert all(i._auth == ("usuario", "senha") for i in instancias)
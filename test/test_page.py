@@ -0,0 +1,64 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.keys import Keys
+
+from ..tools.page import Page
+
+
+class FakeDriver:
+    def __init__(self):
+        self.chamadas = 0
+
+    def find_elements(self, by, valor):
+        self.chamadas += 1
+        return ["iframe"] * self.chamadas
+
+
+def test_esperar_iframes_registra_medicao():
+    page = Page(FakeDriver())
+
+    assert len(page.esperar_iframes(3)) == 3
+
+    with pytest.raises(TimeoutException):
+        page.esperar_iframes(1000, timeout=0.2)
+
+    resumo = page.resumo_medicoes()["iframes"]
+
+    assert resumo["chamadas"] == 2 and resumo["sucesso"] == 1
+
+
+def test_timeout_alerta_inicial_limitado():
+    page = Page(FakeDriver())
+
+    assert page._timeout_alerta() == page.alert_timeout_inicial < page.timeout
+
+    page._latencia_alerta = 0.1
+
+    assert page._timeout_alerta() == page.alert_timeout_min
+
+    page._latencia_alerta = 60
+
+    assert page._timeout_alerta() == page.timeout
+
+
+def test_preencher_formulario_converte_checkbox_e_usa_tab():
+    class Driver(FakeDriver):
+        def execute_script(self, script, campos):
+            self.campos = campos
+            return []
+
+    page = Page(Driver())
+    digitados = []
+    page._atualizar_elemento = lambda elem_id, dado: digitados.append(dado)
+
+    ausentes = page.preencher_formulario(
+        {("id", "chk"): "False", ("id", "txt"): "a", ("id", "data"): "01012020"},
+        teclas=(("id", "data"),),
+    )
+
+    assert ausentes == []
+    assert page.driver.campos == [
+        ["id", "chk", "False", False],
+        ["id", "txt", "a", True],
+    ]
+    assert digitados == ["01012020" + Keys.TAB]
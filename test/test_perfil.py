@@ -0,0 +1,87 @@
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from ..sistemas import perfil
+
+
+class FakePool:
+    def __len__(self):
+        return 3
+
+    @contextmanager
+    def page(self):
+        yield SimpleNamespace(driver=object())
+
+
+def fake_sistema(extrair):
+    class Sistema:
+        def __init__(self, driver):
+            pass
+
+        def extrai_cadastro(self, identificador, tipo_id, http=False):
+            return extrair(identificador)
+
+    return Sistema
+
+
+def falha(identificador):
+    raise LookupError(identificador)
+
+
+def test_perfil_parcial(monkeypatch):
+    liberar = threading.Event()
+
+    monkeypatch.setattr(
+        perfil,
+        "SISTEMAS",
+        {
+            "scpx": fake_sistema(lambda i: {"cpf": i}),
+            "sigec": fake_sistema(lambda i: liberar.wait(5) and {"cpf": i}),
+            "sec": fake_sistema(falha),
+        },
+    )
+
+    try:
+        resultado = perfil.perfil_completo(
+            "123", FakePool(), prazo=0.3, sistemas=("Scpx", "Sigec", "Sec")
+        )
+    finally:
+        liberar.set()
+
+    assert resultado.scpx == {"cpf": "123"}
+    assert resultado.sigec is None and resultado.expirados == ("sigec",)
+    assert resultado.sec is None and "LookupError" in resultado.falhas["sec"]
+    assert resultado.duracao < 5
+
+
+def test_perfil_unifica_campos_pela_precedencia():
+    cadastros = {
+        "scpx": {
+            "Nome/Razão Social": "Fulano Scpx",
+            "CPF/CNPJ": "123",
+            "Endereço": "Rua B, 2",
+        },
+        "sec": {
+            "Dados do Usuário": {"Nome/Razão Social": "Fulano Sec", "CNPJ/CPF": ""},
+            "Endereço Sede": {"Logradouro": "", "Número": ""},
+            "Endereço Correspondência": {
+                "Logradouro": "Rua A",
+                "Número": "1",
+                "UF": "RJ",
+            },
+        },
+    }
+
+    assert perfil.unifica_campos(cadastros) == {
+        "nome": "Fulano Sec",
+        "documento": "123",
+        "endereco": "Rua A, 1, RJ",
+    }
+
+    assert perfil.unifica_campos({}) == dict.fromkeys(perfil.ROTULOS)
+
+
+def test_perfil_padroes_nao_compartilhados():
+    assert perfil.Perfil("1").falhas is None
+    assert perfil.Perfil("1").nome is None and perfil.Perfil("1").expirados == ()
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from ..sei import config
+from ..sei.sei import Processo
+
+
+def processo(numero="53500.000001/2020-01"):
+    driver = SimpleNamespace(
+        session_id="sessao",
+        current_url="http://sei",
+        switch_to=SimpleNamespace(frame=lambda frame: None),
+        switch_to_default_content=lambda: None,
+    )
+    page = SimpleNamespace(driver=driver, wait_for_element=lambda elem: None)
+    p = Processo(page, numero)
+    p.invalidar_cache()
+
+    p.cliques, p.leituras = [], []
+    p._click_na_arvore = lambda label: (
+        p.cliques.append(label),
+        setattr(p, "_exibido", label),
+    )
+    p._acoes_central_frame = lambda: p.leituras.append(p._exibido) or {
+        "Concluir Processo": ("id", p._exibido)
+    }
+    return p
+
+
+def test_cache_acoes():
+    p = processo()
+
+    assert p._get_acoes() == {"Concluir Processo": ("id", p.numero)}
+    assert p._get_acoes() == {"Concluir Processo": ("id", p.numero)}
+    assert p.cliques == [p.numero] and p.leituras == [p.numero]
+
+    # O cache é compartilhado com novas instâncias do mesmo processo na mesma sessão
+    assert Processo(p.page, p.numero).acoes is p.acoes
+
+    p.invalidar_cache()
+    p._get_acoes()
+
+    assert p.cliques == [p.numero, p.numero] and len(p.leituras) == 2
+
+
+def test_exibido_descartado_ao_navegar():
+    p = processo()
+    p._get_acoes()
+
+    p.page.driver.current_url = "http://sei/outro"
+    p._get_acoes()
+
+    assert p.cliques == [p.numero, p.numero]
+
+    # Ações executadas no frame central podem mudar o conteúdo exibido
+    with p._go_to_central_frame():
+        pass
+
+    assert p._exibido is None
+
+
+def test_alteracao_invalida_cache():
+    p = processo()
+    p._get_acoes()
+
+    p.page._clicar = lambda *args, **kwargs: None
+    p.page.get_title = lambda: config.Iniciar_Processo.TITLE
+
+    p.concluir_processo()
+
+    assert p.acoes == {} and p._exibido is None
+
+
+def test_cache_limitado(monkeypatch):
+    monkeypatch.setattr(Processo, "_cache", OrderedDict())
+    monkeypatch.setattr(Processo, "CACHE_MAXIMO", 2)
+
+    for numero in "abc":
+        processo(numero)
+
+    assert [n for _, n in Processo._cache] == ["b", "c"]
+
+    processo("b")
+
+    assert [n for _, n in Processo._cache] == ["c", "b"]
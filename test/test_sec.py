@@ -0,0 +1,72 @@
+from ..sistemas.sec import interpreta_cadastro
+from ..sistemas.sis_helpers import DADOS
+
+
+def pagina(estrangeiro=False):
+    labels = []
+    for secao, campos in DADOS.items():
+        labels.append(f"<label>{secao}:</label>")
+        if secao == "Certificado":
+            labels.append("<label>Categoria</label>")
+        for campo in campos:
+            if campo == "Certificado Estrangeiro":
+                labels.append(
+                    '<input type="radio" id="IndCertificadoEstrangeiro0"'
+                    + (" checked" if estrangeiro else "")
+                    + '><label for="IndCertificadoEstrangeiro0">Sim</label>'
+                    '<input type="radio" id="IndCertificadoEstrangeiro1">'
+                    '<label for="IndCertificadoEstrangeiro1">Não</label>'
+                    '<label id="msgIndCertificadoEstrangeiro">*</label>'
+                )
+            elif campo == "Observação" and secao == "Dados do Usuário":
+                # Um valor igual ao nome de uma seção anterior não inicia seção
+                labels.append("<label>Dados do Usuário</label>")
+            else:
+                labels.append(f"<label>{secao[:3]} {campo}</label>")
+    return "<html><body><form>" + "".join(labels) + "</form></body></html>"
+
+
+def test_interpreta_cadastro():
+    cadastro = interpreta_cadastro(pagina())
+
+    assert cadastro.usuario["CNPJ/CPF"] == "Dad CNPJ/CPF"
+    assert cadastro.usuario["Observação"] == "Dados do Usuário"
+    assert list(cadastro.telefones.values()) == ["Dad Principal", "Dad Celular"]
+    assert cadastro.sede["Subdistrito"] == "End Subdistrito"
+    assert cadastro.certificado["Fistel"] == "Cer Fistel"
+    assert cadastro.certificado["Certificado Estrangeiro"] == "Não"
+    assert cadastro.certificado["Observação"] == "Cer Observação"
+
+    assert (
+        interpreta_cadastro(pagina(True)).certificado["Certificado Estrangeiro"]
+        == "Sim"
+    )
+
+
+def test_sem_cadastro():
+    html = "<html><body><p>Não foi encontrado nenhum registro com os critérios informados!</p></body></html>"
+    assert interpreta_cadastro(html) is None
+
+
+def test_ignora_comentarios_scripts_e_entidades():
+    html = (
+        pagina()
+        .replace(
+            "<form>",
+            "<form><!-- <label>Dados de Telefones</label> -->"
+            "<script>var s = '<label>Certificado</label>';</script>",
+        )
+        .replace("Dad Nome/Razão Social", "Jo&atilde;o <b>da</b> Silva")
+    )
+
+    cadastro = interpreta_cadastro(html)
+
+    assert cadastro.usuario["Nome/Razão Social"] == "João da Silva"
+    assert cadastro.telefones["Principal"] == "Dad Principal"
+
+
+def test_aceita_declaracao_xml():
+    html = '<?xml version="1.0" encoding="iso-8859-1"?>' + pagina()
+
+    assert interpreta_cadastro(html).sede["Subdistrito"] == "End Subdistrito"
+    assert interpreta_cadastro(html.encode()).sede["Subdistrito"] == "End Subdistrito"
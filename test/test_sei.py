@@ -1,5 +1,9 @@
+import json
 from getpass import getpass, getuser
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 from ..sei import sei
 
@@ -18,3 +22,156 @@ from ..sei import sei
 #
 # def test_context_manager():
 #     pass
+
+
+class FakeDriver:
+    def __init__(self, linhas):
+        self.linhas, self.scripts = linhas, []
+
+    def get(self, link):
+        pass
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        return self.linhas
+
+
+class FakeSei:
+    def __init__(self, linhas):
+        self.page = SimpleNamespace(
+            driver=FakeDriver(linhas),
+            get_title=lambda: "Bloco",
+            _alerta=lambda alerta: None,
+        )
+
+    def exibir_bloco(self, numero):
+        pass
+
+    def go_to_blocos(self):
+        pass
+
+
+def linha(documento, assinatura="Coordenador", aberto=True):
+    return [
+        None,
+        1,
+        "processo",
+        "link",
+        aberto,
+        documento,
+        "",
+        "Ofício",
+        assinatura,
+        "",
+    ]
+
+
+def fake_processo(falhar):
+    expedidos = []
+
+    class FakeProcesso:
+        def __init__(self, page, numero):
+            pass
+
+        def expedir_oficio(self, documento):
+            if documento in falhar:
+                raise KeyError(documento)
+            expedidos.append(documento)
+
+    return FakeProcesso, expedidos
+
+
+def concluiu(fake):
+    concluir = sei.config.Blocos.ACAO_CONCLUIR.format(1)
+    return concluir in fake.page.driver.scripts
+
+
+def test_expedir_bloco_retoma_checkpoint(tmp_path, monkeypatch):
+    checkpoint = tmp_path / "bloco.json"
+    linhas = [linha("1"), linha("2"), linha("3", assinatura="")]
+
+    processo, expedidos = fake_processo(falhar={"2"})
+    monkeypatch.setattr(sei, "Processo", processo)
+
+    fake = FakeSei(linhas)
+    resultado = sei.expedir_bloco(fake, 1, checkpoint=checkpoint)
+
+    assert resultado["expedidos"] == ["1"] and list(resultado["falhas"]) == ["2"]
+    assert not resultado["concluido"] and not concluiu(fake)
+    assert "KeyError" in json.loads(checkpoint.read_text())["falhas"]["2"]
+
+    # Na nova execução somente o documento que falhou é expedido, mesmo que o
+    # processo do primeiro já tenha sido enviado e não esteja mais aberto
+    linhas[0][4] = False
+    processo, expedidos = fake_processo(falhar=set())
+    monkeypatch.setattr(sei, "Processo", processo)
+
+    fake = FakeSei(linhas)
+    resultado = sei.expedir_bloco(fake, 1, checkpoint=checkpoint)
+
+    assert expedidos == ["2"] and resultado["falhas"] == {}
+    assert json.loads(checkpoint.read_text())["expedidos"] == ["1", "2"]
+
+    # O documento não assinado continua no bloco
+    assert not resultado["concluido"] and not concluiu(fake)
+
+    fake = FakeSei(linhas)
+    resultado = sei.expedir_bloco(fake, 1, checkpoint=checkpoint, concluir_parcial=True)
+
+    assert resultado["concluido"] and concluiu(fake)
+
+
+def test_expedir_bloco_conclui_com_todos_expedidos(monkeypatch):
+    processo, expedidos = fake_processo(falhar=set())
+    monkeypatch.setattr(sei, "Processo", processo)
+
+    fake = FakeSei([linha("1"), linha("2")])
+
+    assert sei.expedir_bloco(fake, 1)["concluido"] and concluiu(fake)
+    assert expedidos == ["1", "2"]
+
+
+def test_expedir_bloco_sem_expediveis_nao_conclui(monkeypatch):
+    processo, _ = fake_processo(falhar=set())
+    monkeypatch.setattr(sei, "Processo", processo)
+
+    fake = FakeSei([linha("1", assinatura="")])
+
+    assert not sei.expedir_bloco(fake, 1)["concluido"] and not concluiu(fake)
+    assert not sei.expedir_bloco(fake, 1, concluir_parcial=True)["concluido"]
+
+
+class FakeEditor:
+    def __init__(self, alterado):
+        self.alterado, self.cliques = alterado, []
+        self.driver = SimpleNamespace(execute_script=self.execute_script)
+
+    def execute_script(self, script, *args):
+        if script == sei.JS_RENDERIZAR_OFICIO:
+            return []
+        if script == sei.JS_EDITOR_ALTERADO:
+            return self.alterado
+        return True
+
+    def wait_for_element_to_be_visible(self, elemento):
+        pass
+
+    def _esperar(self, nome, condicao, timeout):
+        assert condicao(self.driver)
+
+    def _clicar(self, elemento, alerta=True):
+        self.cliques.append(elemento)
+
+
+def test_editar_oficio_exige_editor_alterado():
+    processo = object.__new__(sei.Processo)
+    submit = sei.config.Sei_Login.Oficio.submit
+
+    processo.page = FakeEditor(alterado=True)
+    processo.editar_oficio({"@nome@": "Fulano"})
+    assert processo.page.cliques == [submit]
+
+    processo.page = FakeEditor(alterado=False)
+    with pytest.raises(ValueError):
+        processo.editar_oficio({"@nome@": "Fulano"})
+    assert processo.page.cliques == []
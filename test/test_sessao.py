@@ -0,0 +1,75 @@
+from ..tools.sessao import SessaoHttp, carregar_sessao, salvar_sessao
+
+FORM = """
+<form method="post" action="Resultado.asp">
+    <input type="hidden" name="hdnAcao" value="consulta">
+    <input id="pNumCnpjCpf" name="pNumCnpjCpf">
+    <select name="cmbUF"><option value="SP">SP</option><option value="RJ" selected>RJ</option></select>
+    <input type="checkbox" name="chkTodos">
+</form>
+<button id="botaoFlatEstação" onclick="submeterTela('Estacao.asp')">Estação</button>
+"""
+
+URL = "http://sistemasnet/scpx/Consulta/Tela.asp"
+
+
+class FakeDriver:
+    def get_cookies(self):
+        return [{"name": "ASPSESSIONID", "value": "1", "domain": "sistemasnet"}]
+
+    def execute_script(self, script):
+        return "Mozilla/5.0"
+
+
+def sessao():
+    http = SessaoHttp(FakeDriver())
+    http.post = lambda url, data=None, **kwargs: (url, data)
+    http.url = URL
+    return http
+
+
+def test_sincronizar():
+    http = SessaoHttp(FakeDriver())
+    assert http.session.cookies.get("ASPSESSIONID") == "1"
+    assert http.session.headers["User-Agent"] == "Mozilla/5.0"
+
+
+def test_enviar_formulario():
+    url, dados = sessao().enviar_formulario(URL, {"pNumCnpjCpf": "123"}, html=FORM)
+    assert url == "http://sistemasnet/scpx/Consulta/Resultado.asp"
+    assert dados == {"hdnAcao": "consulta", "pNumCnpjCpf": "123", "cmbUF": "RJ"}
+
+
+def test_enviar_formulario_com_o_campo():
+    pesquisa = '<form id="frmPesquisaRapida"><input name="txtPesquisaRapida"></form>'
+    url, dados = sessao().enviar_formulario(
+        URL, {"pNumCnpjCpf": "1"}, html=pesquisa + FORM
+    )
+    assert url.endswith("Resultado.asp") and dados["pNumCnpjCpf"] == "1"
+
+
+def test_clicar_botao():
+    url, _ = sessao().clicar_botao(FORM, "botaoFlatEstação")
+    assert url == "http://sistemasnet/scpx/Consulta/Estacao.asp"
+    assert sessao().clicar_botao(FORM, "inexistente") is None
+
+
+def test_salvar_carregar_sessao(tmp_path):
+    class Driver(FakeDriver):
+        current_url = "https://sei.anatel.gov.br/sei/controlador.php"
+
+        def get_window_rect(self):
+            return {"x": 0, "y": 0, "width": 1280, "height": 800}
+
+    arquivo = tmp_path / "sessao.bin"
+    salvar_sessao(Driver(), arquivo, "senha")
+
+    estado = carregar_sessao(arquivo, "senha")
+    assert estado["url"] == Driver.current_url
+    assert estado["cookies"][0]["name"] == "ASPSESSIONID"
+    assert b"ASPSESSIONID" not in arquivo.read_bytes()
+    assert arquivo.stat().st_mode & 0o777 == 0o600
+    assert [p.name for p in tmp_path.iterdir()] == ["sessao.bin"]
+
+    assert carregar_sessao(arquivo, "errada") is None
+    assert carregar_sessao(tmp_path / "inexistente", "senha") is None
@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+from selenium.common.exceptions import NoAlertPresentException
+
+from ..sistemas import sistemas
+from ..sistemas.cache import CacheConsultas
+
+
+class FakeAlert:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def dismiss(self):
+        self.driver.alerta = False
+
+    def send_keys(self, texto):
+        self.driver.digitado = texto
+
+    def accept(self):
+        self.driver.alerta = False
+
+
+class FakeDriver:
+    def __init__(self, alerta):
+        self.alerta, self.visitados, self.digitado = alerta, [], None
+
+    @property
+    def switch_to(self):
+        if not self.alerta:
+            raise NoAlertPresentException()
+        return SimpleNamespace(alert=FakeAlert(self))
+
+    def execute_script(self, script):
+        return "complete"
+
+    def get(self, url):
+        self.visitados.append(url)
+        self.alerta = True
+
+
+def autentica(monkeypatch, alerta):
+    monkeypatch.setattr(sistemas, "restaurar_sessao", lambda *args: True)
+    monkeypatch.setattr(sistemas, "salvar_sessao", lambda *args: None)
+
+    sistema = sistemas.Sistema(FakeDriver(alerta))
+    sistema.page.alert_timeout_inicial = 0.05
+    sistema.page.timeout = 0.2
+    sistema.authenticate("usuario", "senha", sessao="sessao.bin")
+
+    return sistema.page.driver
+
+
+def test_sessao_restaurada_dispensa_login(monkeypatch):
+    driver = autentica(monkeypatch, alerta=False)
+
+    assert driver.visitados == [] and driver.digitado is None
+
+
+def test_popup_apos_restaurar_faz_login(monkeypatch):
+    driver = autentica(monkeypatch, alerta=True)
+
+    assert driver.visitados == ["http://sistemasnet"]
+    assert driver.digitado.startswith("usuario") and driver.digitado.endswith("senha")
+
+
+class FakeSistema:
+    def __init__(self, cadastros):
+        self.cadastros, self.consultas = cadastros, 0
+        self.cache = CacheConsultas()
+
+    @sistemas.em_cache
+    def extrai_cadastro(self, id, tipo_id="id_cpf", http=False):
+        self.consultas += 1
+        return self.cadastros.get(id, {})
+
+    @sistemas.invalida_cache(lambda argumentos: argumentos["dados"]["CNPJ/CPF"])
+    def incluir_cadastro(self, dados):
+        self.cadastros[dados["CNPJ/CPF"]] = dados
+
+
+def test_em_cache_nao_armazena_cadastro_vazio():
+    sistema = FakeSistema({"1": {"nome": "Fulano"}})
+
+    assert sistema.extrai_cadastro("1") == sistema.extrai_cadastro("1")
+    assert sistema.consultas == 1
+
+    assert sistema.extrai_cadastro("2") == {} == sistema.extrai_cadastro("2")
+    assert sistema.consultas == 3
+
+
+def test_invalida_cache_apos_inclusao():
+    sistema = FakeSistema({"1": {"nome": "Fulano"}})
+    sistema.extrai_cadastro("1")
+
+    sistema.incluir_cadastro({"CNPJ/CPF": "1", "nome": "Beltrano"})
+
+    assert sistema.extrai_cadastro("1")["nome"] == "Beltrano"
+    assert sistema.consultas == 2
+
+
+def test_sec_incluir_cadastro_invalida_cache():
+    assert hasattr(sistemas.Sec.incluir_cadastro, "__wrapped__")
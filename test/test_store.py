@@ -0,0 +1,81 @@
+import sqlite3
+
+from ..sei.store import CacheLinks, ProcessoStore, chave_sessao
+
+
+def processo(numero, **campos):
+    return dict(
+        {
+            "numero": numero,
+            "checkbox": "chkInfraItem0",
+            "marcador": "",
+            "atribuicao": "",
+        },
+        **campos
+    )
+
+
+def test_sync():
+    with ProcessoStore(":memory:") as store:
+        delta = store.sync([processo("1"), processo("2")])
+
+        assert delta.adicionados == ["1", "2"]
+        assert not delta.removidos and not delta.alterados
+
+        delta = store.sync(
+            [
+                processo("2", checkbox="chkInfraItem9", atribuicao="fulano"),
+                processo("3"),
+            ]
+        )
+
+        assert delta.adicionados == ["3"]
+        assert delta.removidos == ["1"]
+        assert delta.alterados == {"2": {"atribuicao": ("", "fulano")}}
+
+        assert list(store.processos()) == ["2", "3"]
+        assert store.processos()["2"]["atribuicao"] == "fulano"
+
+
+def test_cache_links(tmp_path):
+    arquivo = tmp_path / "links.db"
+
+    with CacheLinks(arquivo) as links:
+        links.atualizar({"1": "controlador.php?id_procedimento=1", "2": ""})
+
+    with CacheLinks(arquivo) as links:
+        assert links.get("1") == "controlador.php?id_procedimento=1"
+        assert links.get("2") is None
+
+        links.remover("1")
+
+        assert len(links) == 0
+
+
+def test_cache_links_por_sessao(tmp_path):
+    arquivo = tmp_path / "links.db"
+
+    with sqlite3.connect(str(arquivo)) as conn:
+        conn.execute("CREATE TABLE links (numero TEXT PRIMARY KEY, link TEXT)")
+        conn.execute("INSERT INTO links VALUES ('1', 'antigo')")
+
+    with CacheLinks(arquivo, "a") as links:
+        assert links.get("1") is None
+        links.atualizar({"1": "infra_hash=a"})
+
+    with CacheLinks(arquivo, "a") as links:
+        assert links.get("1") == "infra_hash=a"
+
+    # Um novo login descarta os links da sessão anterior
+    with CacheLinks(arquivo, "b") as links:
+        assert links.get("1") is None
+        links.mudar_sessao("a")
+        assert len(links) == 0
+
+
+def test_chave_sessao():
+    cookies = [{"name": "PHPSESSID", "value": "1"}, {"name": "tema", "value": "x"}]
+
+    assert chave_sessao(cookies) == chave_sessao(cookies[:1])
+    assert chave_sessao(cookies) != chave_sessao([{"name": "PHPSESSID", "value": "2"}])
+    assert "PHPSESSID" not in chave_sessao(cookies)
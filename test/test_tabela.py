@@ -0,0 +1,72 @@
+from bs4 import BeautifulSoup as soup
+
+from ..tools.tabela import (
+    PRIMEIRO,
+    SUFIXO,
+    ULTIMO,
+    agrupa_pares,
+    extrai_rotulos,
+    pares_label,
+)
+
+PAGINA = """
+<html><body><table>
+<tr><td>Nome:</td><td><b>Fulano de Tal</b></td></tr>
+<tr><td><b>CPF</b></td><td>123.456.789-09</td><td>Situação:</td></tr>
+<tr><td>Indicativo:</td><td> PY2ABC </td></tr>
+<tr><td>Indicativo:</td><span></span><td>PY2XYZ</td></tr>
+<tr><td> <b>Não</b> é rótulo</td><td>x</td></tr>
+</table></body></html>
+"""
+
+
+def legado(html):
+    dados = {}
+    for tr in soup(html, "lxml").find_all("tr"):
+        for td in tr.find_all("td", string=True):
+            key = td.text.strip(" :")
+            value = td.find_next_sibling("td")
+            if key not in dados and hasattr(value, "text"):
+                dados[key] = value.text.strip()
+    return dados
+
+
+def test_extrai_rotulos_equivale_ao_bs4():
+    assert (
+        extrai_rotulos(PAGINA)
+        == legado(PAGINA)
+        == {
+            "Nome": "Fulano de Tal",
+            "CPF": "123.456.789-09",
+            # Valores de texto simples também são rótulos da célula seguinte
+            "123.456.789-09": "Situação:",
+            "Indicativo": "PY2ABC",
+        }
+    )
+
+
+def test_politicas_duplicadas():
+    assert extrai_rotulos(PAGINA, ULTIMO)["Indicativo"] == "PY2XYZ"
+    assert extrai_rotulos(PAGINA, SUFIXO)["Indicativo_1"] == "PY2XYZ"
+    assert extrai_rotulos(PAGINA, vazios=True)["Situação"] is None
+
+    pares = [("a", "1"), ("b", "2"), ("a", "3"), ("b", "4")]
+    assert agrupa_pares(pares, SUFIXO) == {"a": "1", "b": "2", "a_1": "3", "b_2": "4"}
+    assert agrupa_pares(pares, PRIMEIRO) == {"a": "1", "b": "2"}
+
+
+def test_pares_label():
+    html = """<table>
+    <tr><td>Nome:</td><td><label>Fulano</label></td>
+        <td>UF:</td><td><label>SP</label></td></tr>
+    </table>"""
+    assert list(pares_label(html)) == [("Nome", "Fulano"), ("UF", "SP")]
+
+
+def test_pagina_com_declaracao_xml():
+    # O encoding declarado difere do da str, que já está decodificada
+    pagina = '<?xml version="1.0" encoding="iso-8859-1"?>' + PAGINA
+
+    assert extrai_rotulos(pagina) == extrai_rotulos(PAGINA)
+    assert "Situação" in extrai_rotulos(pagina, vazios=True)
+    assert list(pares_label(pagina)) == list(pares_label(PAGINA))
@@ -6,6 +6,7 @@ Created on Wed Nov  1 16:50:19 2017
 """
 # Basic Bultins
 import datetime as dt
+import os
 import re
 
 from selenium import webdriver
@@ -16,6 +17,9 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.ie.options import Options as IeOptions
 
+# Local application imports
+from .tabela import SUFIXO, agrupa_pares, pares_label
+
 # TODO: Generalize this
 NO_DRIVER = """
 You need to install the chromedriver for Selenium\n
@@ -45,6 +49,63 @@ BROWSERS = {
     "edge": {"name": "edge", "instance": webdriver.Edge, "options": EdgeOptions},
 }
 
+# Perfis de configuração do browser aceitos por get_browser
+PERFIS = ("padrao", "scraper")
+
+# Recursos que os scrapers nunca utilizam, bloqueados no perfil "scraper"
+BLOQUEIOS = (
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.svg",
+    "*.ico",
+    "*.css",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.eot",
+    "*.mp3",
+    "*.mp4",
+    "*.webm",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+)
+
+CHROME_SCRAPER_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.managed_default_content_settings.plugins": 2,
+}
+
+CHROME_SCRAPER_ARGS = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+)
+
+FIREFOX_SCRAPER_PREFS = {
+    "permissions.default.image": 2,
+    "permissions.default.stylesheet": 2,
+    "browser.display.use_document_fonts": 0,
+    "gfx.downloadable_fonts.enabled": False,
+    "media.autoplay.default": 5,
+    "extensions.update.enabled": False,
+    "app.update.auto": False,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "toolkit.telemetry.enabled": False,
+}
+
 
 def strip_string(identificador: str, strip: tuple = STRIP) -> str:
     """Remove os caracteres contidos em strip do identificador
@@ -60,13 +121,27 @@ def strip_string(identificador: str, strip: tuple = STRIP) -> str:
 
 
 # TODO: try using seleniumrequests instead
-def get_browser(browser: str = "Chrome", is_headless: bool = False):
+def get_browser(
+    browser: str = "Chrome",
+    is_headless: bool = False,
+    perfil: str = "padrao",
+    page_load: str = None,
+    perfil_dir: str = None,
+):
     """Inicia a instância webdriver com algumas configurações otimizadas
     e com o navegador logado na rede da Anatel
 
     Args:
         is_headless (bool): [Parâmetro para usar o browser de maneira oculta]. Defaults to False.
         browser (str, optional): [String com o nome do navegador]. Defaults to "Chrome".
+        perfil (str, optional): [Perfil de configuração: "padrao" ou "scraper". O perfil "scraper"
+            bloqueia imagens, fontes, mídia e folhas de estilo e desativa extensões e tráfego
+            em segundo plano]. Defaults to "padrao".
+        page_load (str, optional): [Estratégia de carregamento da página: "normal", "eager" ou "none"
+            somente Chrome e Firefox]. Defaults to "eager" no perfil "scraper", senão "normal".
+        perfil_dir (str, optional): [Diretório persistente de dados do usuário (cache, cookies)
+            reaproveitado entre execuções, somente Chrome e Firefox. Não pode ser usado por
+            dois browsers ao mesmo tempo]. Defaults to None.
 
     Returns:
         [webdriver]: [Webdriver instance]
@@ -77,6 +152,14 @@ def get_browser(browser: str = "Chrome", is_headless: bool = False):
             f"O browser mencionado é inválido ou não suportado, use uma dessas opções: {BROWSERS.items()!r}"
         )
 
+    if perfil not in PERFIS:
+        raise ValueError(f"O perfil {perfil} é inválido, use uma dessas opções: {PERFIS}")
+
+    scraper = perfil == "scraper"
+
+    if page_load is None and scraper:
+        page_load = "eager"
+
     if _browser["name"] != "edge":
         options = _browser["options"]()
         if _browser["name"] == "chrome":
@@ -84,9 +167,28 @@ def get_browser(browser: str = "Chrome", is_headless: bool = False):
                 "profile.default_content_setting_values.notifications": 2,
                 "disk-cache-size": 4096,
             }
+            if scraper:
+                prefs.update(CHROME_SCRAPER_PREFS)
+                for arg in CHROME_SCRAPER_ARGS:
+                    options.add_argument(arg)
             options.add_experimental_option("prefs", prefs)
             options.add_argument("start-maximized")
 
+        elif _browser["name"] == "firefox" and scraper:
+            for pref, value in FIREFOX_SCRAPER_PREFS.items():
+                options.set_preference(pref, value)
+
+        if perfil_dir is not None:
+            os.makedirs(perfil_dir, exist_ok=True)
+            if _browser["name"] == "chrome":
+                options.add_argument(f"--user-data-dir={perfil_dir}")
+            elif _browser["name"] == "firefox":
+                options.add_argument("-profile")
+                options.add_argument(perfil_dir)
+
+        if page_load is not None and _browser["name"] in ("chrome", "firefox"):
+            options.set_capability("pageLoadStrategy", page_load)
+
         if is_headless:
             options.add_argument("--headless")
             options.add_argument("--disable-gpu")
@@ -96,6 +198,12 @@ def get_browser(browser: str = "Chrome", is_headless: bool = False):
     else:
         driver = _browser["instance"]()
 
+    if scraper and _browser["name"] == "chrome":
+        # Fontes e folhas de estilo não têm preferência no Chrome, são bloqueadas
+        # pelo DevTools. O bloqueio vale para a aba inicial do browser.
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(BLOQUEIOS)})
+
     if _browser["name"] != "chrome":
         driver.maximize_window()
 
@@ -178,20 +286,59 @@ def transform_date(date):
 
 
 def extrai_pares_tabulação(source):
-    trs = source.find_all("tr")
-    dados = {}
-    for tr in trs:
-        td = tr.find_all("td", string=True)
-        label = tr.find_all("label", string=True)
-
-        i = 1
-        for field, result in zip(td, label):
-            field, result = field.text[:-1], result.text
-            if field in dados:
-                field = field + "_" + str(i + 1)
-            dados[field] = result
-
-    return dados
+    """Extrai os pares das linhas em que o rótulo é uma <td> e o valor um <label>
+
+    Args:
+        source (str, BeautifulSoup): html da página
+
+    Returns:
+        dict: key=rótulo, value=valor, rótulos repetidos recebem o sufixo "_n"
+    """
+    return agrupa_pares(pares_label(str(source)), SUFIXO)
+
+
+# Gera no browser os pares [rótulo, valor] das células com texto simples, cujo valor
+# é o texto da célula seguinte, reproduzindo `tr.find_all("td", string=True)`
+JS_PARES_TD = """
+function textoUnico(no) {
+    while (no.childNodes.length === 1 && no.firstChild.nodeType === 1) {
+        no = no.firstChild;
+    }
+    if (no.childNodes.length !== 1 || no.firstChild.nodeType !== 3) { return null; }
+    return no.firstChild.nodeValue;
+}
+
+var pares = [], linhas = document.getElementsByTagName("tr");
+
+for (var i = 0; i < linhas.length; i++) {
+    var tds = linhas[i].getElementsByTagName("td");
+    for (var j = 0; j < tds.length; j++) {
+        var texto = textoUnico(tds[j]);
+        if (texto === null) { continue; }
+        var valor = tds[j].nextElementSibling;
+        while (valor && valor.tagName !== "TD") { valor = valor.nextElementSibling; }
+        pares.push([texto.replace(/^[ :]+|[ :]+$/g, ""), valor ? valor.textContent.trim() : null]);
+    }
+}
+
+return pares;
+"""
+
+
+def extrai_pares_td(driver):
+    """Executa JS_PARES_TD na página atual do webdriver
+
+    Somente a lista de pares trafega pelo protocolo do webdriver, em vez de todo o
+    `page_source`, que precisaria ser novamente interpretado pelo BeautifulSoup.
+
+    Args:
+        driver (webdriver): Instância do webdriver
+
+    Returns:
+        list: Lista de tuplas (rótulo, valor). O valor é None caso a célula não
+            tenha uma célula seguinte
+    """
+    return [tuple(par) for par in driver.execute_script(JS_PARES_TD)]
 
 
 def add_point_cpf_cnpj(ident):
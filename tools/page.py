@@ -8,14 +8,18 @@ Ela é um atributo de classe das demais classes específicas.
 @author: Ronaldo da Silva Alves Batista
 """
 # Standard Lib Imports
+import os
+from collections import defaultdict, deque, namedtuple
 from contextlib import contextmanager
-from typing import Any, Optional, Sequence, Tuple, Union
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 # Third-Parties imports
 import selenium
 from selenium import webdriver
 from selenium.common.exceptions import (
     ElementClickInterceptedException,
+    NoAlertPresentException,
     NoSuchElementException,
     TimeoutException,
     UnexpectedAlertPresentException,
@@ -31,6 +35,110 @@ from .functions import get_browser
 
 Elem = Tuple[Any, str]
 
+# Registro de duração de cada espera realizada pela classe Page
+Medicao = namedtuple("Medicao", "operacao duracao sucesso")
+
+# Estratégias de localização que o script de preenchimento resolve no browser
+LOCALIZADORES_JS = ("id", "name", "xpath", "css selector", "class name")
+
+# Preenche todos os campos numa única chamada, disparando os eventos dos quais
+# as páginas ASP dependem. Escrito em ES5 para manter a compatibilidade com o IE.
+PREENCHER_FORMULARIO_JS = """
+var campos = arguments[0], ausentes = [];
+
+function localizar(by, valor) {
+    switch (by) {
+        case "id": return document.getElementById(valor);
+        case "name": return document.getElementsByName(valor)[0];
+        case "css selector": return document.querySelector(valor);
+        case "class name": return document.getElementsByClassName(valor)[0];
+        case "xpath": return document.evaluate(
+            valor, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+    }
+    return null;
+}
+
+function disparar(el, tipo) {
+    var evento = document.createEvent("HTMLEvents");
+    evento.initEvent(tipo, true, true);
+    el.dispatchEvent(evento);
+}
+
+for (var i = 0; i < campos.length; i++) {
+    var el = localizar(campos[i][0], campos[i][1]), valor = campos[i][2];
+    var marcado = campos[i][3];
+
+    if (!el) { ausentes.push(i); continue; }
+
+    disparar(el, "focus");
+
+    if (el.type === "checkbox" || el.type === "radio") {
+        el.checked = marcado;
+    } else if (el.tagName === "SELECT") {
+        for (var j = 0; j < el.options.length; j++) {
+            if (el.options[j].text === valor || el.options[j].value === valor) {
+                el.selectedIndex = j;
+                break;
+            }
+        }
+    } else {
+        el.value = valor;
+    }
+
+    disparar(el, "input");
+    disparar(el, "change");
+    disparar(el, "blur");
+}
+
+return ausentes;
+"""
+
+# Textos que desmarcam um checkbox/radio, já que no javascript qualquer string
+# não vazia, inclusive "False", é verdadeira
+FALSOS = frozenset(("", "0", "false", "falso", "f", "n", "nao", "não", "off", "none"))
+
+
+def marcado(dado: Any) -> bool:
+    """Converte `dado` no estado de um checkbox/radio, e.g. "False" -> False"""
+    if isinstance(dado, str):
+        return dado.strip().lower() not in FALSOS
+    return bool(dado)
+
+
+# Registra o instante da última mutação do DOM. Instalado uma única vez por página
+OBSERVAR_DOM_JS = """
+if (!window.__paginaObservador) {
+    window.__ultimaMutacao = performance.now();
+    window.__paginaObservador = new MutationObserver(function () {
+        window.__ultimaMutacao = performance.now();
+    });
+    window.__paginaObservador.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+return performance.now() - window.__ultimaMutacao;
+"""
+
+# Conta as requisições XHR pendentes e retorna o estado da rede da página. As
+# requisições iniciadas antes da instalação são percebidas pelo Resource Timing
+OBSERVAR_REDE_JS = """
+if (typeof window.__paginaPendentes === "undefined") {
+    window.__paginaPendentes = 0;
+    var enviar = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__paginaPendentes++;
+        this.addEventListener("loadend", function () { window.__paginaPendentes--; });
+        return enviar.apply(this, arguments);
+    };
+}
+return [
+    document.readyState,
+    window.__paginaPendentes,
+    performance.getEntriesByType("resource").length
+];
+"""
+
 
 # Base Class
 # noinspection NonAsciiCharacters,SpellCheckingInspection
@@ -44,14 +152,43 @@ class Page:
 
     timeout: int = 10
 
+    # Limite inferior e nº máximo de medições da espera adaptativa por alertas
+    alert_timeout_min: float = 0.5
+
+    # Espera por pop-ups esperados enquanto nenhum foi encontrado. Muitos só ocorrem
+    # em caso de erro, e.g. identificador inexistente, e esperar `timeout` inteiro
+    # no caso comum, sem pop-up, anularia o ganho da espera adaptativa
+    alert_timeout_inicial: float = 1.0
+
+    max_medicoes: int = 10000
+
     def __init__(self, driver: webdriver):
         self.driver = driver
+        self.medicoes = deque(maxlen=self.max_medicoes)
+        self._latencia_alerta: Optional[float] = None
 
     def restart_driver(self, **kwargs) -> None:
         """Restarts webdriver instance
         """
+        try:
+            self.driver.quit()
+        except WebDriverException:
+            pass  # O driver antigo já está morto
+
         self.driver = get_browser(**kwargs)
 
+    def is_alive(self) -> bool:
+        """Verifica se a instância do webdriver ainda responde a comandos
+
+        Returns:
+            bool: True se o browser responde, False caso contrário
+        """
+        try:
+            self.driver.current_window_handle
+        except WebDriverException:
+            return False
+        return True
+
     def fechar(self) -> None:
         """Fecha a instância atual do browser
         
@@ -60,12 +197,16 @@ class Page:
         """
         self.driver.close()
 
-    def _clicar(self, btn_id: Elem, silent: bool = True) -> Union[str, None, Any]:
+    def _clicar(
+        self, btn_id: Elem, silent: bool = True, alerta: Optional[bool] = None
+    ) -> Union[str, None, Any]:
         """Clica no botão ou link definido pelo elemento btn_id
 
         Args:
             btn_id (tuple): localizador da página html: (id, conteúdo), (title, conteúdo), (link_text, conteúdo)
             silent (bool, optional): Defaults to True. Se verdadeiro confirma o pop-up após o clique no botão
+            alerta (bool, optional): True se o clique deve gerar um pop-up, False caso contrário.
+                Veja `_alerta`. Defaults to None.
         """
 
         try:
@@ -83,23 +224,23 @@ class Page:
             # noinspection PyUnboundLocalVariable
             self.driver.execute_script("arguments[0].click();", botão)
 
-        alerta = self.alert_is_present()
+        alert = self._alerta(alerta)
 
-        if alerta:
+        if alert:
             if silent:
-                text = alerta.text
-                alerta.accept()
+                text = alert.text
+                alert.accept()
                 return text
             else:
-                return alerta
+                return alert
         else:
             return True
 
     def _clicar_se_existir(
-        self, btn_id: Elem, silent: bool = True
+        self, btn_id: Elem, silent: bool = True, alerta: Optional[bool] = None
     ) -> Union[str, None, Any]:
         if self.check_element_exists(btn_id):
-            return self._clicar(btn_id, silent)
+            return self._clicar(btn_id, silent, alerta)
         return None
 
     def _atualizar_elemento(self, elem_id: Elem, dado: str) -> Optional[str]:
@@ -124,12 +265,56 @@ class Page:
 
         return None
 
-    def _selecionar_por_texto(self, select_id: Elem, text: str) -> Optional[str]:
+    def preencher_formulario(
+        self, mapping: Dict[Elem, Any], teclas: Sequence[Elem] = ()
+    ) -> List[Elem]:
+        """Preenche todos os campos de `mapping` com uma única chamada `execute_script`
+
+        Para cada campo são disparados os eventos focus, input, change e blur dos quais
+        as páginas dependem. Selects são selecionados pelo texto ou valor da opção e
+        checkbox/radio são marcados conforme `marcado(valor)`.
+
+        Args:
+            mapping (dict): key=localizador do campo, value=conteúdo a ser inserido
+            teclas (Sequence, optional): localizadores dos campos que precisam ser
+                preenchidos com `send_keys`, e.g. campos com máscara. Defaults to ().
+
+        Returns:
+            list: localizadores dos campos não encontrados na página
+        """
+        campos, lentos = [], []
+
+        for elem_id, dado in mapping.items():
+            if elem_id in teclas or elem_id[0] not in LOCALIZADORES_JS:
+                lentos.append((elem_id, dado))
+            else:
+                campos.append((elem_id, dado))
+
+        ausentes = []
+
+        if campos:
+            indices = self.driver.execute_script(
+                PREENCHER_FORMULARIO_JS,
+                [[by, valor, dado, marcado(dado)] for (by, valor), dado in campos],
+            )
+            ausentes = [campos[i][0] for i in indices]
+
+        for elem_id, dado in lentos:
+            # O TAB dispara o blur que valida e formata os campos com máscara
+            if self._atualizar_elemento(elem_id, str(dado) + Keys.TAB) is not None:
+                ausentes.append(elem_id)
+
+        return ausentes
+
+    def _selecionar_por_texto(
+        self, select_id: Elem, text: str, alerta: Optional[bool] = None
+    ) -> Optional[str]:
         """
 
         :param select_id: localizador da página html que define um Select (menu drop-down):
                           (id, conteúdo), (title, conteúdo), (link_text, conteúdo)
         :param text: texto da opção do menu a ser selecionada
+        :param alerta: True se a seleção deve gerar um pop-up, False caso contrário
         :return: None
         Seleciona o menu drop-down definido pela tupla select_id e escolhe a opção cujo texto de amostra é igual a text
         """
@@ -143,11 +328,11 @@ class Page:
         except NoSuchElementException:
             print(f"Não existe a opção {text} no Menu mencionado")
 
-        alerta = self.alert_is_present()
+        alert = self._alerta(alerta)
 
-        if alerta:
-            txt = alerta.text
-            alerta.accept()
+        if alert:
+            txt = alert.text
+            alert.accept()
             return txt
 
         return None
@@ -180,20 +365,224 @@ class Page:
 
         WebDriverWait(self.driver, self.timeout).until(EC.staleness_of(old_page))
 
-    def alert_is_present(self) -> Union[WebDriverWait, bool]:
+    def alert_is_present(self, timeout: float = None) -> Union[WebDriverWait, bool]:
+        """Retorna o pop-up presente na página ou False
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera pelo pop-up, com 0 é feita
+                somente uma verificação instantânea. Defaults to self.timeout.
+        """
+        if timeout is None:
+            timeout = self.timeout
 
         try:
 
-            alert = WebDriverWait(self.driver, self.timeout).until(
-                EC.alert_is_present()
-            )
+            if timeout > 0:
+                alert = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                    EC.alert_is_present()
+                )
+            else:
+                # switch_to.alert lança NoAlertPresentException se não houver pop-up
+                alert = self.driver.switch_to.alert
 
-        except (TimeoutException, WebDriverException):
+        except (NoAlertPresentException, TimeoutException, WebDriverException):
 
             return False
 
         return alert
 
+    def _timeout_alerta(self) -> float:
+        """Tempo de espera adaptativo para pop-ups esperados: 3x a latência média
+        observada, limitado por `alert_timeout_min` e `timeout`, ou
+        `alert_timeout_inicial` antes do primeiro pop-up
+        """
+        if self._latencia_alerta is None:
+            return min(self.timeout, self.alert_timeout_inicial)
+        return min(self.timeout, max(self.alert_timeout_min, 3 * self._latencia_alerta))
+
+    def _alerta(self, alerta: Optional[bool] = None) -> Union[WebDriverWait, bool]:
+        """Verifica a presença de pop-up após uma ação na página
+
+        Args:
+            alerta (bool, optional):
+                True: o pop-up é esperado, a espera é adaptativa `_timeout_alerta`
+                False: o pop-up não é esperado, a verificação é instantânea
+                None: espera pelo tempo total `timeout`. Defaults to None.
+
+        Returns:
+            O pop-up presente ou False
+        """
+        if alerta is None:
+            modo, timeout = "alerta_padrao", self.timeout
+        elif alerta:
+            modo, timeout = "alerta_esperado", self._timeout_alerta()
+        else:
+            modo, timeout = "alerta_instantaneo", 0
+
+        inicio = perf_counter()
+
+        alert = self.alert_is_present(timeout)
+
+        duracao = perf_counter() - inicio
+
+        if alert and timeout:
+            # Média móvel exponencial da latência dos pop-ups encontrados
+            if self._latencia_alerta is None:
+                self._latencia_alerta = duracao
+            else:
+                self._latencia_alerta = 0.7 * self._latencia_alerta + 0.3 * duracao
+
+        self.medicoes.append(Medicao(modo, duracao, bool(alert)))
+
+        return alert
+
+    def _esperar(self, operacao: str, condicao, timeout: float = None) -> Any:
+        """Aguarda `condicao(driver)` retornar um valor verdadeiro e registra a
+        duração da espera em `medicoes`
+
+        Args:
+            operacao (str): Nome da operação registrado na medição
+            condicao (Callable): Condição repassada a WebDriverWait.until
+            timeout (float, optional): Tempo máximo de espera. Defaults to self.timeout.
+
+        Raises:
+            TimeoutException: Caso a condição não seja atendida no tempo máximo
+
+        Returns:
+            O valor retornado pela condição
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        inicio = perf_counter()
+
+        try:
+            resultado = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                condicao
+            )
+        except TimeoutException:
+            self.medicoes.append(Medicao(operacao, perf_counter() - inicio, False))
+            raise
+
+        self.medicoes.append(Medicao(operacao, perf_counter() - inicio, True))
+
+        return resultado
+
+    def esperar_atributo(
+        self, locator: Elem, atributo: str, valor: str = None, timeout: float = None
+    ):
+        """Aguarda o atributo `atributo` do elemento assumir `valor` ou, se `valor`
+        for None, qualquer valor não vazio
+
+        Returns:
+            WebElement: O elemento
+        """
+
+        def condicao(driver):
+            elem = driver.find_element(*locator)
+            atual = elem.get_attribute(atributo)
+            if (atual == valor) if valor is not None else atual:
+                return elem
+            return False
+
+        return self._esperar("atributo", condicao, timeout)
+
+    def esperar_selecao(self, elem, selecionado: bool = True, timeout: float = None):
+        """Aguarda o checkbox ou radio `elem` assumir o estado `selecionado`"""
+        return self._esperar(
+            "selecao",
+            lambda driver: elem.is_selected() == selecionado,
+            timeout,
+        )
+
+    def esperar_iframes(self, quantidade: int, timeout: float = None) -> List:
+        """Aguarda a página conter ao menos `quantidade` iframes
+
+        Returns:
+            list: Os iframes da página
+        """
+
+        def condicao(driver):
+            frames = driver.find_elements("tag name", "iframe")
+            return frames if len(frames) >= quantidade else False
+
+        return self._esperar("iframes", condicao, timeout)
+
+    def esperar_dom_estavel(self, intervalo: float = 0.5, timeout: float = None) -> None:
+        """Aguarda o DOM do frame atual passar `intervalo` segundos sem alterações"""
+        self._esperar(
+            "dom_estavel",
+            lambda driver: driver.execute_script(OBSERVAR_DOM_JS) >= intervalo * 1000,
+            timeout,
+        )
+
+    def esperar_rede_ociosa(self, intervalo: float = 0.5, timeout: float = None) -> None:
+        """Aguarda a página estar carregada, sem requisições XHR pendentes e sem
+        novos recursos baixados durante `intervalo` segundos
+        """
+        estado = {"recursos": None, "desde": perf_counter()}
+
+        def condicao(driver):
+            pronto, pendentes, recursos = driver.execute_script(OBSERVAR_REDE_JS)
+
+            if recursos != estado["recursos"] or pendentes or pronto != "complete":
+                estado["recursos"], estado["desde"] = recursos, perf_counter()
+                return False
+
+            return perf_counter() - estado["desde"] >= intervalo
+
+        self._esperar("rede_ociosa", condicao, timeout)
+
+    def esperar_download(
+        self, pasta: str, anteriores: Sequence[str] = (), timeout: float = None
+    ) -> str:
+        """Aguarda a conclusão de um novo download na pasta `pasta`
+
+        Args:
+            pasta (str): Pasta de downloads do browser
+            anteriores (Sequence, optional): Arquivos existentes antes do download.
+                Defaults to ().
+
+        Returns:
+            str: Caminho do arquivo baixado
+        """
+        parciais = (".crdownload", ".part", ".tmp")
+
+        def condicao(driver):
+            novos = [
+                f
+                for f in os.listdir(pasta)
+                if f not in anteriores and not f.endswith(parciais)
+            ]
+            # Os browsers criam o arquivo parcial antes de renomeá-lo
+            if novos and not any(f.endswith(parciais) for f in os.listdir(pasta)):
+                return os.path.join(pasta, novos[0])
+            return False
+
+        return self._esperar("download", condicao, timeout)
+
+    def resumo_medicoes(self) -> Dict[str, Dict[str, float]]:
+        """Agrega as medições de espera por operação
+
+        Returns:
+            dict: key=operação, value=dict com nº de chamadas, tempo total e médio
+            e nº de esperas bem sucedidas
+        """
+        resumo: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"chamadas": 0, "total": 0.0, "sucesso": 0}
+        )
+
+        for medicao in self.medicoes:
+            r = resumo[medicao.operacao]
+            r["chamadas"] += 1
+            r["total"] += medicao.duracao
+            r["sucesso"] += int(medicao.sucesso)
+
+        for r in resumo.values():
+            r["media"] = r["total"] / r["chamadas"]
+
+        return dict(resumo)
+
     def elem_is_visible(self, *locator: Elem):
         """
         Check is locator is visible on page given the timeout
@@ -232,24 +621,16 @@ class Page:
             return False
 
     def wait_for_element_to_be_visible(self, *locator: Elem):
-        return WebDriverWait(self.driver, self.timeout).until(
-            EC.visibility_of_element_located(*locator)
-        )
+        return self._esperar("visivel", EC.visibility_of_element_located(*locator))
 
     def wait_for_element(self, *locator: Elem):
-        return WebDriverWait(self.driver, self.timeout).until(
-            EC.presence_of_element_located(*locator)
-        )
+        return self._esperar("presente", EC.presence_of_element_located(*locator))
 
     def wait_for_element_to_click(self, *locator: Elem):
-        return WebDriverWait(self.driver, self.timeout).until(
-            EC.element_to_be_clickable(*locator)
-        )
+        return self._esperar("clicavel", EC.element_to_be_clickable(*locator))
 
     def wait_for_new_window(self, windows: Sequence):
-        return WebDriverWait(self.driver, self.timeout).until(
-            EC.new_window_is_opened(windows)
-        )
+        return self._esperar("nova_janela", EC.new_window_is_opened(windows))
 
     @_go_new_win
     def nav_elem_to_new_win(self, elem):
@@ -288,7 +669,9 @@ class Page:
         return None
 
     @contextmanager
-    def _click_button_new_win(self, btn_id: Elem, silent: bool = True):
+    def _click_button_new_win(
+        self, btn_id: Elem, silent: bool = True, alerta: Optional[bool] = None
+    ):
         """               
 
         :param btn_id: localizador da página html: (id, conteúdo), (title, conteúdo), (link_text, conteúdo)
@@ -300,4 +683,4 @@ class Page:
             a nova janela.
         """
         with self._go_new_win():
-            self._clicar(btn_id=btn_id, silent=silent)
+            self._clicar(btn_id=btn_id, silent=silent, alerta=alerta)
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Pool de instâncias do webdriver para distribuir consultas entre vários browsers.
+
+Cada browser é um processo independente, de modo que threads são suficientes
+para ocupar todos os núcleos da máquina.
+"""
+# Standard Lib Imports
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from queue import Queue
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+# Third-Parties imports
+from selenium.common.exceptions import WebDriverException
+
+# Local application imports
+from .functions import get_browser
+from .page import Page
+
+
+class DriverPool:
+    """Inicia `tamanho` instâncias do webdriver e as empresta como objetos `Page`
+
+    Args:
+        tamanho (int, optional): Nº de browsers. Defaults to os.cpu_count().
+        browser (str, optional): Nome do navegador. Defaults to "Chrome".
+        is_headless (bool, optional): Browser oculto. Defaults to True.
+        timeout (int, optional): Timeout atribuído a cada `Page`. Defaults to 10.
+        perfil (str, optional): Perfil do browser, veja `get_browser`. Defaults to "padrao".
+        inicializar (Callable, optional): Função chamada com cada `Page` novo ou
+            reiniciado, e.g. para autenticar no sistema. Defaults to None.
+
+    Usage
+    -----
+    >>> with DriverPool(4) as pool:                        # doctest: +SKIP
+    ...     with pool.page() as page:
+    ...         Scpx(page.driver).extrai_cadastro(cpf)
+    ...     dados = pool.map(lambda page, cpf: Scpx(page.driver).extrai_cadastro(cpf), cpfs)
+    """
+
+    def __init__(
+        self,
+        tamanho: int = None,
+        browser: str = "Chrome",
+        is_headless: bool = True,
+        timeout: int = 10,
+        inicializar: Callable[[Page], Any] = None,
+        perfil: str = "padrao",
+    ) -> None:
+        self.tamanho = tamanho or os.cpu_count() or 1
+        self.browser = browser
+        self.is_headless = is_headless
+        self.timeout = timeout
+        self.inicializar = inicializar
+        self.perfil = perfil
+        self._pages: List[Page] = []
+        self._livres: Queue = Queue()
+
+        # A inicialização dos browsers é lenta, por isso é feita em paralelo
+        with ThreadPoolExecutor(max_workers=self.tamanho) as executor:
+            for page in executor.map(lambda _: self._novo_page(), range(self.tamanho)):
+                self._pages.append(page)
+                self._livres.put(page)
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def __len__(self) -> int:
+        return self.tamanho
+
+    def _novo_page(self) -> Page:
+        page = Page(self._get_browser())
+        page.timeout = self.timeout
+        if self.inicializar is not None:
+            self.inicializar(page)
+        return page
+
+    def _get_browser(self):
+        return get_browser(
+            browser=self.browser, is_headless=self.is_headless, perfil=self.perfil
+        )
+
+    def _reiniciar(self, page: Page) -> None:
+        page.restart_driver(
+            browser=self.browser, is_headless=self.is_headless, perfil=self.perfil
+        )
+        if self.inicializar is not None:
+            self.inicializar(page)
+
+    @contextmanager
+    def page(self) -> Iterator[Page]:
+        """Empresta um `Page` livre do pool, bloqueando até que haja um disponível
+
+        O browser é verificado antes do empréstimo e reiniciado caso não responda.
+        """
+        page = self._livres.get()
+        try:
+            if not page.is_alive():
+                self._reiniciar(page)
+            yield page
+        finally:
+            self._livres.put(page)
+
+    def map(
+        self, func: Callable[[Page, Any], Any], itens: Iterable, retries: int = 1
+    ) -> List[Optional[Any]]:
+        """Aplica `func(page, item)` a cada item distribuindo-os entre os browsers
+
+        Args:
+            func (Callable): Função que recebe um `Page` e um item
+            itens (Iterable): Itens a serem processados
+            retries (int, optional): Nº de novas tentativas caso o browser morra
+                durante o processamento do item. Defaults to 1.
+
+        Returns:
+            list: Resultados na mesma ordem de `itens`
+        """
+
+        def tarefa(item):
+            for tentativa in range(retries + 1):
+                with self.page() as page:
+                    try:
+                        return func(page, item)
+                    except WebDriverException:
+                        if page.is_alive() or tentativa == retries:
+                            raise
+
+        with ThreadPoolExecutor(max_workers=self.tamanho) as executor:
+            return list(executor.map(tarefa, itens))
+
+    def fechar(self) -> None:
+        """Encerra todas as instâncias do browser"""
+        for page in self._pages:
+            try:
+                page.driver.quit()
+            except WebDriverException:
+                pass
+        self._pages.clear()
+
+
+class WarmPool:
+    """Inicia browsers em segundo plano enquanto o restante do job é inicializado,
+    de modo que a instância já esteja pronta quando for requisitada
+
+    Args:
+        quantidade (int, optional): Nº de browsers pré-iniciados. Defaults to 1.
+        perfil_dir (str, optional): Diretório base dos dados do usuário reaproveitados
+            entre execuções, cada browser usa o subdiretório do seu índice. Defaults to None.
+        url (str, optional): Página carregada após a inicialização, e.g. a página de
+            login. Defaults to None.
+        **kwargs: Demais opções repassadas a `get_browser`
+
+    Usage
+    -----
+    >>> aquecido = WarmPool(browser="Firefox", url=config.Sei_Login.Login["url"])  # doctest: +SKIP
+    >>> # ... demais inicializações do job
+    >>> sei = login_sei(usr, pwd, driver=aquecido.obter())                       # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        quantidade: int = 1,
+        perfil_dir: str = None,
+        url: str = None,
+        **kwargs,
+    ) -> None:
+        self.perfil_dir = perfil_dir
+        self.url = url
+        self.kwargs = kwargs
+        self._executor = ThreadPoolExecutor(max_workers=quantidade)
+        self._futuros: Queue = Queue()
+
+        for indice in range(quantidade):
+            self._futuros.put(self._executor.submit(self._inicia, indice))
+
+    def __enter__(self) -> "WarmPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def _inicia(self, indice: int):
+        perfil_dir = None
+
+        if self.perfil_dir is not None:
+            perfil_dir = os.path.join(self.perfil_dir, str(indice))
+
+        driver = get_browser(perfil_dir=perfil_dir, **self.kwargs)
+
+        if self.url is not None:
+            driver.get(self.url)
+
+        return driver
+
+    def obter(self, timeout: float = None):
+        """Retorna um browser pré-iniciado, aguardando o término da sua inicialização
+
+        Caso todos já tenham sido entregues, um novo browser é iniciado sem perfil
+        persistente, pois os diretórios existentes podem estar em uso.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera pela inicialização.
+                Defaults to None.
+
+        Returns:
+            webdriver: Instância do webdriver
+        """
+        if self._futuros.empty():
+            return get_browser(**self.kwargs)
+
+        return self._futuros.get().result(timeout=timeout)
+
+    def fechar(self) -> None:
+        """Encerra os browsers pré-iniciados que não foram entregues"""
+        while not self._futuros.empty():
+            futuro = self._futuros.get()
+            try:
+                futuro.result().quit()
+            except WebDriverException:
+                pass
+        self._executor.shutdown(wait=False)
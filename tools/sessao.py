@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+Persistência e reutilização da sessão autenticada do webdriver.
+
+Operações somente de leitura não precisam renderizar a página no browser: os
+cookies do webdriver são copiados para uma `requests.Session` e o html retornado
+pelos endpoints ASP/PHP é repassado aos mesmos parsers usados com `page_source`.
+
+Os cookies e o estado da janela também podem ser salvos num arquivo local
+criptografado e restaurados na próxima execução, evitando um novo login.
+"""
+# Standard Lib Imports
+import base64
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+
+# Third-Parties imports
+import requests
+from bs4 import BeautifulSoup as soup
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from requests.adapters import HTTPAdapter
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from urllib3.util.retry import Retry
+
+# Botões "botaoFlat" do sistemasnet submetem o formulário via javascript
+SUBMETER_TELA = re.compile(r"submeterTela\(\s*['\"]([^'\"]+)['\"]")
+
+# Tamanho do salt e nº de iterações da derivação da chave a partir da senha
+SALT_SIZE = 16
+
+KDF_ITERACOES = 200_000
+
+
+class SessaoHttp:
+    """Cliente HTTP com pool de conexões que reutiliza os cookies do webdriver
+
+    Args:
+        driver (selenium.webdriver): Instância do webdriver já autenticada
+        auth (tuple, optional): Credenciais (usuário, senha) para autenticação HTTP.
+            Defaults to None.
+        pool_maxsize (int, optional): Nº de conexões mantidas abertas. Defaults to 10.
+        timeout (int, optional): Timeout de cada requisição. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        driver: webdriver,
+        auth: Tuple[str, str] = None,
+        pool_maxsize: int = 10,
+        timeout: int = 30,
+    ) -> None:
+        self.driver = driver
+        self.timeout = timeout
+        self.url: Optional[str] = None
+
+        self.session = requests.Session()
+        self.session.auth = auth
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.sincronizar()
+
+    def sincronizar(self) -> None:
+        """Copia os cookies do domínio atual e o user-agent do webdriver para a sessão
+
+        Deve ser chamado novamente caso o browser renove a sessão.
+        """
+        for cookie in self.driver.get_cookies():
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+
+        self.session.headers["User-Agent"] = self.driver.execute_script(
+            "return navigator.userAgent;"
+        )
+
+    def _texto(self, response: requests.Response) -> str:
+        response.raise_for_status()
+
+        self.url = response.url
+
+        # As páginas ASP nem sempre informam o charset, o que leva o requests a
+        # assumir ISO-8859-1 mesmo quando o conteúdo é utf-8
+        if "charset" not in response.headers.get("Content-Type", ""):
+            response.encoding = response.apparent_encoding
+
+        return response.text
+
+    def get(self, url: str, **kwargs) -> str:
+        """Retorna o html da página `url`"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self._texto(self.session.get(url, **kwargs))
+
+    def post(self, url: str, data: Dict = None, **kwargs) -> str:
+        """Submete `data` à página `url` e retorna o html da resposta"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self._texto(self.session.post(url, data=data, **kwargs))
+
+    def enviar_formulario(
+        self,
+        url: str,
+        campos: Dict[str, str],
+        html: str = None,
+        form_id: str = None,
+        action: str = None,
+    ) -> str:
+        """Preenche e submete o formulário da página `url` como o browser faria
+
+        Os campos existentes no formulário (inclusive os ocultos) são mantidos e
+        atualizados com `campos`, cujas chaves podem ser o `id` ou o `name` do input.
+
+        Args:
+            url (str): Endereço da página que contém o formulário
+            campos (dict): key=id ou name do campo, value=valor a ser submetido
+            html (str, optional): html da página já obtido, evita um novo GET.
+                Defaults to None.
+            form_id (str, optional): id do formulário, senão o primeiro que contém
+                um dos `campos`, ou o primeiro da página. Defaults to None.
+            action (str, optional): Endereço de submissão, senão o `action` do formulário.
+                Defaults to None.
+
+        Returns:
+            str: html da resposta
+        """
+        if html is None:
+            html = self.get(url)
+
+        source = soup(html, "lxml")
+
+        if form_id:
+            form = source.find("form", id=form_id)
+        else:
+            # O primeiro formulário pode ser outro, e.g. a Pesquisa Rápida do SEI
+            form = next(
+                (
+                    f
+                    for f in source.find_all("form")
+                    if any(
+                        f.find(["input", "select", "textarea"], id=c)
+                        or f.find(["input", "select", "textarea"], attrs={"name": c})
+                        for c in campos
+                    )
+                ),
+                source.find("form"),
+            )
+
+        if form is None:
+            raise LookupError(f"Não há formulário na página {url}")
+
+        dados, nomes = {}, {}
+
+        for tag in form.find_all(["input", "select", "textarea"]):
+            name = tag.get("name")
+
+            if not name:
+                continue
+
+            nomes[tag.get("id", name)] = name
+
+            if tag.name == "select":
+                option = tag.find("option", selected=True) or tag.find("option")
+                dados[name] = option.get("value", option.text) if option else ""
+
+            elif tag.get("type", "").lower() in ("checkbox", "radio"):
+                if tag.has_attr("checked"):
+                    dados[name] = tag.get("value", "on")
+
+            elif tag.get("type", "").lower() not in ("submit", "button", "image"):
+                dados[name] = tag.get(
+                    "value", tag.text if tag.name == "textarea" else ""
+                )
+
+        for campo, valor in campos.items():
+            dados[nomes.get(campo, campo)] = valor
+
+        if action is None:
+            action = form.get("action") or url
+
+        if form.get("method", "get").lower() == "post":
+            return self.post(urljoin(url, action), data=dados)
+
+        return self.get(urljoin(url, action), params=dados)
+
+    def clicar_botao(self, html: str, btn_id: str) -> Optional[str]:
+        """Reproduz o clique no botão `btn_id` que submete a tela via `submeterTela`
+
+        Args:
+            html (str): html da página atual, obtido desta sessão
+            btn_id (str): id do botão
+
+        Returns:
+            str: html da resposta ou None caso o botão não exista na página
+        """
+        botão = soup(html, "lxml").find(id=btn_id)
+
+        if botão is None:
+            return None
+
+        match = SUBMETER_TELA.search(botão.get("onclick", "") + botão.get("href", ""))
+
+        if match is None:
+            return None
+
+        return self.enviar_formulario(self.url, {}, html=html, action=match.group(1))
+
+
+def _fernet(senha: str, salt: bytes) -> Fernet:
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=KDF_ITERACOES,
+        backend=default_backend(),
+    )
+    return Fernet(base64.urlsafe_b64encode(kdf.derive(senha.encode())))
+
+
+def salvar_sessao(driver: webdriver, arquivo: Union[str, Path], senha: str) -> None:
+    """Salva os cookies, a url e o estado da janela do webdriver num arquivo
+    criptografado com uma chave derivada de `senha`
+
+    Args:
+        driver (selenium.webdriver): Instância do webdriver autenticada
+        arquivo (str, Path): Caminho do arquivo da sessão
+        senha (str): Senha usada para derivar a chave de criptografia
+    """
+    estado = {
+        "url": driver.current_url,
+        "cookies": driver.get_cookies(),
+        "janela": driver.get_window_rect(),
+    }
+
+    salt = os.urandom(SALT_SIZE)
+
+    token = _fernet(senha, salt).encrypt(json.dumps(estado).encode())
+
+    arquivo = Path(arquivo)
+
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+
+    # Os cookies dão acesso à sessão, somente o usuário pode ler o arquivo. O
+    # temporário já é criado com permissão 0600 e substitui o arquivo atomicamente
+    descritor, temporario = tempfile.mkstemp(dir=str(arquivo.parent), prefix=".sessao")
+
+    try:
+        with os.fdopen(descritor, "wb") as f:
+            f.write(salt + token)
+
+        os.replace(temporario, str(arquivo))
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+def carregar_sessao(arquivo: Union[str, Path], senha: str) -> Optional[Dict]:
+    """Lê o arquivo salvo por `salvar_sessao`
+
+    Returns:
+        dict: Estado da sessão ou None caso o arquivo não exista ou a senha seja inválida
+    """
+    arquivo = Path(arquivo)
+
+    if not arquivo.exists():
+        return None
+
+    conteudo = arquivo.read_bytes()
+
+    salt, token = conteudo[:SALT_SIZE], conteudo[SALT_SIZE:]
+
+    try:
+        return json.loads(_fernet(senha, salt).decrypt(token))
+    except (InvalidToken, ValueError):
+        return None
+
+
+def restaurar_sessao(driver: webdriver, arquivo: Union[str, Path], senha: str) -> bool:
+    """Restaura no webdriver a sessão salva por `salvar_sessao` e navega para a
+    última url visitada. A validade da sessão deve ser checada por quem chama.
+
+    Args:
+        driver (selenium.webdriver): Instância do webdriver
+        arquivo (str, Path): Caminho do arquivo da sessão
+        senha (str): Senha usada para derivar a chave de criptografia
+
+    Returns:
+        bool: True se a sessão foi restaurada, False caso contrário
+    """
+    estado = carregar_sessao(arquivo, senha)
+
+    if estado is None:
+        return False
+
+    url = urlsplit(estado["url"])
+
+    try:
+        # Os cookies só podem ser adicionados na página do seu domínio
+        driver.get(f"{url.scheme}://{url.netloc}/")
+
+        for cookie in estado["cookies"]:
+            cookie.pop("sameSite", None)
+            if "expiry" in cookie:
+                cookie["expiry"] = int(cookie["expiry"])
+            driver.add_cookie(cookie)
+
+        driver.set_window_rect(**estado["janela"])
+
+        driver.get(estado["url"])
+
+    except WebDriverException:
+        return False
+
+    return True
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Extração dos pares rótulo/valor das tabelas das páginas do sistemasnet.
+
+A árvore lxml é percorrida uma única vez. Uma célula <td> cujo conteúdo é somente
+um texto, direto ou dentro de um único elemento, é um rótulo e o seu valor é o
+texto da <td> seguinte, o mesmo critério de `tr.find_all("td", string=True)` e
+`td.find_next_sibling("td")` do BeautifulSoup.
+
+O tratamento dos rótulos repetidos é declarado por uma das políticas:
+
+    PRIMEIRO: mantém o primeiro valor
+    ULTIMO: mantém o último valor
+    SUFIXO: acrescenta "_1", "_2", ... aos rótulos repetidos, numerados na ordem
+        em que as repetições ocorrem na página
+"""
+# Standard Lib Imports
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+# Third party imports
+from lxml import etree, html as lhtml
+
+PRIMEIRO, ULTIMO, SUFIXO = "primeiro", "ultimo", "sufixo"
+
+POLITICAS = (PRIMEIRO, ULTIMO, SUFIXO)
+
+Par = Tuple[str, Optional[str]]
+
+# O lxml recusa str com declaração de encoding, e.g. <?xml ... encoding="utf-8"?>,
+# por isso as páginas str são analisadas como bytes utf-8, ignorando a declaração
+PARSER_UTF8 = lhtml.HTMLParser(encoding="utf-8")
+
+
+def _arvore(pagina: Union[str, bytes, etree._Element]) -> etree._Element:
+    if isinstance(pagina, etree._Element):
+        return pagina
+    if isinstance(pagina, str):
+        return lhtml.fromstring(pagina.encode("utf-8"), parser=PARSER_UTF8)
+    return lhtml.fromstring(pagina)
+
+
+def texto_unico(elemento: etree._Element) -> Optional[str]:
+    """Equivalente a `tag.string` do BeautifulSoup: o texto do elemento caso seja
+    o seu único conteúdo, direto ou dentro de um único elemento, senão None
+    """
+    while True:
+        if len(elemento) == 0:
+            return elemento.text
+
+        filho = elemento[0]
+
+        if len(elemento) > 1 or elemento.text or filho.tail:
+            return None
+
+        elemento = filho
+
+
+def _td_seguinte(td: etree._Element) -> Optional[etree._Element]:
+    irmao = td.getnext()
+
+    while irmao is not None and irmao.tag != "td":
+        irmao = irmao.getnext()
+
+    return irmao
+
+
+def pares_td(pagina: Union[str, bytes, etree._Element]) -> Iterator[Par]:
+    """Gera os pares (rótulo, valor) das células da página, na ordem do documento
+
+    Args:
+        pagina (str, bytes, Element): html ou árvore lxml
+
+    Yields:
+        tuple: (rótulo sem espaços e ":" nas extremidades, valor ou None caso a
+            célula não tenha uma <td> seguinte)
+    """
+    for td in _arvore(pagina).iter("td"):
+        rotulo = texto_unico(td)
+
+        if rotulo is None:
+            continue
+
+        valor = _td_seguinte(td)
+
+        yield rotulo.strip(" :"), (
+            valor.text_content().strip() if valor is not None else None
+        )
+
+
+def pares_label(pagina: Union[str, bytes, etree._Element]) -> Iterator[Par]:
+    """Gera os pares das linhas em que o rótulo é uma <td> e o valor um <label>
+
+    A n-ésima <td> de texto único de cada <tr> é associada ao n-ésimo <label> de
+    texto único da mesma <tr>. As <td> que contêm um <label> são o valor e não um
+    rótulo. O último caractere do rótulo, ":", é descartado.
+    """
+    linhas: Dict[etree._Element, Tuple[list, list]] = {}
+
+    for elemento in _arvore(pagina).iter("td", "label"):
+        texto = texto_unico(elemento)
+
+        if texto is None or (
+            elemento.tag == "td" and next(elemento.iter("label"), None) is not None
+        ):
+            continue
+
+        tr = next(elemento.iterancestors("tr"), None)
+
+        if tr is None:
+            continue
+
+        rotulos, valores = linhas.setdefault(tr, ([], []))
+
+        (rotulos if elemento.tag == "td" else valores).append(texto)
+
+    for rotulos, valores in linhas.values():
+        for rotulo, valor in zip(rotulos, valores):
+            yield rotulo[:-1], valor
+
+
+def agrupa_pares(
+    pares: Iterable[Par], duplicadas: str = PRIMEIRO, vazios: bool = False
+) -> Dict[str, Optional[str]]:
+    """Monta o dicionário dos pares segundo a política `duplicadas`
+
+    Args:
+        pares (Iterable): Tuplas (rótulo, valor)
+        duplicadas (str, optional): PRIMEIRO, ULTIMO ou SUFIXO. Defaults to PRIMEIRO.
+        vazios (bool, optional): Mantém os rótulos sem valor (None). Defaults to False.
+
+    Returns:
+        dict: key=rótulo, value=valor
+    """
+    if duplicadas not in POLITICAS:
+        raise ValueError(f"Política inválida: {duplicadas}. Use uma de {POLITICAS}")
+
+    dados: Dict[str, Optional[str]] = {}
+
+    i = 1
+
+    for rotulo, valor in pares:
+        if valor is None and not vazios:
+            continue
+
+        if rotulo in dados:
+            if duplicadas == PRIMEIRO:
+                continue
+
+            if duplicadas == SUFIXO:
+                rotulo = f"{rotulo}_{i}"
+                i += 1
+
+        dados[rotulo] = valor
+
+    return dados
+
+
+def extrai_rotulos(
+    pagina: Union[str, bytes, etree._Element],
+    duplicadas: str = PRIMEIRO,
+    vazios: bool = False,
+) -> Dict[str, Optional[str]]:
+    """Extrai os pares rótulo/valor das células <td> da página, veja `pares_td`
+
+    Args:
+        pagina (str, bytes, Element): html ou árvore lxml
+        duplicadas (str, optional): PRIMEIRO, ULTIMO ou SUFIXO. Defaults to PRIMEIRO.
+        vazios (bool, optional): Mantém os rótulos sem valor (None). Defaults to False.
+
+    Returns:
+        dict: key=rótulo, value=valor
+    """
+    return agrupa_pares(pares_td(pagina), duplicadas, vazios)